@@ -12,7 +12,7 @@ app = create_app()
 # Start the link validation service
 try:
     from link_validation_integration import start_link_validation_service
-    start_link_validation_service()
+    start_link_validation_service(app.extensions['db_manager'])
 except Exception as e:
     print(f"Warning: Could not start link validation service: {e}")
 
@@ -0,0 +1,165 @@
+"""
+Columnar analytics over the promises table, backed by pandas.
+
+An optional alternative to the SQL aggregates used by ``PromiseAnalyzer``:
+the promise columns analytics needs are loaded once per data version into
+a typed DataFrame and every figure is computed with vectorized operations.
+pandas is only imported when this backend is used.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from .database import DatabaseManager
+
+try:
+    import pandas as pd
+except ImportError:  # Optional dependency
+    pd = None
+
+
+# Labels of the analytics page's progress buckets
+PROGRESS_BUCKETS = ('0%', '1-25%', '26-50%', '51-75%', '76-99%', '100%')
+
+
+def pandas_available() -> bool:
+    """Whether the pandas backend can be used."""
+    return pd is not None
+
+
+def load_promise_frame(db_manager: DatabaseManager) -> "pd.DataFrame":
+    """Load the promise columns used by analytics into a typed DataFrame.
+
+    ``category`` and ``status`` are categoricals, ``priority`` a small
+    integer and the timestamps real datetimes (from either storage
+    format), so grouping and filtering run on compact arrays rather than
+    Python objects. Timestamps stored with an offset are converted to UTC
+    and made naive, as ``to_epoch_us`` does, so they compare with naive
+    ones.
+    """
+    if pd is None:
+        raise ImportError("The pandas analytics backend requires pandas (pip install pandas)")
+
+    with db_manager.get_connection() as conn:
+        frame = pd.read_sql_query(
+            "SELECT id, category, status, priority, progress_percentage, date_updated, created_at FROM promises",
+            conn
+        )
+
+    if db_manager.timestamp_format == 'epoch_us':
+        def to_datetime(column):
+            return pd.to_datetime(column, unit='us')
+    else:
+        def to_datetime(column):
+            # Offsets may differ per row (or be absent), which only utc=True accepts
+            return pd.to_datetime(column, format='ISO8601', utc=True).dt.tz_localize(None)
+
+    return frame.astype({
+        'category': 'category',
+        'status': 'category',
+        'priority': 'int8',
+        'progress_percentage': 'float64',
+    }).assign(
+        date_updated=to_datetime(frame['date_updated']),
+        created_at=to_datetime(frame['created_at']),
+    )
+
+
+class FrameAnalytics:
+    """Vectorized equivalents of the ``PromiseAnalyzer`` aggregates.
+
+    The DataFrame is reloaded only when the database's data version
+    changes. Counts are identical to the SQL/Python implementations; float
+    averages agree up to summation order (pandas sums pairwise).
+    """
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+        self._frame: Optional["pd.DataFrame"] = None
+        self._version: Optional[int] = None
+
+    @property
+    def frame(self) -> "pd.DataFrame":
+        """The promises DataFrame for the current data version."""
+        version, _ = self.db_manager.get_data_version()
+        if self._frame is None or version != self._version:
+            self._frame = load_promise_frame(self.db_manager)
+            self._version = version
+        return self._frame
+
+    def count_by_status(self) -> Dict[str, int]:
+        """Count promises by status."""
+        return self._value_counts(self.frame['status'])
+
+    def count_by_category(self) -> Dict[str, int]:
+        """Count promises by category."""
+        return self._value_counts(self.frame['category'])
+
+    def compute_dashboard_analytics(self, days_back: int = 30, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Same result as ``PromiseAnalyzer.compute_dashboard_analytics``."""
+        frame = self.frame
+        cutoff = (now or datetime.now()) - timedelta(days=days_back)
+
+        recent = frame['date_updated'] >= cutoff
+        progress = frame['progress_percentage']
+        recent_count = int(recent.sum())
+        older_count = len(frame) - recent_count
+        recent_avg = float(progress[recent].sum()) / recent_count if recent_count else 0
+        older_avg = float(progress[~recent].sum()) / older_count if older_count else 0
+
+        # Status history lives in promise_events; its window is a small indexed range
+        events = self.db_manager.get_event_summary(cutoff)
+        priority_counts = frame['priority'].value_counts()
+
+        return {
+            'trends': {
+                'new_promises': int((recent & (frame['created_at'] >= cutoff)).sum()),
+                'status_changes': events['status_changes'],
+                'category_activity': self._value_counts(frame.loc[recent, 'category']),
+                'progress_trends': {
+                    'recent_average_progress': recent_avg,
+                    'older_average_progress': older_avg,
+                    'progress_change': recent_avg - older_avg
+                },
+                'fulfillment_velocity': events['fulfilled_count'] / days_back if days_back > 0 else 0.0
+            },
+            'priority_data': {f'Priority {i}': int(priority_counts.get(i, 0)) for i in range(1, 6)},
+            'progress_data': self._progress_buckets(progress),
+            'high_priority_count': int(priority_counts.get(5, 0))
+        }
+
+    def monthly_series(self) -> Dict[str, Dict[str, int]]:
+        """Promises created, and fulfilled promises last updated, per calendar month.
+
+        Keys are ``YYYY-MM`` strings in ascending order.
+        """
+        frame = self.frame
+        fulfilled_rows = frame['status'].isin(DatabaseManager.FULFILLED_STATUSES)
+        # Count per monthly period first, then format only the few distinct months
+        created = frame['created_at'].dt.to_period('M').value_counts()
+        fulfilled = frame.loc[fulfilled_rows, 'date_updated'].dt.to_period('M').value_counts()
+
+        months = sorted(set(created.index) | set(fulfilled.index))
+        return {
+            str(month): {'created': int(created.get(month, 0)), 'fulfilled': int(fulfilled.get(month, 0))}
+            for month in months
+        }
+
+    @staticmethod
+    def _progress_buckets(progress: "pd.Series") -> Dict[str, int]:
+        """Count progress values into the analytics page's buckets."""
+        conditions = [
+            progress == 0,
+            (progress > 0) & (progress <= 25),
+            (progress > 25) & (progress <= 50),
+            (progress > 50) & (progress <= 75),
+            (progress > 75) & (progress < 100),
+            progress == 100,
+        ]
+        return {label: int(condition.sum()) for label, condition in zip(PROGRESS_BUCKETS, conditions)}
+
+    @staticmethod
+    def _value_counts(column: "pd.Series") -> Dict[str, int]:
+        """Counts of the values present in a categorical column."""
+        counts = column.value_counts()
+        return {str(value): int(count) for value, count in counts.items() if count}
@@ -2,75 +2,136 @@
 Analysis utilities for Trump campaign promises.
 """
 
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
-from collections import defaultdict, Counter
 import re
 import math
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 
 from .models import Promise, PromiseStatus, AnalyticsData
 from .database import DatabaseManager
 
 
+# Specificity indicators counted by compute_complexity
+NUMBER_PATTERN = re.compile(r'\b\d+\b')
+DATE_PATTERN = re.compile(r'\b\d{4}\b|\bday one\b|\bfirst day\b')
+AMOUNT_PATTERN = re.compile(r'\$[\d,]+|\b\d+\s*(million|billion|trillion|percent|%)')
+SENTENCE_PATTERN = re.compile(r'[.!?]+')
+
+ACTION_WORDS = ('build', 'create', 'eliminate', 'reduce', 'increase', 'implement',
+                'establish', 'end', 'start', 'begin', 'stop', 'cancel')
+QUALIFIER_WORDS = ('maybe', 'possibly', 'might', 'could', 'probably', 'try', 'attempt')
+
+
+def text_hash(text: str) -> str:
+    """Key of a promise text in the ``promise_metrics`` table."""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def compute_complexity(text: str) -> Dict[str, Any]:
+    """Analyze the complexity and specificity of a promise text.
+    
+    A plain function of the text, so it can run in worker processes.
+    """
+    # Basic metrics
+    word_count = len(text.split())
+    sentence_count = len(SENTENCE_PATTERN.split(text))
+    avg_words_per_sentence = word_count / sentence_count if sentence_count > 0 else 0
+    
+    # Specificity indicators
+    specific_numbers = len(NUMBER_PATTERN.findall(text))
+    specific_dates = len(DATE_PATTERN.findall(text))
+    specific_amounts = len(AMOUNT_PATTERN.findall(text))
+    
+    # Action words, and qualifier words indicating uncertainty
+    lowered = text.lower()
+    action_count = sum(1 for word in ACTION_WORDS if word in lowered)
+    qualifier_count = sum(1 for word in QUALIFIER_WORDS if word in lowered)
+    
+    # Calculate complexity score
+    complexity_score = min((
+        word_count * 0.01 +
+        specific_numbers * 0.1 +
+        specific_dates * 0.15 +
+        specific_amounts * 0.2 +
+        action_count * 0.1 -
+        qualifier_count * 0.1
+    ), 1.0)
+    
+    return {
+        'word_count': word_count,
+        'sentence_count': sentence_count,
+        'avg_words_per_sentence': avg_words_per_sentence,
+        'specific_numbers': specific_numbers,
+        'specific_dates': specific_dates,
+        'specific_amounts': specific_amounts,
+        'action_words': action_count,
+        'qualifier_words': qualifier_count,
+        'complexity_score': max(complexity_score, 0.0),
+        'specificity_level': classify_specificity(complexity_score)
+    }
+
+
+def classify_specificity(score: float) -> str:
+    """Classify promise specificity based on score."""
+    if score >= 0.7:
+        return "Very Specific"
+    elif score >= 0.5:
+        return "Specific"
+    elif score >= 0.3:
+        return "Moderate"
+    elif score >= 0.1:
+        return "Vague"
+    else:
+        return "Very Vague"
+
+
 class PromiseAnalyzer:
     """Analyzes campaign promises for insights and trends."""
     
-    def __init__(self, db_manager: DatabaseManager):
+    # Seconds a memoized compute_dashboard_analytics result stays valid
+    DASHBOARD_CACHE_SECONDS = 300
+    
+    # Texts to analyze in one backfill batch before a process pool pays off
+    PROCESS_POOL_MIN_TEXTS = 2000
+    
+    def __init__(self, db_manager: DatabaseManager, backend: str = "sql"):
+        """``backend`` is "sql" (aggregate queries) or "pandas" (see ``analytics_frame``)."""
+        if backend not in ("sql", "pandas"):
+            raise ValueError(f"Unknown analytics backend {backend!r}")
         self.db_manager = db_manager
+        self.backend = backend
+        self._frame_analytics = None
+        if backend == "pandas":
+            from .analytics_frame import FrameAnalytics  # pandas is optional
+            self._frame_analytics = FrameAnalytics(db_manager)
+        self._dashboard_cache: Optional[Tuple[Tuple[int, int], float, Dict[str, Any]]] = None
     
     def generate_analytics_report(self) -> AnalyticsData:
-        """Generate comprehensive analytics report."""
-        promises = self.db_manager.get_all_promises()
-        
-        if not promises:
-            return AnalyticsData()
-        
-        # Basic statistics
-        total_promises = len(promises)
-        promises_by_status = self._count_by_status(promises)
-        promises_by_category = self._count_by_category(promises)
+        """Generate comprehensive analytics report.
         
-        # Calculate fulfillment metrics
-        fulfilled_count = (promises_by_status.get('Fulfilled', 0) + 
-                          promises_by_status.get('Partially Fulfilled', 0))
-        fulfillment_rate = (fulfilled_count / total_promises * 100) if total_promises > 0 else 0.0
+        Counts come from the database's precomputed aggregates; only the ten
+        most recently updated promises are loaded.
+        """
+        summary = self.db_manager.get_analytics_data()
         
-        # Average progress
-        total_progress = sum(promise.progress_percentage for promise in promises)
-        average_progress = total_progress / total_promises if total_promises > 0 else 0.0
-        
-        # Most active categories (by count)
-        most_active_categories = [category for category, count in 
-                                sorted(promises_by_category.items(), 
-                                      key=lambda x: x[1], reverse=True)[:5]]
+        if not summary['total_promises']:
+            return AnalyticsData()
         
-        # Recent updates
-        recent_updates = self._get_recent_updates(promises, limit=10)
+        recent = self.db_manager.query_promises(limit=10, include_sources=False).promises
         
         return AnalyticsData(
-            total_promises=total_promises,
-            promises_by_status=promises_by_status,
-            promises_by_category=promises_by_category,
-            fulfillment_rate=fulfillment_rate,
-            average_progress=average_progress,
-            most_active_categories=most_active_categories,
-            recent_updates=recent_updates
+            total_promises=summary['total_promises'],
+            promises_by_status=summary['promises_by_status'],
+            promises_by_category=summary['promises_by_category'],
+            fulfillment_rate=summary['fulfillment_rate'],
+            average_progress=summary['average_progress'],
+            most_active_categories=summary['most_active_categories'],
+            recent_updates=self._get_recent_updates(recent, limit=10)
         )
     
-    def _count_by_status(self, promises: List[Promise]) -> Dict[str, int]:
-        """Count promises by status."""
-        status_counts = defaultdict(int)
-        for promise in promises:
-            status_counts[promise.status.value] += 1
-        return dict(status_counts)
-    
-    def _count_by_category(self, promises: List[Promise]) -> Dict[str, int]:
-        """Count promises by category."""
-        category_counts = defaultdict(int)
-        for promise in promises:
-            category_counts[promise.category] += 1
-        return dict(category_counts)
-    
     def _get_recent_updates(self, promises: List[Promise], limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent promise updates."""
         updates = []
@@ -91,155 +152,165 @@ class PromiseAnalyzer:
     
     def analyze_promise_trends(self, days_back: int = 30) -> Dict[str, Any]:
         """Analyze trends in promises over time."""
-        promises = self.db_manager.get_all_promises()
-        cutoff_date = datetime.now() - timedelta(days=days_back)
-        
-        # Filter recent promises
-        recent_promises = [p for p in promises if p.date_updated >= cutoff_date]
-        
-        # Analyze trends
-        trends = {
-            'new_promises': len([p for p in recent_promises if p.created_at >= cutoff_date]),
-            'status_changes': len([p for p in recent_promises if p.date_updated >= cutoff_date]),
-            'category_activity': self._analyze_category_activity(recent_promises),
-            'progress_trends': self._analyze_progress_trends(promises, days_back),
-            'fulfillment_velocity': self._calculate_fulfillment_velocity(promises, days_back)
-        }
-        
-        return trends
-    
-    def _analyze_category_activity(self, promises: List[Promise]) -> Dict[str, int]:
-        """Analyze activity by category."""
-        activity = defaultdict(int)
-        for promise in promises:
-            activity[promise.category] += 1
-        return dict(activity)
+        return self.compute_dashboard_analytics(days_back)['trends']
     
-    def _analyze_progress_trends(self, promises: List[Promise], days_back: int) -> Dict[str, float]:
-        """Analyze progress trends."""
-        cutoff_date = datetime.now() - timedelta(days=days_back)
-        
-        # Calculate average progress for recent vs. older promises
-        recent_promises = [p for p in promises if p.date_updated >= cutoff_date]
-        older_promises = [p for p in promises if p.date_updated < cutoff_date]
-        
-        recent_avg = sum(p.progress_percentage for p in recent_promises) / len(recent_promises) if recent_promises else 0
-        older_avg = sum(p.progress_percentage for p in older_promises) / len(older_promises) if older_promises else 0
-        
-        return {
-            'recent_average_progress': recent_avg,
-            'older_average_progress': older_avg,
-            'progress_change': recent_avg - older_avg
+    def compute_dashboard_analytics(self, days_back: int = 30, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Compute the trend, priority and progress figures of the analytics page.
+        
+        All of it comes from one aggregate scan in SQL (see
+        ``DatabaseManager.get_activity_summary``) plus, for status changes and
+        fulfillment velocity, a range scan of the recorded promise events
+        (``get_event_summary``); no promise is loaded. The
+        result holds only plain values and is memoized per data version for
+        up to ``DASHBOARD_CACHE_SECONDS``, after which the time window moves on.
+        Passing ``now`` fixes the window's end and bypasses the memo.
+        """
+        if self._frame_analytics is not None:
+            return self._frame_analytics.compute_dashboard_analytics(days_back, now)
+        
+        version, _ = self.db_manager.get_data_version()
+        key = (version, days_back)
+        if now is None and self._dashboard_cache and self._dashboard_cache[0] == key \
+                and time.monotonic() - self._dashboard_cache[1] < self.DASHBOARD_CACHE_SECONDS:
+            return self._dashboard_cache[2]
+        
+        cutoff = (now or datetime.now()) - timedelta(days=days_back)
+        summary = self.db_manager.get_activity_summary(cutoff)
+        events = self.db_manager.get_event_summary(cutoff)
+        older_count = summary['total'] - summary['updated_count']
+        recent_avg = summary['updated_progress_sum'] / summary['updated_count'] if summary['updated_count'] else 0
+        older_avg = summary['older_progress_sum'] / older_count if older_count else 0
+        
+        result = {
+            'trends': {
+                'new_promises': summary['created_count'],
+                'status_changes': events['status_changes'],
+                'category_activity': summary['category_activity'],
+                'progress_trends': {
+                    'recent_average_progress': recent_avg,
+                    'older_average_progress': older_avg,
+                    'progress_change': recent_avg - older_avg
+                },
+                'fulfillment_velocity': events['fulfilled_count'] / days_back if days_back > 0 else 0.0
+            },
+            'priority_data': {f'Priority {i}': summary[f'priority_{i}'] for i in range(1, 6)},
+            'progress_data': {
+                '0%': summary['progress_0'],
+                '1-25%': summary['progress_1_25'],
+                '26-50%': summary['progress_26_50'],
+                '51-75%': summary['progress_51_75'],
+                '76-99%': summary['progress_76_99'],
+                '100%': summary['progress_100']
+            },
+            'high_priority_count': summary['priority_5']
         }
-    
-    def _calculate_fulfillment_velocity(self, promises: List[Promise], days_back: int) -> float:
-        """Calculate rate of promise fulfillment."""
-        cutoff_date = datetime.now() - timedelta(days=days_back)
-        
-        fulfilled_recently = len([
-            p for p in promises 
-            if p.status in [PromiseStatus.FULFILLED, PromiseStatus.PARTIALLY_FULFILLED] 
-            and p.date_updated >= cutoff_date
-        ])
         
-        return fulfilled_recently / days_back if days_back > 0 else 0.0
+        if now is None:
+            self._dashboard_cache = (key, time.monotonic(), result)
+        return result
     
-    def find_similar_promises(self, promise: Promise, threshold: float = 0.3) -> List[Tuple[Promise, float]]:
-        """Find promises similar to the given promise."""
-        all_promises = self.db_manager.get_all_promises()
-        similar_promises = []
-        
-        for other_promise in all_promises:
-            if other_promise.id == promise.id:
-                continue
-            
-            similarity = self._calculate_text_similarity(promise.text, other_promise.text)
-            if similarity >= threshold:
-                similar_promises.append((other_promise, similarity))
-        
-        # Sort by similarity score
-        similar_promises.sort(key=lambda x: x[1], reverse=True)
-        return similar_promises
+    def monthly_series(self) -> Dict[str, Dict[str, int]]:
+        """Promises created, and fulfilled promises last updated, per ``YYYY-MM`` month."""
+        if self._frame_analytics is not None:
+            return self._frame_analytics.monthly_series()
+        return self.db_manager.get_monthly_counts()
     
-    def _calculate_text_similarity(self, text1: str, text2: str) -> float:
-        """Calculate similarity between two texts using basic word overlap."""
-        # Simple word-based similarity (could be improved with NLP libraries)
-        words1 = set(re.findall(r'\w+', text1.lower()))
-        words2 = set(re.findall(r'\w+', text2.lower()))
-        
-        if not words1 or not words2:
-            return 0.0
-        
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
-        
-        return len(intersection) / len(union) if union else 0.0
+    def find_similar_promises(self, promise: Promise, threshold: float = 0.3,
+                              limit: Optional[int] = None) -> List[Tuple[Promise, float]]:
+        """Find promises similar to the given promise.
+        
+        Candidates come from the database's token index: only promises
+        sharing one of this promise's rarest words (enough of them that no
+        match can be missed) are scored.
+        """
+        matches = self.db_manager.find_similar(promise.text, threshold, exclude_id=promise.id, limit=limit)
+        scores = dict(matches)
+        similar = self.db_manager.get_promises_by_ids([promise_id for promise_id, _ in matches],
+                                                      include_sources=False)
+        return [(other_promise, scores[other_promise.id]) for other_promise in similar]
     
     def analyze_promise_complexity(self, promise: Promise) -> Dict[str, Any]:
         """Analyze the complexity and specificity of a promise."""
-        text = promise.text
-        
-        # Basic metrics
-        word_count = len(text.split())
-        sentence_count = len(re.split(r'[.!?]+', text))
-        avg_words_per_sentence = word_count / sentence_count if sentence_count > 0 else 0
-        
-        # Specificity indicators
-        specific_numbers = len(re.findall(r'\b\d+\b', text))
-        specific_dates = len(re.findall(r'\b\d{4}\b|\bday one\b|\bfirst day\b', text))
-        specific_amounts = len(re.findall(r'\$[\d,]+|\b\d+\s*(million|billion|trillion|percent|%)', text))
-        
-        # Action words
-        action_words = ['build', 'create', 'eliminate', 'reduce', 'increase', 'implement', 
-                       'establish', 'end', 'start', 'begin', 'stop', 'cancel']
-        action_count = sum(1 for word in action_words if word in text.lower())
+        return self.get_complexity([promise])[promise.text]
+    
+    def get_complexity(self, promises: List[Promise]) -> Dict[str, Dict[str, Any]]:
+        """Complexity analysis for several promises, keyed by promise text.
         
-        # Qualifier words (indicating uncertainty)
-        qualifier_words = ['maybe', 'possibly', 'might', 'could', 'probably', 'try', 'attempt']
-        qualifier_count = sum(1 for word in qualifier_words if word in text.lower())
+        Results are read from the ``promise_metrics`` table in one batch;
+        only texts never analyzed before (new or edited promises) are
+        computed, and those are stored for next time.
+        """
+        hashes = {promise.text: text_hash(promise.text) for promise in promises}
+        stored = self.db_manager.get_promise_metrics(list(hashes.values()))
         
-        # Calculate complexity score
-        complexity_score = min((
-            word_count * 0.01 +
-            specific_numbers * 0.1 +
-            specific_dates * 0.15 +
-            specific_amounts * 0.2 +
-            action_count * 0.1 -
-            qualifier_count * 0.1
-        ), 1.0)
+        missing = {hashes[text]: compute_complexity(text) for text in hashes if hashes[text] not in stored}
+        self.db_manager.save_promise_metrics(missing)
+        stored.update(missing)
         
-        return {
-            'word_count': word_count,
-            'sentence_count': sentence_count,
-            'avg_words_per_sentence': avg_words_per_sentence,
-            'specific_numbers': specific_numbers,
-            'specific_dates': specific_dates,
-            'specific_amounts': specific_amounts,
-            'action_words': action_count,
-            'qualifier_words': qualifier_count,
-            'complexity_score': max(complexity_score, 0.0),
-            'specificity_level': self._classify_specificity(complexity_score)
-        }
+        return {text: stored[hashes[text]] for text in hashes}
     
-    def _classify_specificity(self, score: float) -> str:
-        """Classify promise specificity based on score."""
-        if score >= 0.7:
-            return "Very Specific"
-        elif score >= 0.5:
-            return "Specific"
-        elif score >= 0.3:
-            return "Moderate"
-        elif score >= 0.1:
-            return "Vague"
-        else:
-            return "Very Vague"
+    def backfill_complexity(self, workers: Optional[int] = None, batch_size: int = 5000,
+                            prune: bool = True) -> Dict[str, int]:
+        """Compute missing complexity metrics for every promise.
+        
+        Walks the promises table in ID order; batches with at least
+        ``PROCESS_POOL_MIN_TEXTS`` texts to analyze are spread over a process
+        pool of ``workers`` processes (default: one per CPU; 1 disables the
+        pool). With ``prune``, metrics of texts no promise has any more are
+        deleted afterwards.
+        """
+        counts = {'scanned': 0, 'computed': 0, 'pruned': 0}
+        executor = None
+        try:
+            after_id = 0
+            while True:
+                rows = self.db_manager.get_promise_texts(after_id, batch_size)
+                if not rows:
+                    break
+                after_id = rows[-1][0]
+                counts['scanned'] += len(rows)
+                
+                texts = {text_hash(text): text for _, text in rows}
+                stored = self.db_manager.get_promise_metrics(list(texts))
+                missing = [(key, text) for key, text in texts.items() if key not in stored]
+                if not missing:
+                    continue
+                
+                if len(missing) >= self.PROCESS_POOL_MIN_TEXTS and workers != 1:
+                    if executor is None:
+                        executor = ProcessPoolExecutor(max_workers=workers)
+                    results = executor.map(compute_complexity, [text for _, text in missing], chunksize=256)
+                else:
+                    results = map(compute_complexity, [text for _, text in missing])
+                
+                self.db_manager.save_promise_metrics(dict(zip([key for key, _ in missing], results)))
+                counts['computed'] += len(missing)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        
+        if prune:
+            counts['pruned'] = self.db_manager.prune_promise_metrics(self._iter_text_hashes(batch_size))
+        return counts
+    
+    def _iter_text_hashes(self, batch_size: int):
+        """Yield the text hash of every promise, reading the table in batches."""
+        after_id = 0
+        while True:
+            rows = self.db_manager.get_promise_texts(after_id, batch_size)
+            if not rows:
+                return
+            after_id = rows[-1][0]
+            for _, text in rows:
+                yield text_hash(text)
     
     def generate_priority_recommendations(self, promises: List[Promise]) -> List[Dict[str, Any]]:
         """Generate recommendations for promise prioritization."""
         recommendations = []
+        complexities = self.get_complexity(promises)
         
         for promise in promises:
-            complexity = self.analyze_promise_complexity(promise)
+            complexity = complexities[promise.text]
             
             # Calculate recommendation score
             score = 0.0
@@ -294,7 +365,7 @@ class PromiseAnalyzer:
         """Export comprehensive analysis report."""
         analytics = self.generate_analytics_report()
         trends = self.analyze_promise_trends()
-        promises = self.db_manager.get_all_promises()
+        promises = self.db_manager.get_promise_rows()
         recommendations = self.generate_priority_recommendations(promises)
         
         report = {
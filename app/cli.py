@@ -6,10 +6,11 @@ import click
 from datetime import datetime
 from typing import Optional
 
-from .database import DatabaseManager
+from .database import DatabaseManager, TIMESTAMP_FORMATS
 from .models import Promise, Source, PromiseStatus, SourceType
 from .scraper import PromiseScraper, PromiseSourceManager
 from .analyzer import PromiseAnalyzer
+from .importer import iter_promises
 from config import Config
 
 
@@ -20,11 +21,13 @@ def cli():
 
 
 @cli.command()
-def init_db():
+@click.option('--timestamp-format', type=click.Choice(TIMESTAMP_FORMATS), default=Config.DB_TIMESTAMP_FORMAT,
+              help='Timestamp storage for a new database (an existing one keeps its format)')
+def init_db(timestamp_format: str):
     """Initialize the database."""
     click.echo("Initializing database...")
-    db_manager = DatabaseManager()
-    click.echo("Database initialized successfully!")
+    db_manager = DatabaseManager(timestamp_format=timestamp_format)
+    click.echo(f"Database initialized successfully! (timestamps: {db_manager.timestamp_format})")
 
 
 @cli.command()
@@ -75,17 +78,10 @@ def update_status(promise_id: int, status: str, notes: Optional[str]):
         click.echo(f"Invalid status. Valid options: {[s.value for s in PromiseStatus]}")
         return
     
-    promise = db_manager.get_promise(promise_id)
-    if not promise:
-        click.echo(f"Promise with ID {promise_id} not found.")
-        return
-    
-    promise.update_status(promise_status, notes or "")
-    
-    if db_manager.update_promise(promise):
+    if db_manager.update_status(promise_id, promise_status, notes or ""):
         click.echo(f"Promise {promise_id} status updated to: {status}")
     else:
-        click.echo("Failed to update promise status.")
+        click.echo(f"Promise with ID {promise_id} not found.")
 
 
 @cli.command()
@@ -104,16 +100,17 @@ def list_promises(category: Optional[str], status: Optional[str], limit: int):
             click.echo(f"Invalid status. Valid options: {[s.value for s in PromiseStatus]}")
             return
     
-    promises = db_manager.get_all_promises(category=category, status=status_filter)
+    filters = {'category': category, 'status': status_filter}
+    total = db_manager.count_promises(filters)
     
-    if not promises:
+    if not total:
         click.echo("No promises found matching the criteria.")
         return
     
-    click.echo(f"\nFound {len(promises)} promises:")
+    click.echo(f"\nFound {total} promises:")
     click.echo("=" * 80)
     
-    for i, promise in enumerate(promises[:limit]):
+    for promise in db_manager.query_promises(filters, limit=limit).promises:
         click.echo(f"\nID: {promise.id}")
         click.echo(f"Text: {promise.text[:100]}{'...' if len(promise.text) > 100 else ''}")
         click.echo(f"Category: {promise.category}")
@@ -170,6 +167,14 @@ def show_promise(promise_id: int):
         click.echo(f"\nProgress Updates ({len(progress_updates)}):")
         for update in progress_updates[:5]:  # Show last 5 updates
             click.echo(f"  • {update.date.strftime('%Y-%m-%d')}: {update.update_text}")
+    
+    # Show status/progress history
+    events = db_manager.get_promise_events(promise_id)
+    if events:
+        click.echo(f"\nHistory ({len(events)} changes):")
+        for event in events[:10]:  # Show last 10 changes
+            change = f"{event.kind} {event.old_value if event.old_value is not None else '?'} -> {event.new_value}"
+            click.echo(f"  • {event.changed_at.strftime('%Y-%m-%d')}: {change}" + (f" ({event.note})" if event.note else ""))
 
 
 @cli.command()
@@ -224,8 +229,8 @@ def scrape_promises(source_type: str, limit: int):
     scraped_promises = []
     
     if source_type == 'campaign':
-        for url in PromiseSourceManager.CAMPAIGN_WEBSITES[:2]:  # Limit to first 2 for demo
-            scraped_promises.extend(scraper.scrape_campaign_website(url))
+        # Limit to first 2 for demo
+        scraped_promises.extend(scraper.scrape_campaign_websites(PromiseSourceManager.CAMPAIGN_WEBSITES[:2]))
     elif source_type == 'rss':
         scraped_promises.extend(scraper.scrape_rss_feeds(PromiseSourceManager.RSS_FEEDS))
     elif source_type == 'transcripts':
@@ -252,6 +257,98 @@ def scrape_promises(source_type: str, limit: int):
     click.echo(f"\nAdded {added_count} new promises to the database.")
 
 
+@cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'file_format', type=click.Choice(['jsonl', 'csv']),
+              help='File format (default: from the file extension)')
+@click.option('--batch-size', type=int, default=1000, help='Promises per transaction')
+@click.option('--link-related', is_flag=True,
+              help='Link the imported promises into the related-promise graph (otherwise run rebuild-relations later)')
+def import_promises(path: str, file_format: Optional[str], batch_size: int, link_related: bool):
+    """Bulk import promises from a JSONL or CSV file."""
+    db_manager = DatabaseManager()
+    started = datetime.now()
+    
+    try:
+        count = db_manager.bulk_add_promises(iter_promises(path, file_format), batch_size=batch_size,
+                                             link_related=link_related)
+    except ValueError as e:
+        # Batches before the bad record are already committed
+        click.echo(f"Import stopped: {e}")
+        return
+    
+    elapsed = (datetime.now() - started).total_seconds()
+    click.echo(f"Imported {count} promises in {elapsed:.1f}s.")
+
+
+@cli.command()
+def rebuild_similarity_index():
+    """Rebuild the token index used to find similar promises."""
+    db_manager = DatabaseManager()
+    count = db_manager.rebuild_similarity_index()
+    click.echo(f"Indexed {count} promises for similarity lookups.")
+
+
+@cli.command()
+def rebuild_relations():
+    """Recompute the related-promise graph (explicit links and similarity edges)."""
+    db_manager = DatabaseManager()
+    count = db_manager.rebuild_relations()
+    click.echo(f"Stored {count} promise relations.")
+
+
+@cli.command()
+@click.option('--to', 'target', type=click.Choice(TIMESTAMP_FORMATS), required=True,
+              help='Timestamp storage to convert to')
+def migrate_timestamps(target: str):
+    """Convert stored promise timestamps between ISO text and epoch microseconds."""
+    db_manager = DatabaseManager()
+    if db_manager.timestamp_format == target:
+        click.echo(f"Timestamps are already stored as {target}.")
+        return
+    count = db_manager.migrate_timestamps(target)
+    click.echo(f"Converted {count} rows to {target} timestamps. Restart running app servers to pick up the change.")
+
+
+@cli.command()
+@click.option('--workers', type=int, help='Worker processes for large batches (default: one per CPU, 1 disables)')
+@click.option('--batch-size', type=int, default=5000, help='Promises read per batch')
+@click.option('--no-prune', is_flag=True, help='Keep metrics of texts no promise uses any more')
+def backfill_metrics(workers: Optional[int], batch_size: int, no_prune: bool):
+    """Compute missing complexity metrics for all promises."""
+    db_manager = DatabaseManager()
+    analyzer = PromiseAnalyzer(db_manager)
+    counts = analyzer.backfill_complexity(workers=workers, batch_size=batch_size, prune=not no_prune)
+    click.echo(f"Scanned {counts['scanned']} promises: computed {counts['computed']} metrics, "
+               f"pruned {counts['pruned']} stale ones.")
+
+
+@cli.command()
+def rebuild_aggregates():
+    """Recompute the analytics summary table from the promises table."""
+    db_manager = DatabaseManager()
+    db_manager.rebuild_aggregates()
+    click.echo("Analytics aggregates rebuilt.")
+
+
+@cli.command()
+def check_aggregates():
+    """Check the analytics summary table against the promises table."""
+    db_manager = DatabaseManager()
+    mismatches = db_manager.check_aggregates()
+    
+    if not mismatches:
+        click.echo("Analytics aggregates are consistent.")
+        return
+    
+    click.echo(f"Found {len(mismatches)} inconsistent aggregates:")
+    for mismatch in mismatches:
+        click.echo(f"  {mismatch['status']} / {mismatch['category']}: "
+                   f"stored {mismatch['stored_count']} ({mismatch['stored_progress_sum']:.1f}%), "
+                   f"actual {mismatch['actual_count']} ({mismatch['actual_progress_sum']:.1f}%)")
+    click.echo("Run 'rebuild-aggregates' to repair them.")
+
+
 @cli.command()
 def show_stats():
     """Show quick statistics."""
@@ -279,23 +376,11 @@ def update_progress(promise_id: int, progress: float, notes: Optional[str]):
         return
     
     db_manager = DatabaseManager()
-    promise = db_manager.get_promise(promise_id)
     
-    if not promise:
-        click.echo(f"Promise with ID {promise_id} not found.")
-        return
-    
-    old_progress = promise.progress_percentage
-    promise.progress_percentage = progress
-    promise.date_updated = datetime.now()
-    
-    if notes:
-        promise.notes += f"\n[{datetime.now().strftime('%Y-%m-%d')}] Progress updated from {old_progress}% to {progress}%: {notes}"
-    
-    if db_manager.update_promise(promise):
+    if db_manager.update_progress(promise_id, progress, notes or ""):
         click.echo(f"Promise {promise_id} progress updated to {progress}%")
     else:
-        click.echo("Failed to update promise progress.")
+        click.echo(f"Promise with ID {promise_id} not found.")
 
 
 if __name__ == '__main__':
@@ -3,19 +3,111 @@ Database utilities for the Trump Promises Tracker application.
 """
 
 import os
+import re
+import base64
 import sqlite3
 import json
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Tuple
 from contextlib import contextmanager
+from itertools import islice
 
-from .models import Promise, Source, ProgressUpdate, PromiseStatus, SourceType
+from .models import (Promise, PromiseEvent, PromisePage, PromiseRow, SearchResult, Source, ProgressUpdate,
+                     PromiseStatus, SourceType, format_timestamp, parse_timestamp, to_epoch_us)
+from .pool import ConnectionPool
+from .similarity import SimilarityIndex
+
+
+# Markers around matched terms in search snippets; callers swap them for
+# markup after escaping the snippet text.
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_END = "\x03"
+
+# History lines the status/progress updaters used to append to promise notes,
+# parsed once to backfill ``promise_events``
+NOTE_STATUS_PATTERN = re.compile(r'^\[(\d{4}-\d{2}-\d{2})\] Status changed to (.+?):\s*(.*)$')
+NOTE_PROGRESS_PATTERN = re.compile(r'^\[(\d{4}-\d{2}-\d{2})\] Progress updated from ([\d.]+)% to ([\d.]+)%:\s*(.*)$')
+
+# How promise, progress update and event timestamps are stored: ISO 8601
+# text, or INTEGER microseconds since ``models.EPOCH``
+TIMESTAMP_FORMATS = ('iso', 'epoch_us')
+
+# Timestamp columns of the tables whose storage format can be migrated
+TIMESTAMP_COLUMNS = {
+    'promises': ('date_made', 'date_updated', 'created_at'),
+    'progress_updates': ('date', 'created_at'),
+    'promise_events': ('changed_at',),
+}
+
+
+class StaleVersionError(Exception):
+    """A promise was changed by someone else since the version the caller read."""
+    
+    def __init__(self, promise_id: int, expected_version: int, current_version: int):
+        super().__init__(f"Promise {promise_id} is at version {current_version}, not {expected_version}")
+        self.promise_id = promise_id
+        self.expected_version = expected_version
+        self.current_version = current_version
 
 
 class DatabaseManager:
     """Manages database operations for the promises tracker."""
     
-    def __init__(self, db_path: str = "data/promises.db"):
+    # Promise IDs per ``IN (...)`` query when batch-loading sources; stays
+    # under SQLite's default host parameter limit.
+    SOURCE_BATCH_SIZE = 500
+    
+    # Statuses that count towards the fulfillment rate
+    FULFILLED_STATUSES = ('Fulfilled', 'Partially Fulfilled')
+    
+    # Similarity edges stored per written promise: Jaccard threshold and
+    # number of most similar promises linked
+    RELATED_THRESHOLD = 0.2
+    RELATED_LIMIT = 5
+    
+    # Postings scored per similarity lookup when linking, so a write costs the
+    # same however large the table is (see SimilarityIndex.query)
+    RELATED_CANDIDATES = 200
+    
+    # Tables whose writes bump the data version (see ``_init_data_version``).
+    # Derived tables (aggregates, tags, search and similarity indexes) only
+    # change along with these, apart from explicit rebuilds.
+    VERSIONED_TABLES = ('sources', 'promises', 'promise_sources', 'progress_updates', 'promise_events',
+                        'promise_relations', 'promise_metrics', 'validation_runs', 'link_checks',
+                        'link_states')
+    
+    # Statement that records a write: run by the triggers and ``_bump_data_version``
+    BUMP_DATA_VERSION = """
+        UPDATE data_version SET version = version + 1,
+                                modified = strftime('%Y-%m-%dT%H:%M:%f000+00:00', 'now')
+        WHERE id = 1;
+    """
+    
+    # Columns query_promises can order (and paginate) by
+    ORDER_COLUMNS = ('date_updated', 'created_at')
+    
+    # Columns of ``promise_metrics``, as produced by ``analyzer.compute_complexity``
+    METRIC_COLUMNS = ('word_count', 'sentence_count', 'avg_words_per_sentence', 'specific_numbers',
+                      'specific_dates', 'specific_amounts', 'action_words', 'qualifier_words',
+                      'complexity_score', 'specificity_level')
+    
+    # Keys of ``Promise.to_dict()``, the fields iter_promise_dicts can project
+    PROMISE_FIELDS = ('id', 'text', 'category', 'status', 'priority', 'date_made', 'date_updated',
+                      'sources', 'tags', 'notes', 'progress_percentage', 'related_promises', 'created_at',
+                      'version')
+    
+    # Promise columns patch_promise can change
+    PATCH_FIELDS = ('text', 'category', 'status', 'priority', 'date_made', 'tags', 'notes',
+                    'progress_percentage', 'related_promises')
+    
+    def __init__(self, db_path: str = "data/promises.db", timestamp_format: str = "iso", **pool_options):
+        """``timestamp_format`` (one of ``TIMESTAMP_FORMATS``) only applies to a new
+        database; an existing one keeps the format recorded in its schema.
+        """
+        if timestamp_format not in TIMESTAMP_FORMATS:
+            raise ValueError(f"Unknown timestamp format {timestamp_format!r}")
+        self.timestamp_format = timestamp_format
+        
         # Convert to absolute path based on the project root
         if not os.path.isabs(db_path):
             project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -25,6 +117,10 @@ class DatabaseManager:
         
         # Ensure data directory exists
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        
+        # Connections are shared by every DatabaseManager on the same file
+        self.pool = ConnectionPool.for_path(self.db_path, **pool_options)
+        self.similarity = SimilarityIndex()
         self.init_database()
     
     def init_database(self) -> None:
@@ -46,24 +142,21 @@ class DatabaseManager:
                 )
             """)
             
-            # Create promises table
+            # Key/value store for schema bookkeeping (one-off backfills etc.)
             cursor.execute("""
-                CREATE TABLE IF NOT EXISTS promises (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    text TEXT NOT NULL,
-                    category TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    priority INTEGER DEFAULT 3,
-                    date_made TEXT,
-                    date_updated TEXT NOT NULL,
-                    tags TEXT,  -- JSON array
-                    notes TEXT,
-                    progress_percentage REAL DEFAULT 0.0,
-                    related_promises TEXT,  -- JSON array of IDs
-                    created_at TEXT NOT NULL
+                CREATE TABLE IF NOT EXISTS schema_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
                 )
             """)
             
+            # Storage format of timestamps, fixed when the promises table is created
+            self.timestamp_format = self._init_timestamp_format(cursor)
+            
+            # Create promises, progress_updates and promise_events tables
+            self._create_timeline_tables(cursor)
+            self._ensure_column(cursor, 'promises', 'version', 'INTEGER NOT NULL DEFAULT 1')
+            
             # Create promise_sources junction table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS promise_sources (
@@ -75,41 +168,373 @@ class DatabaseManager:
                 )
             """)
             
-            # Create progress_updates table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS progress_updates (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    promise_id INTEGER NOT NULL,
-                    update_text TEXT NOT NULL,
-                    date TEXT NOT NULL,
-                    source_url TEXT,
-                    impact_score REAL DEFAULT 0.0,
-                    created_at TEXT NOT NULL,
-                    FOREIGN KEY (promise_id) REFERENCES promises (id) ON DELETE CASCADE
-                )
-            """)
-            
             # Create indexes for better performance
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_promises_category ON promises (category)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_promises_status ON promises (status)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_promises_date_made ON promises (date_made)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_progress_updates_promise_id ON progress_updates (promise_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sources_url ON sources (url)")
+            
+            # Composite indexes backing keyset pagination, with and without filters
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_promises_updated_id ON promises (date_updated, id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_promises_created_id ON promises (created_at, id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_promises_category_updated ON promises (category, date_updated, id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_promises_status_updated ON promises (status, date_updated, id)")
+            
+            self.fts_enabled = self._init_search_index(cursor)
+            
+            # Token index for similar-promise lookups
+            self.similarity.create_schema(cursor)
+            if not self._get_meta(cursor, 'similarity_built'):
+                self.similarity.rebuild(cursor)
+                self._set_meta(cursor, 'similarity_built', datetime.now().isoformat())
+            # Token frequencies were added to the index later; count them once
+            if not self._get_meta(cursor, 'token_frequencies_built'):
+                self.similarity.count_frequencies(cursor)
+                self._set_meta(cursor, 'token_frequencies_built', datetime.now().isoformat())
+            
+            # Trigger-maintained counters behind get_analytics_data
+            self._init_aggregates(cursor)
+            
+            # One row per (promise, tag), mirroring the JSON tags column
+            self._init_tag_index(cursor)
+            
+            # Related-promise graph: explicit links and similarity edges
+            self._init_relations(cursor)
+            
+            # Append-only history of status and progress changes
+            self._init_events(cursor)
+            
+            # Complexity analysis per distinct promise text (see PromiseAnalyzer)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS promise_metrics (
+                    text_hash TEXT PRIMARY KEY,
+                    word_count INTEGER NOT NULL,
+                    sentence_count INTEGER NOT NULL,
+                    avg_words_per_sentence REAL NOT NULL,
+                    specific_numbers INTEGER NOT NULL,
+                    specific_dates INTEGER NOT NULL,
+                    specific_amounts INTEGER NOT NULL,
+                    action_words INTEGER NOT NULL,
+                    qualifier_words INTEGER NOT NULL,
+                    complexity_score REAL NOT NULL,
+                    specificity_level TEXT NOT NULL,
+                    computed_at TEXT NOT NULL
+                )
+            """)
+            
+            # Link validation history: one row per run, one row per source checked
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS validation_runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    started_at TEXT NOT NULL,
+                    finished_at TEXT,
+                    status TEXT NOT NULL,
+                    message TEXT,
+                    total_count INTEGER DEFAULT 0,
+                    valid_count INTEGER DEFAULT 0,
+                    invalid_count INTEGER DEFAULT 0,
+                    placeholder_count INTEGER DEFAULT 0,
+                    skipped_count INTEGER DEFAULT 0  -- fresh sources not requested (incremental runs)
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS link_checks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_id INTEGER,  -- NULL for one-off checks
+                    source_id INTEGER NOT NULL,
+                    url TEXT,
+                    is_valid INTEGER NOT NULL,
+                    is_placeholder INTEGER NOT NULL DEFAULT 0,
+                    status_code INTEGER,
+                    latency_ms REAL,
+                    error_message TEXT,
+                    checked_at TEXT NOT NULL,
+                    FOREIGN KEY (run_id) REFERENCES validation_runs (id) ON DELETE CASCADE,
+                    FOREIGN KEY (source_id) REFERENCES sources (id) ON DELETE CASCADE
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_validation_runs_finished ON validation_runs (status, finished_at)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_link_checks_run ON link_checks (run_id, source_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_link_checks_source ON link_checks (source_id, checked_at)")
+            
+            # Latest known link state per source, driving incremental revalidation
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS link_states (
+                    source_id INTEGER PRIMARY KEY,
+                    url TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    is_valid INTEGER NOT NULL,
+                    status_code INTEGER,
+                    error_message TEXT,
+                    last_checked TEXT NOT NULL,
+                    next_check_at TEXT NOT NULL,
+                    ttl_seconds INTEGER NOT NULL,
+                    success_streak INTEGER DEFAULT 0,
+                    failure_streak INTEGER DEFAULT 0,
+                    FOREIGN KEY (source_id) REFERENCES sources (id) ON DELETE CASCADE
+                )
+            """)
+            
+            # Write counter behind get_data_version, bumped by triggers
+            self._init_data_version(cursor)
             
             conn.commit()
     
+    def _init_search_index(self, cursor: sqlite3.Cursor) -> bool:
+        """Create the FTS5 index over promises and the triggers that keep it in sync.
+        
+        Returns False when this SQLite build lacks FTS5; search then falls
+        back to ``LIKE`` matching.
+        """
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS promises_fts USING fts5(
+                    text, category, tags, notes,
+                    content='promises', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2',
+                    prefix='2 3'
+                )
+            """)
+        except sqlite3.OperationalError:
+            return False
+        
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS promises_fts_insert AFTER INSERT ON promises BEGIN
+                INSERT INTO promises_fts (rowid, text, category, tags, notes)
+                VALUES (new.id, new.text, new.category, new.tags, new.notes);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS promises_fts_delete AFTER DELETE ON promises BEGIN
+                INSERT INTO promises_fts (promises_fts, rowid, text, category, tags, notes)
+                VALUES ('delete', old.id, old.text, old.category, old.tags, old.notes);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS promises_fts_update AFTER UPDATE OF text, category, tags, notes ON promises BEGIN
+                INSERT INTO promises_fts (promises_fts, rowid, text, category, tags, notes)
+                VALUES ('delete', old.id, old.text, old.category, old.tags, old.notes);
+                INSERT INTO promises_fts (rowid, text, category, tags, notes)
+                VALUES (new.id, new.text, new.category, new.tags, new.notes);
+            END
+        """)
+        
+        # Index promises that predate the FTS table
+        if not self._get_meta(cursor, 'fts_built'):
+            cursor.execute("INSERT INTO promises_fts (promises_fts) VALUES ('rebuild')")
+            self._set_meta(cursor, 'fts_built', datetime.now().isoformat())
+        
+        return True
+    
+    def _init_timestamp_format(self, cursor: sqlite3.Cursor) -> str:
+        """The database's timestamp format, recording ``self.timestamp_format`` for a new one.
+        
+        Databases created before the format was recorded store ISO text.
+        """
+        timestamp_format = self._get_meta(cursor, 'timestamp_format')
+        if timestamp_format is None:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'promises'")
+            timestamp_format = 'iso' if cursor.fetchone() else self.timestamp_format
+            self._set_meta(cursor, 'timestamp_format', timestamp_format)
+        return timestamp_format
+    
+    def _create_timeline_tables(self, cursor: sqlite3.Cursor, suffix: str = "") -> None:
+        """Create the tables with ``TIMESTAMP_COLUMNS``, typed for ``self.timestamp_format``.
+        
+        ``suffix`` names copies of the tables, for ``migrate_timestamps``.
+        """
+        ts = 'INTEGER' if self.timestamp_format == 'epoch_us' else 'TEXT'
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS promises{suffix} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                text TEXT NOT NULL,
+                category TEXT NOT NULL,
+                status TEXT NOT NULL,
+                priority INTEGER DEFAULT 3,
+                date_made {ts},
+                date_updated {ts} NOT NULL,
+                tags TEXT,  -- JSON array
+                notes TEXT,
+                progress_percentage REAL DEFAULT 0.0,
+                related_promises TEXT,  -- JSON array of IDs
+                created_at {ts} NOT NULL,
+                version INTEGER NOT NULL DEFAULT 1  -- Bumped on every write (optimistic locking)
+            )
+        """)
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS progress_updates{suffix} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                promise_id INTEGER NOT NULL,
+                update_text TEXT NOT NULL,
+                date {ts} NOT NULL,
+                source_url TEXT,
+                impact_score REAL DEFAULT 0.0,
+                created_at {ts} NOT NULL,
+                FOREIGN KEY (promise_id) REFERENCES promises (id) ON DELETE CASCADE
+            )
+        """)
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS promise_events{suffix} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                promise_id INTEGER NOT NULL,
+                kind TEXT NOT NULL,  -- 'status' or 'progress'
+                old_value,  -- status text or progress number; NULL if unknown
+                new_value,
+                note TEXT,
+                changed_at {ts} NOT NULL,
+                FOREIGN KEY (promise_id) REFERENCES promises (id) ON DELETE CASCADE
+            )
+        """)
+    
+    def _ts(self, value: Optional[datetime]) -> Any:
+        """Encode a datetime for a timestamp column in the database's format."""
+        if value is None:
+            return None
+        return to_epoch_us(value) if self.timestamp_format == 'epoch_us' else value.isoformat()
+    
+    def migrate_timestamps(self, target: str) -> int:
+        """Convert the stored timestamps to ``target`` (one of ``TIMESTAMP_FORMATS``).
+        
+        The tables in ``TIMESTAMP_COLUMNS`` are rebuilt with the matching
+        column types in one transaction, keeping row IDs, and their indexes
+        and triggers are recreated. Returns the number of rows converted
+        (0 if the database already uses ``target``). Other processes must
+        reopen the database afterwards, since they cache the format.
+        """
+        if target not in TIMESTAMP_FORMATS:
+            raise ValueError(f"Unknown timestamp format {target!r}")
+        if target == self.timestamp_format:
+            return 0
+        
+        def convert(value):
+            if value is None:
+                return None
+            return to_epoch_us(parse_timestamp(value)) if target == 'epoch_us' else format_timestamp(value)
+        
+        source_format = self.timestamp_format
+        converted = 0
+        with self.get_connection() as conn:
+            conn.create_function('convert_timestamp', 1, convert, deterministic=True)
+            cursor = conn.cursor()
+            # Explicit, so the table rebuilds (DDL) are part of the transaction
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                self.timestamp_format = target
+                self._create_timeline_tables(cursor, suffix='_migrating')
+                for table, timestamp_columns in TIMESTAMP_COLUMNS.items():
+                    columns = [row['name'] for row in cursor.execute(f"PRAGMA table_info({table}_migrating)")]
+                    selected = ", ".join(
+                        f"convert_timestamp({column})" if column in timestamp_columns else column
+                        for column in columns
+                    )
+                    cursor.execute(f"INSERT INTO {table}_migrating ({', '.join(columns)}) SELECT {selected} FROM {table}")
+                    converted += cursor.rowcount
+                    
+                    # Keep AUTOINCREMENT from reusing the IDs of deleted rows
+                    sequence = cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+                    cursor.execute(f"DROP TABLE {table}")
+                    cursor.execute(f"ALTER TABLE {table}_migrating RENAME TO {table}")
+                    if sequence:
+                        cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?",
+                                       (sequence['seq'], table))
+                
+                self._set_meta(cursor, 'timestamp_format', target)
+                self._bump_data_version(cursor)
+                conn.commit()
+            except Exception:
+                self.timestamp_format = source_format
+                raise
+        
+        # Dropping the tables dropped their indexes and triggers
+        self.init_database()
+        return converted
+    
+    @staticmethod
+    def _ensure_column(cursor: sqlite3.Cursor, table: str, column: str, definition: str) -> None:
+        """Add ``column`` to a table created before the column existed."""
+        cursor.execute(f"PRAGMA table_info({table})")
+        if column not in {row['name'] for row in cursor.fetchall()}:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    
+    def _get_meta(self, cursor: sqlite3.Cursor, key: str) -> Optional[str]:
+        """Read a value from ``schema_meta``."""
+        cursor.execute("SELECT value FROM schema_meta WHERE key = ?", (key,))
+        row = cursor.fetchone()
+        return row['value'] if row else None
+    
+    def _set_meta(self, cursor: sqlite3.Cursor, key: str, value: str) -> None:
+        """Write a value to ``schema_meta``."""
+        cursor.execute("INSERT OR REPLACE INTO schema_meta (key, value) VALUES (?, ?)", (key, value))
+    
+    def get_data_version(self) -> Tuple[int, Optional[datetime]]:
+        """Get the data version counter and the UTC time of the last write.
+        
+        Every write to one of ``VERSIONED_TABLES`` bumps the version, from
+        any process or script using the same database file (including raw
+        SQL through ``get_connection``), so it can key caches of anything
+        derived from the data.
+        """
+        with self.get_connection() as conn:
+            row = conn.execute("SELECT version, modified FROM data_version WHERE id = 1").fetchone()
+        return row['version'], datetime.fromisoformat(row['modified']) if row['modified'] else None
+    
+    def _init_data_version(self, cursor: sqlite3.Cursor) -> None:
+        """Create the ``data_version`` row and the triggers that bump it.
+        
+        Each insert, update or delete on a table in ``VERSIONED_TABLES``
+        increments the counter and stamps the (UTC) time in the same
+        transaction, so writers don't have to remember to record it.
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS data_version (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL,
+                modified TEXT
+            )
+        """)
+        # Carry on from the counter kept in schema_meta before the triggers
+        cursor.execute("""
+            INSERT OR IGNORE INTO data_version (id, version, modified)
+            SELECT 1,
+                   COALESCE((SELECT CAST(value AS INTEGER) FROM schema_meta WHERE key = 'data_version'), 0),
+                   (SELECT value FROM schema_meta WHERE key = 'data_modified')
+        """)
+        cursor.execute("DELETE FROM schema_meta WHERE key IN ('data_version', 'data_modified')")
+        
+        for table in self.VERSIONED_TABLES:
+            for operation in ('INSERT', 'UPDATE', 'DELETE'):
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {table}_data_version_{operation.lower()}
+                    AFTER {operation} ON {table}
+                    BEGIN {self.BUMP_DATA_VERSION} END
+                """)
+    
+    def _bump_data_version(self, cursor: sqlite3.Cursor) -> None:
+        """Record a write the triggers don't see, such as rebuilding a derived table."""
+        cursor.connection.execute(self.BUMP_DATA_VERSION)
+    
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path, timeout=30.0)
-        conn.row_factory = sqlite3.Row  # Enable column access by name
-        conn.execute("PRAGMA journal_mode=WAL")  # Enable WAL mode for better concurrency
+        """Context manager for the calling thread's pooled connection.
+        
+        Work that was not committed when the block exits is rolled back, as
+        it would have been when the connection was closed after each call.
+        """
+        conn = self.pool.acquire()
         try:
             yield conn
         except Exception:
             conn.rollback()
             raise
         finally:
-            conn.close()
+            if conn.in_transaction:
+                conn.rollback()
+    
+    def close(self) -> None:
+        """Close all pooled connections to this database."""
+        self.pool.close_all()
     
     def add_source(self, source: Source) -> int:
         """Add a new source to the database."""
@@ -118,15 +543,7 @@ class DatabaseManager:
             cursor.execute("""
                 INSERT INTO sources (url, title, source_type, date, description, reliability_score, created_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                source.url,
-                source.title,
-                source.source_type.value,
-                source.date.isoformat() if source.date else None,
-                source.description,
-                source.reliability_score,
-                source.created_at.isoformat()
-            ))
+            """, self._source_params(source))
             conn.commit()
             return cursor.lastrowid
     
@@ -138,16 +555,7 @@ class DatabaseManager:
             row = cursor.fetchone()
             
             if row:
-                return Source(
-                    id=row['id'],
-                    url=row['url'],
-                    title=row['title'],
-                    source_type=SourceType(row['source_type']),
-                    date=datetime.fromisoformat(row['date']) if row['date'] else None,
-                    description=row['description'],
-                    reliability_score=row['reliability_score'],
-                    created_at=datetime.fromisoformat(row['created_at'])
-                )
+                return self._row_to_source(row)
             return None
     
     def add_promise(self, promise: Promise) -> int:
@@ -162,15 +570,7 @@ class DatabaseManager:
                     cursor.execute("""
                         INSERT INTO sources (url, title, source_type, date, description, reliability_score, created_at)
                         VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        source.url,
-                        source.title,
-                        source.source_type.value,
-                        source.date.isoformat() if source.date else None,
-                        source.description,
-                        source.reliability_score,
-                        source.created_at.isoformat()
-                    ))
+                    """, self._source_params(source))
                     source.id = cursor.lastrowid
                 source_ids.append(source.id)
             
@@ -179,19 +579,7 @@ class DatabaseManager:
                 INSERT INTO promises (text, category, status, priority, date_made, date_updated, 
                                     tags, notes, progress_percentage, related_promises, created_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                promise.text,
-                promise.category,
-                promise.status.value,
-                promise.priority,
-                promise.date_made.isoformat() if promise.date_made else None,
-                promise.date_updated.isoformat(),
-                json.dumps(promise.tags),
-                promise.notes,
-                promise.progress_percentage,
-                json.dumps(promise.related_promises),
-                promise.created_at.isoformat()
-            ))
+            """, self._promise_params(promise))
             
             promise_id = cursor.lastrowid
             
@@ -202,9 +590,145 @@ class DatabaseManager:
                     VALUES (?, ?)
                 """, (promise_id, source_id))
             
+            self.similarity.index_promise(cursor, promise_id, promise.text)
+            self._link_similar(cursor, [(promise_id, promise.text)])
+            
             conn.commit()
             return promise_id or 0
     
+    def bulk_add_promises(self, promises: Iterable[Promise], batch_size: int = 1000,
+                          link_related: bool = False) -> int:
+        """Add many promises, committing once per batch of ``batch_size``.
+        
+        ``promises`` is consumed lazily, so arbitrarily large imports run in
+        constant memory. Sources are deduplicated by URL, both within the
+        import and against sources already stored (earlier batches are
+        committed, so each batch only looks up its own URLs); sources without
+        a URL are always inserted. Sources, promises and their links are written with
+        one ``executemany`` each per batch. Assigns ``id`` on every promise
+        and source it writes and returns the number of promises added.
+        The related-promise graph is left alone unless ``link_related`` is
+        set: each batch's promises are then linked to their most similar
+        promises (stored ones and earlier batches), as ``add_promise`` does.
+        Lists of existing promises that would now take an import in are
+        left to ``rebuild_relations``.
+        """
+        iterator = iter(promises)
+        total = 0
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            
+            while True:
+                batch = list(islice(iterator, batch_size))
+                if not batch:
+                    break
+                
+                # Sources: reuse stored rows by URL, insert the rest in one go
+                source_ids_by_url: Dict[str, int] = {}
+                self._resolve_source_urls(cursor, batch, source_ids_by_url)
+                new_sources = []
+                queued = set()  # id() of Source objects shared by several promises
+                for promise in batch:
+                    for source in promise.sources:
+                        if source.id is not None or id(source) in queued:
+                            continue
+                        if source.url and source.url in source_ids_by_url:
+                            source.id = source_ids_by_url[source.url]
+                            continue
+                        new_sources.append(source)
+                        queued.add(id(source))
+                        if source.url:
+                            source_ids_by_url[source.url] = -1  # Claimed; real ID assigned below
+                
+                if new_sources:
+                    cursor.executemany("""
+                        INSERT INTO sources (url, title, source_type, date, description, reliability_score, created_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """, (self._source_params(source) for source in new_sources))
+                    for source, source_id in zip(new_sources, self._inserted_ids(cursor, len(new_sources))):
+                        source.id = source_id
+                        if source.url:
+                            source_ids_by_url[source.url] = source_id
+                    for promise in batch:
+                        for source in promise.sources:
+                            if source.id == -1:
+                                source.id = source_ids_by_url[source.url]
+                
+                cursor.executemany("""
+                    INSERT INTO promises (text, category, status, priority, date_made, date_updated,
+                                        tags, notes, progress_percentage, related_promises, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (self._promise_params(promise) for promise in batch))
+                for promise, promise_id in zip(batch, self._inserted_ids(cursor, len(batch))):
+                    promise.id = promise_id
+                
+                cursor.executemany("""
+                    INSERT OR IGNORE INTO promise_sources (promise_id, source_id)
+                    VALUES (?, ?)
+                """, ((promise.id, source.id) for promise in batch for source in promise.sources))
+                
+                self.similarity.index_new_promises(cursor, ((promise.id, promise.text) for promise in batch))
+                if link_related:
+                    self._link_similar(cursor, [(promise.id, promise.text) for promise in batch])
+                
+                conn.commit()
+                total += len(batch)
+        
+        return total
+    
+    def _resolve_source_urls(self, cursor: sqlite3.Cursor, promises: List[Promise],
+                             source_ids_by_url: Dict[str, int]) -> None:
+        """Look up stored source IDs for URLs in ``promises`` not seen yet."""
+        urls = list({
+            source.url for promise in promises for source in promise.sources
+            if source.id is None and source.url and source.url not in source_ids_by_url
+        })
+        for start in range(0, len(urls), self.SOURCE_BATCH_SIZE):
+            chunk = urls[start:start + self.SOURCE_BATCH_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            cursor.execute(f"SELECT url, MIN(id) FROM sources WHERE url IN ({placeholders}) GROUP BY url", chunk)
+            source_ids_by_url.update(cursor.fetchall())
+    
+    @staticmethod
+    def _inserted_ids(cursor: sqlite3.Cursor, count: int) -> range:
+        """IDs of the ``count`` rows just inserted by one ``executemany``.
+        
+        The open write transaction keeps other writers out, so the rows got
+        consecutive rowids ending at ``last_insert_rowid()``.
+        """
+        last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+        return range(last_id - count + 1, last_id + 1)
+    
+    @staticmethod
+    def _source_params(source: Source) -> Tuple:
+        """Column values for inserting ``source`` into the sources table."""
+        return (
+            source.url,
+            source.title,
+            source.source_type.value,
+            source.date.isoformat() if source.date else None,
+            source.description,
+            source.reliability_score,
+            source.created_at.isoformat()
+        )
+    
+    def _promise_params(self, promise: Promise) -> Tuple:
+        """Column values for inserting ``promise`` into the promises table."""
+        return (
+            promise.text,
+            promise.category,
+            promise.status.value,
+            promise.priority,
+            self._ts(promise.date_made),
+            self._ts(promise.date_updated),
+            json.dumps(promise.tags),
+            promise.notes,
+            promise.progress_percentage,
+            json.dumps(promise.related_promises),
+            self._ts(promise.created_at)
+        )
+    
     def get_promise(self, promise_id: int) -> Optional[Promise]:
         """Get a promise by ID with all associated sources."""
         with self.get_connection() as conn:
@@ -217,141 +741,458 @@ class DatabaseManager:
             if not row:
                 return None
             
-            # Get associated sources
-            cursor.execute("""
-                SELECT s.* FROM sources s
-                INNER JOIN promise_sources ps ON s.id = ps.source_id
-                WHERE ps.promise_id = ?
-            """, (promise_id,))
-            source_rows = cursor.fetchall()
-            
-            sources = []
-            for source_row in source_rows:
-                sources.append(Source(
-                    id=source_row['id'],
-                    url=source_row['url'],
-                    title=source_row['title'],
-                    source_type=SourceType(source_row['source_type']),
-                    date=datetime.fromisoformat(source_row['date']) if source_row['date'] else None,
-                    description=source_row['description'],
-                    reliability_score=source_row['reliability_score'],
-                    created_at=datetime.fromisoformat(source_row['created_at'])
-                ))
-            
-            return Promise(
-                id=row['id'],
-                text=row['text'],
-                category=row['category'],
-                status=PromiseStatus(row['status']),
-                priority=row['priority'],
-                date_made=datetime.fromisoformat(row['date_made']) if row['date_made'] else None,
-                date_updated=datetime.fromisoformat(row['date_updated']),
-                sources=sources,
-                tags=json.loads(row['tags']) if row['tags'] else [],
-                notes=row['notes'] or "",
-                progress_percentage=row['progress_percentage'],
-                related_promises=json.loads(row['related_promises']) if row['related_promises'] else [],
-                created_at=datetime.fromisoformat(row['created_at'])
-            )
+            promise = self._row_to_promise(row)
+            promise.sources = self._load_sources(cursor, [promise_id]).get(promise_id, [])
+            return promise
     
     def update_promise(self, promise: Promise) -> bool:
-        """Update an existing promise."""
+        """Update an existing promise, rewriting every column.
+        
+        Not version-checked; use ``patch_promise`` to change a few fields
+        with lost-update detection.
+        """
         if promise.id is None:
             return False
         
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
+            cursor.execute("SELECT text, status, progress_percentage, version FROM promises WHERE id = ?",
+                           (promise.id,))
+            row = cursor.fetchone()
+            text_changed = row is not None and row['text'] != promise.text
+            
             cursor.execute("""
                 UPDATE promises 
                 SET text = ?, category = ?, status = ?, priority = ?, date_made = ?, 
                     date_updated = ?, tags = ?, notes = ?, progress_percentage = ?, 
-                    related_promises = ?
+                    related_promises = ?, version = version + 1
                 WHERE id = ?
             """, (
                 promise.text,
                 promise.category,
                 promise.status.value,
                 promise.priority,
-                promise.date_made.isoformat() if promise.date_made else None,
-                promise.date_updated.isoformat(),
+                self._ts(promise.date_made),
+                self._ts(promise.date_updated),
                 json.dumps(promise.tags),
                 promise.notes,
                 promise.progress_percentage,
                 json.dumps(promise.related_promises),
                 promise.id
             ))
+            updated = cursor.rowcount > 0
+            
+            if updated:
+                promise.version = row['version'] + 1
+                if text_changed:
+                    self.similarity.index_promise(cursor, promise.id, promise.text)
+                    self._link_similar(cursor, [(promise.id, promise.text)])
+                if row['status'] != promise.status.value:
+                    self._add_event(cursor, promise.id, 'status', row['status'], promise.status.value,
+                                    changed_at=promise.date_updated)
+                if row['progress_percentage'] != promise.progress_percentage:
+                    self._add_event(cursor, promise.id, 'progress', row['progress_percentage'],
+                                    promise.progress_percentage, changed_at=promise.date_updated)
             
             conn.commit()
-            return cursor.rowcount > 0
+            return updated
     
-    def get_all_promises(self, category: Optional[str] = None, status: Optional[PromiseStatus] = None) -> List[Promise]:
-        """Get all promises, optionally filtered by category or status."""
+    def get_all_promises(self, category: Optional[str] = None, status: Optional[PromiseStatus] = None,
+                         include_sources: bool = True) -> List[Promise]:
+        """Get all promises, optionally filtered by category or status.
+        
+        Sources are loaded with a single join over the same filter rather than
+        one query per promise. Pass ``include_sources=False`` when the caller
+        only needs promise columns (e.g. analytics).
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            query = "SELECT * FROM promises"
-            params = []
+            where, params = self._build_promise_filter({'category': category, 'status': status})
             
-            if category or status:
-                query += " WHERE "
-                conditions = []
-                
-                if category:
-                    conditions.append("category = ?")
-                    params.append(category)
-                
-                if status:
-                    conditions.append("status = ?")
-                    params.append(status.value)
-                
-                query += " AND ".join(conditions)
+            cursor.execute(f"SELECT * FROM promises{where} ORDER BY date_updated DESC", params)
+            promises = [self._row_to_promise(row) for row in cursor.fetchall()]
             
-            query += " ORDER BY date_updated DESC"
+            if include_sources and promises:
+                sources_by_promise = self._fetch_sources(
+                    cursor, f"ps.promise_id IN (SELECT id FROM promises{where})", params
+                )
+                for promise in promises:
+                    promise.sources = sources_by_promise.get(promise.id, [])
             
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
+            return promises
+    
+    def get_promise_rows(self, category: Optional[str] = None,
+                         status: Optional[PromiseStatus] = None) -> List[PromiseRow]:
+        """Like ``get_all_promises(include_sources=False)`` but returns lazy row views.
+        
+        Columns are decoded only when read, which keeps large read-only
+        scans (reports, exports) cheaper in both time and memory.
+        """
+        with self.get_connection() as conn:
+            where, params = self._build_promise_filter({'category': category, 'status': status})
+            cursor = conn.execute(f"SELECT * FROM promises{where} ORDER BY date_updated DESC", params)
+            return [PromiseRow(row) for row in cursor.fetchall()]
+    
+    def query_promises(self, filters: Optional[Dict[str, Any]] = None, order: str = "-date_updated",
+                       limit: int = 20, cursor: Optional[str] = None, offset: int = 0,
+                       include_sources: bool = True) -> PromisePage:
+        """Get one page of promises using keyset pagination.
+        
+        ``filters`` may contain ``category``, ``status``, ``priority`` and ``tag``.
+        ``order`` is ``date_updated`` or ``created_at``, prefixed with ``-``
+        for descending order; ties are broken by ID. Pass the previous page's
+        ``next_cursor`` to continue after it. ``offset`` is only meant for
+        jumping to an arbitrary page number when no cursor is available.
+        Raises ValueError for an unknown order or a malformed cursor.
+        """
+        descending = order.startswith("-")
+        column = order.lstrip("-")
+        if column not in self.ORDER_COLUMNS:
+            raise ValueError(f"Cannot order promises by {order!r}")
+        
+        where, params = self._build_promise_filter(filters)
+        if cursor:
+            comparison = "<" if descending else ">"
+            where += (" AND " if where else " WHERE ") + f"({column}, id) {comparison} (?, ?)"
+            params.extend(self._decode_cursor(cursor))
+        
+        direction = "DESC" if descending else "ASC"
+        
+        with self.get_connection() as conn:
+            db_cursor = conn.cursor()
+            # Fetch one extra row to learn whether another page follows
+            db_cursor.execute(f"""
+                SELECT * FROM promises{where}
+                ORDER BY {column} {direction}, id {direction}
+                LIMIT ? OFFSET ?
+            """, params + [limit + 1, offset])
+            rows = db_cursor.fetchall()
             
-            promises = []
-            for row in rows:
-                promise = Promise(
-                    id=row['id'],
-                    text=row['text'],
-                    category=row['category'],
-                    status=PromiseStatus(row['status']),
-                    priority=row['priority'],
-                    date_made=datetime.fromisoformat(row['date_made']) if row['date_made'] else None,
-                    date_updated=datetime.fromisoformat(row['date_updated']),
-                    tags=json.loads(row['tags']) if row['tags'] else [],
-                    notes=row['notes'] or "",
-                    progress_percentage=row['progress_percentage'],
-                    related_promises=json.loads(row['related_promises']) if row['related_promises'] else [],
-                    created_at=datetime.fromisoformat(row['created_at'])
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            # Lazy views: a list page reads a few columns of each promise
+            promises = [PromiseRow(row) for row in rows]
+            
+            if include_sources and promises:
+                sources_by_promise = self._load_sources(db_cursor, [promise.id for promise in promises])
+                for promise in promises:
+                    promise.sources = sources_by_promise.get(promise.id, [])
+        
+        next_cursor = self._encode_cursor(rows[-1][column], rows[-1]['id']) if has_more else None
+        return PromisePage(promises=promises, next_cursor=next_cursor)
+    
+    def recent_promises(self, limit: int = 10, include_sources: bool = True) -> List[PromiseRow]:
+        """Get the most recently updated promises.
+        
+        One indexed ``LIMIT`` query (plus one for sources), in place of
+        hydrating every promise and slicing.
+        """
+        return self.query_promises(limit=limit, include_sources=include_sources).promises
+    
+    def recent_promises_by_category(self, limit: int = 5,
+                                    include_sources: bool = False) -> Dict[str, List[PromiseRow]]:
+        """The ``limit`` most recently updated promises of every category, in one query.
+        
+        Categories come from ``promise_aggregates`` and each one's promises
+        from a ``LIMIT`` lookup on the (category, date_updated, id) index,
+        so the cost doesn't grow with the size of a category.
+        """
+        promises_by_category: Dict[str, List[PromiseRow]] = {}
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT p.* FROM (SELECT DISTINCT category FROM promise_aggregates WHERE promise_count > 0) c
+                INNER JOIN promises p ON p.id IN (
+                    SELECT id FROM promises WHERE category = c.category
+                    ORDER BY date_updated DESC, id DESC LIMIT ?
                 )
+                ORDER BY p.category, p.date_updated DESC, p.id DESC
+            """, (limit,))
+            promises = [PromiseRow(row) for row in cursor.fetchall()]
+            
+            if include_sources and promises:
+                sources_by_promise = self._load_sources(cursor, [promise.id for promise in promises])
+                for promise in promises:
+                    promise.sources = sources_by_promise.get(promise.id, [])
+        
+        for promise in promises:
+            promises_by_category.setdefault(promise.category, []).append(promise)
+        return promises_by_category
+    
+    def count_promises(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Count promises matching the same filters as ``query_promises``."""
+        where, params = self._build_promise_filter(filters)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT COUNT(*) FROM promises{where}", params)
+            return cursor.fetchone()[0]
+    
+    def iter_promise_dicts(self, filters: Optional[Dict[str, Any]] = None,
+                           fields: Optional[List[str]] = None,
+                           batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Stream matching promises as ``Promise.to_dict()``-shaped dicts.
+        
+        Rows are read from one cursor ``batch_size`` at a time and serialized
+        straight from their columns, and sources are loaded per batch, so
+        memory use doesn't grow with the number of promises. ``fields``
+        limits the keys produced (any of ``PROMISE_FIELDS``); unknown names
+        raise ValueError before anything is read. Ordered like
+        ``get_all_promises``.
+        """
+        fields = list(dict.fromkeys(fields or self.PROMISE_FIELDS))
+        unknown = [field for field in fields if field not in self.PROMISE_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown promise fields: {', '.join(unknown)}")
+        
+        where, params = self._build_promise_filter(filters)
+        return self._stream_promise_dicts(where, params, fields, batch_size)
+    
+    def _stream_promise_dicts(self, where: str, params: List[Any], fields: List[str],
+                              batch_size: int) -> Iterator[Dict[str, Any]]:
+        """Generator behind ``iter_promise_dicts``."""
+        # Field names are validated against PROMISE_FIELDS, so they are safe to interpolate
+        columns = ", ".join(dict.fromkeys(['id'] + [field for field in fields if field != 'sources']))
+        
+        with self.get_connection() as conn:
+            cursor = conn.execute(f"SELECT {columns} FROM promises{where} ORDER BY date_updated DESC", params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
                 
-                # Load sources for each promise
-                cursor.execute("""
-                    SELECT s.* FROM sources s
-                    INNER JOIN promise_sources ps ON s.id = ps.source_id
-                    WHERE ps.promise_id = ?
-                """, (promise.id,))
-                source_rows = cursor.fetchall()
-                
-                for source_row in source_rows:
-                    promise.sources.append(Source(
-                        id=source_row['id'],
-                        url=source_row['url'],
-                        title=source_row['title'],
-                        source_type=SourceType(source_row['source_type']),
-                        date=datetime.fromisoformat(source_row['date']) if source_row['date'] else None,
-                        description=source_row['description'],
-                        reliability_score=source_row['reliability_score'],
-                        created_at=datetime.fromisoformat(source_row['created_at'])
-                    ))
+                sources_by_promise = {}
+                if 'sources' in fields:
+                    sources_by_promise = self._load_sources(conn.cursor(), [row['id'] for row in rows])
                 
-                promises.append(promise)
+                for row in rows:
+                    yield {
+                        field: self._promise_field(row, field, sources_by_promise)
+                        for field in fields
+                    }
+    
+    @staticmethod
+    def _promise_field(row: sqlite3.Row, field: str, sources_by_promise: Dict[int, List[Source]]) -> Any:
+        """One ``Promise.to_dict()`` value, read from a ``promises`` row."""
+        if field == 'sources':
+            return [source.to_dict() for source in sources_by_promise.get(row['id'], [])]
+        if field in ('tags', 'related_promises'):
+            return json.loads(row[field]) if row[field] else []
+        if field in ('date_made', 'date_updated', 'created_at'):
+            return format_timestamp(row[field])
+        if field == 'notes':
+            return row[field] or ""
+        return row[field]
+    
+    def _build_promise_filter(self, filters: Optional[Dict[str, Any]]):
+        """Build a ``WHERE`` clause and parameter list for promise filters."""
+        conditions = []
+        params: List[Any] = []
+        filters = filters or {}
+        
+        if filters.get('category'):
+            conditions.append("category = ?")
+            params.append(filters['category'])
+        
+        status = filters.get('status')
+        if status:
+            conditions.append("status = ?")
+            params.append(status.value if isinstance(status, PromiseStatus) else status)
+        
+        if filters.get('priority') is not None:
+            conditions.append("priority = ?")
+            params.append(filters['priority'])
+        
+        if filters.get('tag'):
+            conditions.append("id IN (SELECT promise_id FROM promise_tags WHERE tag = ?)")
+            params.append(filters['tag'])
+        
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        return where, params
+    
+    @staticmethod
+    def _encode_cursor(order_value: Any, promise_id: int) -> str:
+        """Encode a keyset position as an opaque URL-safe token."""
+        payload = json.dumps([order_value, promise_id]).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+    
+    @staticmethod
+    def _decode_cursor(token: str) -> List[Any]:
+        """Decode a token produced by ``_encode_cursor``."""
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            order_value, promise_id = json.loads(base64.urlsafe_b64decode(padded))
+            return [order_value, int(promise_id)]
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid cursor: {token!r}") from e
+    
+    def search_promises(self, query: str, limit: int = 50, offset: int = 0) -> List[SearchResult]:
+        """Full-text search over promise text, category, tags and notes.
+        
+        Every word in ``query`` must match, either exactly or as a prefix.
+        Results are ranked by BM25 (text matches weigh most) and carry a
+        snippet of the promise text with matches wrapped in
+        ``HIGHLIGHT_START``/``HIGHLIGHT_END``.
+        """
+        terms = re.findall(r'\w+', query)
+        if not terms:
+            return []
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
             
-            return promises
+            if self.fts_enabled:
+                match = " ".join(f'"{term}"*' for term in terms)
+                cursor.execute("""
+                    SELECT p.*,
+                           snippet(promises_fts, 0, ?, ?, '…', 16) AS snippet,
+                           bm25(promises_fts, 10.0, 5.0, 5.0, 1.0) AS score
+                    FROM promises_fts
+                    INNER JOIN promises p ON p.id = promises_fts.rowid
+                    WHERE promises_fts MATCH ?
+                    ORDER BY score
+                    LIMIT ? OFFSET ?
+                """, (HIGHLIGHT_START, HIGHLIGHT_END, match, limit, offset))
+            else:
+                conditions = " AND ".join(["(text LIKE ? OR category LIKE ? OR tags LIKE ?)"] * len(terms))
+                params = [f"%{term}%" for term in terms for _ in range(3)]
+                cursor.execute(f"""
+                    SELECT p.*, substr(p.text, 1, 120) AS snippet, 0.0 AS score
+                    FROM promises p
+                    WHERE {conditions}
+                    ORDER BY date_updated DESC
+                    LIMIT ? OFFSET ?
+                """, params + [limit, offset])
+            
+            return [
+                SearchResult(promise=self._row_to_promise(row), snippet=row['snippet'], score=-row['score'])
+                for row in cursor.fetchall()
+            ]
+    
+    def get_promises_by_ids(self, promise_ids: List[int], include_sources: bool = True) -> List[Promise]:
+        """Get several promises at once, in the order of ``promise_ids``.
+        
+        IDs that don't exist are skipped.
+        """
+        promises_by_id: Dict[int, Promise] = {}
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            ids = list(dict.fromkeys(promise_ids))
+            for start in range(0, len(ids), self.SOURCE_BATCH_SIZE):
+                chunk = ids[start:start + self.SOURCE_BATCH_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                cursor.execute(f"SELECT * FROM promises WHERE id IN ({placeholders})", chunk)
+                for row in cursor.fetchall():
+                    promises_by_id[row['id']] = self._row_to_promise(row)
+            
+            if include_sources and promises_by_id:
+                sources_by_promise = self._load_sources(cursor, list(promises_by_id))
+                for promise_id, promise in promises_by_id.items():
+                    promise.sources = sources_by_promise.get(promise_id, [])
+        
+        return [promises_by_id[promise_id] for promise_id in promise_ids if promise_id in promises_by_id]
+    
+    def find_similar(self, text: str, threshold: float = 0.3, exclude_id: Optional[int] = None,
+                     limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Find (promise_id, score) pairs whose text is similar to ``text``.
+        
+        Uses the persistent token index; scores are the same word-set Jaccard
+        similarity ``PromiseAnalyzer`` has always used.
+        """
+        with self.get_connection() as conn:
+            return self.similarity.query(conn.cursor(), text, threshold, exclude_id=exclude_id, limit=limit)
+    
+    def rebuild_similarity_index(self) -> int:
+        """Rebuild the similarity index from the promises table."""
+        with self.get_connection() as conn:
+            count = self.similarity.rebuild(conn.cursor())
+            conn.commit()
+            return count
+    
+    def get_sources_by_promise(self, promise_ids: Optional[List[int]] = None) -> Dict[int, List[Source]]:
+        """Get sources grouped by promise ID.
+        
+        Loads every promise/source link when ``promise_ids`` is None.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if promise_ids is None:
+                return self._fetch_sources(cursor, "1", ())
+            return self._load_sources(cursor, promise_ids)
+    
+    def _load_sources(self, cursor: sqlite3.Cursor, promise_ids: List[int]) -> Dict[int, List[Source]]:
+        """Load sources for the given promise IDs in chunked ``IN`` queries."""
+        sources_by_promise: Dict[int, List[Source]] = {}
+        source_cache: Dict[int, Source] = {}
+        ids = list(dict.fromkeys(promise_ids))
+        
+        for start in range(0, len(ids), self.SOURCE_BATCH_SIZE):
+            chunk = ids[start:start + self.SOURCE_BATCH_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            self._fetch_sources(cursor, f"ps.promise_id IN ({placeholders})", chunk,
+                                sources_by_promise, source_cache)
+        
+        return sources_by_promise
+    
+    def _fetch_sources(self, cursor: sqlite3.Cursor, condition: str, params,
+                       sources_by_promise: Optional[Dict[int, List[Source]]] = None,
+                       source_cache: Optional[Dict[int, Source]] = None) -> Dict[int, List[Source]]:
+        """Run one promise/source join and stitch the rows by promise ID.
+        
+        A source linked to several promises is built once and shared.
+        """
+        if sources_by_promise is None:
+            sources_by_promise = {}
+        if source_cache is None:
+            source_cache = {}
+        
+        cursor.execute(f"""
+            SELECT ps.promise_id, s.* FROM promise_sources ps
+            INNER JOIN sources s ON s.id = ps.source_id
+            WHERE {condition}
+            ORDER BY ps.promise_id, s.id
+        """, params)
+        
+        for row in cursor.fetchall():
+            source = source_cache.get(row['id'])
+            if source is None:
+                source = source_cache[row['id']] = self._row_to_source(row)
+            sources_by_promise.setdefault(row['promise_id'], []).append(source)
+        
+        return sources_by_promise
+    
+    def _row_to_source(self, row: sqlite3.Row) -> Source:
+        """Build a Source from a ``sources`` row."""
+        return Source(
+            id=row['id'],
+            url=row['url'],
+            title=row['title'],
+            source_type=SourceType(row['source_type']),
+            date=datetime.fromisoformat(row['date']) if row['date'] else None,
+            description=row['description'],
+            reliability_score=row['reliability_score'],
+            created_at=datetime.fromisoformat(row['created_at'])
+        )
+    
+    def _row_to_promise(self, row: sqlite3.Row) -> Promise:
+        """Build a Promise (without sources) from a ``promises`` row."""
+        return Promise(
+            id=row['id'],
+            text=row['text'],
+            category=row['category'],
+            status=PromiseStatus(row['status']),
+            priority=row['priority'],
+            date_made=parse_timestamp(row['date_made']),
+            date_updated=parse_timestamp(row['date_updated']),
+            tags=json.loads(row['tags']) if row['tags'] else [],
+            notes=row['notes'] or "",
+            progress_percentage=row['progress_percentage'],
+            related_promises=json.loads(row['related_promises']) if row['related_promises'] else [],
+            created_at=parse_timestamp(row['created_at']),
+            version=row['version']
+        )
     
     def add_progress_update(self, update: ProgressUpdate) -> int:
         """Add a progress update for a promise."""
@@ -363,14 +1204,205 @@ class DatabaseManager:
             """, (
                 update.promise_id,
                 update.update_text,
-                update.date.isoformat(),
+                self._ts(update.date),
                 update.source_url,
                 update.impact_score,
-                update.created_at.isoformat()
+                self._ts(update.created_at)
             ))
             conn.commit()
             return cursor.lastrowid
     
+    def update_status(self, promise_id: int, status: PromiseStatus, note: str = "",
+                      expected_version: Optional[int] = None) -> bool:
+        """Set a promise's status, recording the change in ``promise_events``.
+        
+        ``note`` goes to the event instead of being appended to the promise's
+        notes. Returns False if the promise doesn't exist; see
+        ``patch_promise`` for ``expected_version``.
+        """
+        return self.patch_promise(promise_id, {'status': status}, expected_version, note) is not None
+    
+    def update_progress(self, promise_id: int, progress: float, note: str = "",
+                        expected_version: Optional[int] = None) -> bool:
+        """Set a promise's progress percentage, recording the change in ``promise_events``."""
+        return self.patch_promise(promise_id, {'progress_percentage': progress}, expected_version, note) is not None
+    
+    def patch_promise(self, promise_id: int, changes: Dict[str, Any], expected_version: Optional[int] = None,
+                      note: str = "") -> Optional[int]:
+        """Write only the given ``PATCH_FIELDS`` of a promise and return its new version.
+        
+        One ``UPDATE`` sets the changed columns, ``date_updated`` and
+        ``version = version + 1``, conditional on the version just read. With
+        ``expected_version`` a promise written by someone else in the
+        meantime raises StaleVersionError; without it the write is simply
+        retried on the fresh row. Status and progress changes are recorded in
+        ``promise_events`` with ``note``. Returns None if the promise doesn't
+        exist; raises ValueError for unknown fields or invalid values.
+        """
+        unknown = [field for field in changes if field not in self.PATCH_FIELDS]
+        if unknown:
+            raise ValueError(f"Cannot patch promise fields: {', '.join(unknown)}")
+        values = {field: self._column_value(field, value) for field, value in changes.items()}
+        now = datetime.now()
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            while True:
+                cursor.execute(f"SELECT {', '.join(['version'] + list(values))} FROM promises WHERE id = ?",
+                               (promise_id,))
+                row = cursor.fetchone()
+                if row is None:
+                    return None
+                if expected_version is not None and row['version'] != expected_version:
+                    raise StaleVersionError(promise_id, expected_version, row['version'])
+                
+                assignments = "".join(f"{field} = ?, " for field in values)
+                cursor.execute(f"""
+                    UPDATE promises SET {assignments}date_updated = ?, version = version + 1
+                    WHERE id = ? AND version = ?
+                """, list(values.values()) + [self._ts(now), promise_id, row['version']])
+                if cursor.rowcount:
+                    break
+                conn.rollback()  # Another writer got in between; re-read
+            
+            for kind, field in (('status', 'status'), ('progress', 'progress_percentage')):
+                if field in values and (row[field] != values[field] or note):
+                    self._add_event(cursor, promise_id, kind, row[field], values[field], note, now)
+            if 'text' in values and row['text'] != values['text']:
+                self.similarity.index_promise(cursor, promise_id, values['text'])
+                self._link_similar(cursor, [(promise_id, values['text'])])
+            
+            conn.commit()
+            return row['version'] + 1
+    
+    def _column_value(self, field: str, value: Any) -> Any:
+        """Convert a model-typed value to what the promises table stores for ``field``."""
+        if field == 'status':
+            return PromiseStatus(value).value
+        if field in ('tags', 'related_promises'):
+            if not isinstance(value, (list, tuple)):
+                raise ValueError(f"{field} must be a list")
+            return json.dumps(list(value))
+        if field == 'date_made':
+            if isinstance(value, str):
+                value = datetime.fromisoformat(value)
+            return self._ts(value)
+        if field == 'priority':
+            return int(value)
+        if field == 'progress_percentage':
+            return float(value)
+        return str(value)
+    
+    def _add_event(self, cursor: sqlite3.Cursor, promise_id: int, kind: str, old_value: Any, new_value: Any,
+                   note: str = "", changed_at: Optional[datetime] = None) -> None:
+        """Append one row to ``promise_events``."""
+        cursor.execute("""
+            INSERT INTO promise_events (promise_id, kind, old_value, new_value, note, changed_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (promise_id, kind, old_value, new_value, note or None, self._ts(changed_at or datetime.now())))
+    
+    def get_promise_events(self, promise_id: int, kind: Optional[str] = None) -> List[PromiseEvent]:
+        """Get a promise's recorded changes, newest first, optionally of one ``kind``."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM promise_events
+                WHERE promise_id = ? AND (? IS NULL OR kind = ?)
+                ORDER BY changed_at DESC, id DESC
+            """, (promise_id, kind, kind))
+            return [
+                PromiseEvent(
+                    id=row['id'],
+                    promise_id=row['promise_id'],
+                    kind=row['kind'],
+                    old_value=row['old_value'],
+                    new_value=row['new_value'],
+                    note=row['note'] or "",
+                    changed_at=parse_timestamp(row['changed_at'])
+                )
+                for row in cursor.fetchall()
+            ]
+    
+    def get_event_summary(self, since: datetime) -> Dict[str, int]:
+        """Status changes and promises newly fulfilled since ``since``, from ``promise_events``.
+        
+        A range scan of the ``changed_at`` index; promises themselves are
+        not read.
+        """
+        fulfilled = ", ".join("?" * len(self.FULFILLED_STATUSES))
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT
+                    COUNT(*) AS status_changes,
+                    COUNT(DISTINCT CASE WHEN new_value IN ({fulfilled}) THEN promise_id END) AS fulfilled_count
+                FROM promise_events
+                WHERE kind = 'status' AND changed_at >= ?
+            """, list(self.FULFILLED_STATUSES) + [self._ts(since)])
+            row = cursor.fetchone()
+            return {'status_changes': row['status_changes'], 'fulfilled_count': row['fulfilled_count']}
+    
+    def _init_events(self, cursor: sqlite3.Cursor) -> None:
+        """Index ``promise_events`` and backfill it from existing promises.
+        
+        New promises that start in a status other than "Not Started" get an
+        initial status event from a trigger, so every insert path (imports,
+        raw seeding) is covered; later changes are appended by
+        ``update_status``/``update_progress`` and ``update_promise``.
+        """
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_promise_events_promise ON promise_events (promise_id, changed_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_promise_events_changed ON promise_events (kind, changed_at)")
+        
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS promise_events_insert AFTER INSERT ON promises
+            WHEN new.status != '{PromiseStatus.NOT_STARTED.value}'
+            BEGIN
+                INSERT INTO promise_events (promise_id, kind, new_value, changed_at)
+                VALUES (new.id, 'status', new.status, new.date_updated);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS promise_events_delete AFTER DELETE ON promises BEGIN
+                DELETE FROM promise_events WHERE promise_id = old.id;
+            END
+        """)
+        
+        if not self._get_meta(cursor, 'events_built'):
+            self._backfill_events(cursor)
+            self._set_meta(cursor, 'events_built', datetime.now().isoformat())
+    
+    def _backfill_events(self, cursor: sqlite3.Cursor) -> None:
+        """Rebuild history from the change lines in promise notes.
+        
+        Notes only carry dates, and status lines don't say the old status.
+        A promise whose current status isn't explained by its parsed lines
+        gets one more status event at ``date_updated``.
+        """
+        cursor.execute("DELETE FROM promise_events")
+        rows = cursor.execute("SELECT id, status, notes, date_updated FROM promises").fetchall()
+        
+        events = []
+        for row in rows:
+            status = None
+            for line in (row['notes'] or "").splitlines():
+                match = NOTE_STATUS_PATTERN.match(line.strip())
+                if match:
+                    events.append((row['id'], 'status', status, match.group(2), match.group(3) or None,
+                                   self._ts(datetime.fromisoformat(match.group(1)))))
+                    status = match.group(2)
+                    continue
+                match = NOTE_PROGRESS_PATTERN.match(line.strip())
+                if match:
+                    events.append((row['id'], 'progress', float(match.group(2)), float(match.group(3)),
+                                   match.group(4) or None, self._ts(datetime.fromisoformat(match.group(1)))))
+            if row['status'] != (status or PromiseStatus.NOT_STARTED.value):
+                events.append((row['id'], 'status', status, row['status'], None, row['date_updated']))
+        
+        cursor.executemany("""
+            INSERT INTO promise_events (promise_id, kind, old_value, new_value, note, changed_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, events)
+    
     def get_progress_updates(self, promise_id: int) -> List[ProgressUpdate]:
         """Get all progress updates for a promise."""
         with self.get_connection() as conn:
@@ -388,45 +1420,660 @@ class DatabaseManager:
                     id=row['id'],
                     promise_id=row['promise_id'],
                     update_text=row['update_text'],
-                    date=datetime.fromisoformat(row['date']),
+                    date=parse_timestamp(row['date']),
                     source_url=row['source_url'],
                     impact_score=row['impact_score'],
-                    created_at=datetime.fromisoformat(row['created_at'])
+                    created_at=parse_timestamp(row['created_at'])
                 ))
             
             return updates
     
     def get_analytics_data(self) -> Dict[str, Any]:
-        """Get analytics data for all promises."""
+        """Get analytics data for all promises.
+        
+        Read from the ``promise_aggregates`` summary table, so the cost does
+        not depend on the number of promises.
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute("SELECT status, category, promise_count, progress_sum FROM promise_aggregates")
+            rows = cursor.fetchall()
+        
+        total_promises = 0
+        total_progress = 0.0
+        promises_by_status: Dict[str, int] = {}
+        category_counts: Dict[str, int] = {}
+        category_fulfilled: Dict[str, int] = {}
+        
+        for row in rows:
+            count = row['promise_count']
+            total_promises += count
+            total_progress += row['progress_sum']
+            promises_by_status[row['status']] = promises_by_status.get(row['status'], 0) + count
+            category_counts[row['category']] = category_counts.get(row['category'], 0) + count
+            if row['status'] in self.FULFILLED_STATUSES:
+                category_fulfilled[row['category']] = category_fulfilled.get(row['category'], 0) + count
+        
+        promises_by_status = dict(sorted(promises_by_status.items()))
+        promises_by_category = dict(sorted(category_counts.items(), key=lambda item: (-item[1], item[0])))
+        
+        # Fulfillment rate
+        fulfilled_count = sum(promises_by_status.get(status, 0) for status in self.FULFILLED_STATUSES)
+        fulfillment_rate = (fulfilled_count / total_promises * 100) if total_promises > 0 else 0.0
+        
+        return {
+            'total_promises': total_promises,
+            'promises_by_status': promises_by_status,
+            'promises_by_category': promises_by_category,
+            'fulfillment_by_category': {
+                category: category_fulfilled.get(category, 0) / count * 100
+                for category, count in promises_by_category.items()
+            },
+            'fulfillment_rate': fulfillment_rate,
+            'average_progress': total_progress / total_promises if total_promises > 0 else 0.0,
+            'most_active_categories': list(promises_by_category.keys())[:5],
+            'generated_at': datetime.now().isoformat()
+        }
+    
+    def get_promise_metrics(self, text_hashes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get stored complexity metrics by promise text hash; unknown hashes are left out."""
+        metrics: Dict[str, Dict[str, Any]] = {}
+        hashes = list(dict.fromkeys(text_hashes))
+        columns = ", ".join(self.METRIC_COLUMNS)
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(hashes), self.SOURCE_BATCH_SIZE):
+                chunk = hashes[start:start + self.SOURCE_BATCH_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                cursor.execute(f"SELECT text_hash, {columns} FROM promise_metrics WHERE text_hash IN ({placeholders})", chunk)
+                for row in cursor.fetchall():
+                    metrics[row['text_hash']] = {column: row[column] for column in self.METRIC_COLUMNS}
+        
+        return metrics
+    
+    def save_promise_metrics(self, metrics: Dict[str, Dict[str, Any]]) -> None:
+        """Store complexity metrics keyed by promise text hash."""
+        if not metrics:
+            return
+        
+        computed_at = datetime.now().isoformat()
+        placeholders = ", ".join("?" * (len(self.METRIC_COLUMNS) + 2))
+        with self.get_connection() as conn:
+            conn.executemany(f"""
+                INSERT OR REPLACE INTO promise_metrics (text_hash, {", ".join(self.METRIC_COLUMNS)}, computed_at)
+                VALUES ({placeholders})
+            """, (
+                [text_hash] + [values[column] for column in self.METRIC_COLUMNS] + [computed_at]
+                for text_hash, values in metrics.items()
+            ))
+            conn.commit()
+    
+    def prune_promise_metrics(self, live_hashes: Iterable[str]) -> int:
+        """Delete metrics whose hash is not in ``live_hashes``. Returns the number deleted.
+        
+        The live set is staged in a temporary table, so it is never held in
+        memory as a whole.
+        """
+        with self.get_connection() as conn:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS live_metric_hashes (text_hash TEXT PRIMARY KEY)")
+            conn.execute("DELETE FROM live_metric_hashes")
+            conn.executemany("INSERT OR IGNORE INTO live_metric_hashes (text_hash) VALUES (?)",
+                             ((text_hash,) for text_hash in live_hashes))
+            deleted = conn.execute("""
+                DELETE FROM promise_metrics WHERE text_hash NOT IN (SELECT text_hash FROM live_metric_hashes)
+            """).rowcount
+            conn.execute("DELETE FROM live_metric_hashes")
+            conn.commit()
+            return deleted
+    
+    def get_promise_texts(self, after_id: int = 0, limit: int = 1000) -> List[Tuple[int, str]]:
+        """Get (id, text) pairs in ID order, for batch jobs walking the table by keyset."""
+        with self.get_connection() as conn:
+            rows = conn.execute(
+                "SELECT id, text FROM promises WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)
+            ).fetchall()
+            return [(row['id'], row['text']) for row in rows]
+    
+    def get_activity_summary(self, since: datetime) -> Dict[str, Any]:
+        """Priority/progress distributions and activity since ``since`` in one scan.
+        
+        Every bucket is a ``SUM(CASE ...)`` over the same pass of the promises
+        table, and per-category activity is one ``GROUP BY`` over the
+        ``date_updated`` index, so nothing is loaded into Python.
+        """
+        cutoff = self._ts(since)
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT
+                    COUNT(*) AS total,
+                    SUM(CASE WHEN priority = 1 THEN 1 ELSE 0 END) AS priority_1,
+                    SUM(CASE WHEN priority = 2 THEN 1 ELSE 0 END) AS priority_2,
+                    SUM(CASE WHEN priority = 3 THEN 1 ELSE 0 END) AS priority_3,
+                    SUM(CASE WHEN priority = 4 THEN 1 ELSE 0 END) AS priority_4,
+                    SUM(CASE WHEN priority = 5 THEN 1 ELSE 0 END) AS priority_5,
+                    SUM(CASE WHEN progress_percentage = 0 THEN 1 ELSE 0 END) AS progress_0,
+                    SUM(CASE WHEN progress_percentage > 0 AND progress_percentage <= 25 THEN 1 ELSE 0 END) AS progress_1_25,
+                    SUM(CASE WHEN progress_percentage > 25 AND progress_percentage <= 50 THEN 1 ELSE 0 END) AS progress_26_50,
+                    SUM(CASE WHEN progress_percentage > 50 AND progress_percentage <= 75 THEN 1 ELSE 0 END) AS progress_51_75,
+                    SUM(CASE WHEN progress_percentage > 75 AND progress_percentage < 100 THEN 1 ELSE 0 END) AS progress_76_99,
+                    SUM(CASE WHEN progress_percentage = 100 THEN 1 ELSE 0 END) AS progress_100,
+                    SUM(CASE WHEN date_updated >= ? THEN 1 ELSE 0 END) AS updated_count,
+                    SUM(CASE WHEN date_updated >= ? AND created_at >= ? THEN 1 ELSE 0 END) AS created_count,
+                    SUM(CASE WHEN date_updated >= ? THEN progress_percentage ELSE 0 END) AS updated_progress_sum,
+                    SUM(CASE WHEN date_updated < ? THEN progress_percentage ELSE 0 END) AS older_progress_sum
+                FROM promises
+            """, [cutoff] * 5)
+            summary = {key: row_value or 0 for key, row_value in dict(cursor.fetchone()).items()}
             
-            # Total promises
-            cursor.execute("SELECT COUNT(*) as total FROM promises")
-            total_promises = cursor.fetchone()['total']
+            cursor.execute("""
+                SELECT category, COUNT(*) AS promise_count FROM promises
+                WHERE date_updated >= ?
+                GROUP BY category
+            """, (cutoff,))
+            summary['category_activity'] = {row['category']: row['promise_count'] for row in cursor.fetchall()}
+        
+        return summary
+    
+    def _month_sql(self, column: str) -> str:
+        """SQL for the ``YYYY-MM`` month of a timestamp column."""
+        if self.timestamp_format == 'epoch_us':
+            return f"strftime('%Y-%m', {column} / 1000000, 'unixepoch')"
+        return f"substr({column}, 1, 7)"
+    
+    def get_monthly_counts(self) -> Dict[str, Dict[str, int]]:
+        """Promises created, and fulfilled promises last updated, per ``YYYY-MM`` month."""
+        fulfilled = ", ".join("?" * len(self.FULFILLED_STATUSES))
+        series: Dict[str, Dict[str, int]] = {}
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT {self._month_sql('created_at')} AS month, COUNT(*) AS promise_count
+                FROM promises GROUP BY month
+            """)
+            for row in cursor.fetchall():
+                series.setdefault(row['month'], {'created': 0, 'fulfilled': 0})['created'] = row['promise_count']
             
-            # Promises by status
-            cursor.execute("SELECT status, COUNT(*) as count FROM promises GROUP BY status")
-            promises_by_status = {row['status']: row['count'] for row in cursor.fetchall()}
+            cursor.execute(f"""
+                SELECT {self._month_sql('date_updated')} AS month, COUNT(*) AS promise_count
+                FROM promises WHERE status IN ({fulfilled}) GROUP BY month
+            """, self.FULFILLED_STATUSES)
+            for row in cursor.fetchall():
+                series.setdefault(row['month'], {'created': 0, 'fulfilled': 0})['fulfilled'] = row['promise_count']
+        
+        return dict(sorted(series.items()))
+    
+    def rebuild_aggregates(self) -> None:
+        """Recompute ``promise_aggregates`` from the promises table (drift repair)."""
+        with self.get_connection() as conn:
+            self._rebuild_aggregates(conn.cursor())
+            self._bump_data_version(conn.cursor())
+            conn.commit()
+    
+    def check_aggregates(self) -> List[Dict[str, Any]]:
+        """Compare ``promise_aggregates`` against a fresh scan of the promises table.
+        
+        Returns one entry per (status, category) pair that disagrees; an empty
+        list means the summary is consistent.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT status, category, promise_count, progress_sum FROM promise_aggregates")
+            stored = {(row['status'], row['category']): (row['promise_count'], row['progress_sum'])
+                      for row in cursor.fetchall()}
+            cursor.execute("""
+                SELECT status, category, COUNT(*) AS promise_count, SUM(progress_percentage) AS progress_sum
+                FROM promises GROUP BY status, category
+            """)
+            actual = {(row['status'], row['category']): (row['promise_count'], row['progress_sum'] or 0.0)
+                      for row in cursor.fetchall()}
+        
+        mismatches = []
+        for key in sorted(set(stored) | set(actual)):
+            stored_count, stored_sum = stored.get(key, (0, 0.0))
+            actual_count, actual_sum = actual.get(key, (0, 0.0))
+            if stored_count != actual_count or abs(stored_sum - actual_sum) > 1e-6:
+                mismatches.append({
+                    'status': key[0],
+                    'category': key[1],
+                    'stored_count': stored_count,
+                    'actual_count': actual_count,
+                    'stored_progress_sum': stored_sum,
+                    'actual_progress_sum': actual_sum
+                })
+        return mismatches
+    
+    def _init_aggregates(self, cursor: sqlite3.Cursor) -> None:
+        """Create the analytics summary table and the triggers that maintain it.
+        
+        Counts and progress totals are kept per (status, category) pair, so
+        every dashboard aggregate is a sum over at most a hundred rows.
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS promise_aggregates (
+                status TEXT NOT NULL,
+                category TEXT NOT NULL,
+                promise_count INTEGER NOT NULL DEFAULT 0,
+                progress_sum REAL NOT NULL DEFAULT 0.0,
+                PRIMARY KEY (status, category)
+            )
+        """)
+        
+        add_new = """
+            INSERT INTO promise_aggregates (status, category, promise_count, progress_sum)
+            VALUES (new.status, new.category, 1, COALESCE(new.progress_percentage, 0))
+            ON CONFLICT (status, category) DO UPDATE SET
+                promise_count = promise_count + 1,
+                progress_sum = progress_sum + COALESCE(new.progress_percentage, 0);
+        """
+        remove_old = """
+            UPDATE promise_aggregates SET
+                promise_count = promise_count - 1,
+                progress_sum = progress_sum - COALESCE(old.progress_percentage, 0)
+            WHERE status = old.status AND category = old.category;
+            DELETE FROM promise_aggregates
+            WHERE status = old.status AND category = old.category AND promise_count <= 0;
+        """
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS promise_aggregates_insert AFTER INSERT ON promises BEGIN {add_new} END")
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS promise_aggregates_delete AFTER DELETE ON promises BEGIN {remove_old} END")
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS promise_aggregates_update
+            AFTER UPDATE OF status, category, progress_percentage ON promises
+            BEGIN {remove_old} {add_new} END
+        """)
+        
+        if not self._get_meta(cursor, 'aggregates_built'):
+            self._rebuild_aggregates(cursor)
+            self._set_meta(cursor, 'aggregates_built', datetime.now().isoformat())
+    
+    def _rebuild_aggregates(self, cursor: sqlite3.Cursor) -> None:
+        """Replace the contents of ``promise_aggregates`` with a fresh scan."""
+        cursor.execute("DELETE FROM promise_aggregates")
+        cursor.execute("""
+            INSERT INTO promise_aggregates (status, category, promise_count, progress_sum)
+            SELECT status, category, COUNT(*), COALESCE(SUM(progress_percentage), 0)
+            FROM promises GROUP BY status, category
+        """)
+    
+    def _init_tag_index(self, cursor: sqlite3.Cursor) -> None:
+        """Create ``promise_tags`` and the triggers that keep it in sync with ``promises.tags``.
+        
+        The JSON column stays the source of truth; the triggers expand it with
+        ``json_each`` on every insert, tag update and delete, so add_promise,
+        update_promise and bulk imports all maintain the table.
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS promise_tags (
+                promise_id INTEGER NOT NULL,
+                tag TEXT NOT NULL,
+                PRIMARY KEY (promise_id, tag),
+                FOREIGN KEY (promise_id) REFERENCES promises (id) ON DELETE CASCADE
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_promise_tags_tag ON promise_tags (tag, promise_id)")
+        
+        add_new = """
+            INSERT OR IGNORE INTO promise_tags (promise_id, tag)
+            SELECT new.id, value FROM json_each(CASE WHEN json_valid(new.tags) THEN new.tags END)
+            WHERE type = 'text' AND value != '';
+        """
+        remove_old = "DELETE FROM promise_tags WHERE promise_id = old.id;"
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS promise_tags_insert AFTER INSERT ON promises BEGIN {add_new} END")
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS promise_tags_delete AFTER DELETE ON promises BEGIN {remove_old} END")
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS promise_tags_update AFTER UPDATE OF tags ON promises
+            WHEN old.tags IS NOT new.tags
+            BEGIN {remove_old} {add_new} END
+        """)
+        
+        # Backfill promises that predate the table
+        if not self._get_meta(cursor, 'tags_built'):
+            cursor.execute("DELETE FROM promise_tags")
+            cursor.execute("""
+                INSERT OR IGNORE INTO promise_tags (promise_id, tag)
+                SELECT p.id, t.value FROM promises p, json_each(CASE WHEN json_valid(p.tags) THEN p.tags END) t
+                WHERE t.type = 'text' AND t.value != ''
+            """)
+            self._set_meta(cursor, 'tags_built', datetime.now().isoformat())
+    
+    def _init_relations(self, cursor: sqlite3.Cursor) -> None:
+        """Create the ``promise_relations`` edge table and its triggers.
+        
+        ``manual`` edges mirror the JSON ``related_promises`` column and are
+        kept in sync by triggers. ``similar`` edges are written by
+        ``_link_similar`` whenever a promise's text is written, stored as
+        (owner, one of its most similar promises) so a promise's own list
+        can be replaced without touching the lists of others. Edges are
+        undirected for lookups, hence the index on each endpoint.
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS promise_relations (
+                promise_id INTEGER NOT NULL,
+                related_id INTEGER NOT NULL,
+                kind TEXT NOT NULL,  -- 'manual' or 'similar'
+                score REAL,  -- Jaccard similarity; NULL for manual links
+                PRIMARY KEY (promise_id, related_id, kind),
+                FOREIGN KEY (promise_id) REFERENCES promises (id) ON DELETE CASCADE,
+                FOREIGN KEY (related_id) REFERENCES promises (id) ON DELETE CASCADE
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_promise_relations_related ON promise_relations (related_id, promise_id)")
+        
+        add_manual = """
+            INSERT OR IGNORE INTO promise_relations (promise_id, related_id, kind)
+            SELECT new.id, value, 'manual'
+            FROM json_each(CASE WHEN json_valid(new.related_promises) THEN new.related_promises END)
+            WHERE type = 'integer' AND value != new.id;
+        """
+        remove_manual = "DELETE FROM promise_relations WHERE promise_id = old.id AND kind = 'manual';"
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS promise_relations_insert AFTER INSERT ON promises BEGIN {add_manual} END")
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS promise_relations_delete AFTER DELETE ON promises BEGIN
+                DELETE FROM promise_relations WHERE promise_id = old.id OR related_id = old.id;
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS promise_relations_update AFTER UPDATE OF related_promises ON promises
+            WHEN old.related_promises IS NOT new.related_promises
+            BEGIN {remove_manual} {add_manual} END
+        """)
+        
+        # Keyed separately from 'relations_built': similar edges used to be stored once per pair.
+        # Only the cheap manual edges are backfilled at startup; similarity edges are
+        # left to rebuild_relations, which scores every promise.
+        if not self._get_meta(cursor, 'relations_by_owner_built'):
+            self._rebuild_manual_relations(cursor)
+            self._set_meta(cursor, 'relations_by_owner_built', datetime.now().isoformat())
+    
+    def _link_similar(self, cursor: sqlite3.Cursor, promises: List[Tuple[int, str]]) -> None:
+        """Replace the ``similar`` edges of freshly written (promise_id, text) pairs.
+        
+        Each promise is linked to its ``RELATED_LIMIT`` most similar promises
+        scoring at least ``RELATED_THRESHOLD``, using the similarity index
+        (which must already include the new text) with at most
+        ``RELATED_CANDIDATES`` candidates per lookup. Promises whose own list
+        points at one of them were scored against the old text, so their
+        lists are recomputed as well. Lists that would only now take one of
+        them in are left to ``rebuild_relations``.
+        """
+        rewritten = {promise_id for promise_id, _ in promises}
+        cursor.execute("""
+            SELECT DISTINCT r.promise_id, p.text
+            FROM json_each(?) j
+            INNER JOIN promise_relations r ON r.related_id = j.value AND r.kind = 'similar'
+            INNER JOIN promises p ON p.id = r.promise_id
+        """, (json.dumps(sorted(rewritten)),))
+        promises = list(promises) + [(row[0], row[1]) for row in cursor.fetchall() if row[0] not in rewritten]
+        
+        cursor.executemany(
+            "DELETE FROM promise_relations WHERE kind = 'similar' AND promise_id = ?",
+            ((promise_id,) for promise_id, _ in promises)
+        )
+        edges = []
+        for promise_id, text in promises:
+            for related_id, score in self.similarity.query(cursor, text, self.RELATED_THRESHOLD,
+                                                            exclude_id=promise_id, limit=self.RELATED_LIMIT,
+                                                            max_candidates=self.RELATED_CANDIDATES):
+                edges.append((promise_id, related_id, score))
+        cursor.executemany("""
+            INSERT OR REPLACE INTO promise_relations (promise_id, related_id, kind, score)
+            VALUES (?, ?, 'similar', ?)
+        """, edges)
+    
+    def _rebuild_manual_relations(self, cursor: sqlite3.Cursor) -> None:
+        """Replace every edge with the ``manual`` edges of the promises table."""
+        cursor.execute("DELETE FROM promise_relations")
+        cursor.execute("""
+            INSERT OR IGNORE INTO promise_relations (promise_id, related_id, kind)
+            SELECT p.id, r.value, 'manual'
+            FROM promises p, json_each(CASE WHEN json_valid(p.related_promises) THEN p.related_promises END) r
+            WHERE r.type = 'integer' AND r.value != p.id
+        """)
+    
+    def _rebuild_relations(self, cursor: sqlite3.Cursor) -> int:
+        """Recompute every edge from the promises table. Returns the number of edges.
+        
+        One bounded similarity lookup per promise, so the time grows
+        linearly with the table.
+        """
+        self._rebuild_manual_relations(cursor)
+        self._link_similar(cursor, [(row[0], row[1]) for row in cursor.execute("SELECT id, text FROM promises").fetchall()])
+        cursor.execute("SELECT COUNT(*) FROM promise_relations")
+        return cursor.fetchone()[0]
+    
+    def rebuild_relations(self) -> int:
+        """Recompute the related-promise graph (e.g. after bulk imports)."""
+        with self.get_connection() as conn:
+            count = self._rebuild_relations(conn.cursor())
+            conn.commit()
+            return count
+    
+    def get_related(self, promise_ids: List[int], depth: int = 1, limit: Optional[int] = None,
+                    include_sources: bool = False) -> List[Tuple[Promise, int]]:
+        """Get the promises within ``depth`` relation hops of ``promise_ids``.
+        
+        Walks manual and similarity edges in both directions with one
+        recursive query. Returns (promise, hops) pairs, nearest first and,
+        within the same distance, by the strongest edge reaching them
+        (manual links count as 1.0). The starting promises are excluded.
+        """
+        seeds = json.dumps(list(dict.fromkeys(promise_ids)))
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                WITH RECURSIVE walk(id, depth, score) AS (
+                    SELECT value, 0, NULL FROM json_each(?)
+                    UNION
+                    SELECT CASE WHEN r.promise_id = walk.id THEN r.related_id ELSE r.promise_id END,
+                           walk.depth + 1, COALESCE(r.score, 1.0)
+                    FROM walk
+                    INNER JOIN promise_relations r ON r.promise_id = walk.id OR r.related_id = walk.id
+                    WHERE walk.depth < ?
+                )
+                SELECT p.*, MIN(walk.depth) AS hops, MAX(walk.score) AS strength
+                FROM walk INNER JOIN promises p ON p.id = walk.id
+                WHERE walk.id NOT IN (SELECT value FROM json_each(?))
+                GROUP BY p.id
+                ORDER BY hops, strength DESC, p.id
+                LIMIT ?
+            """, (seeds, depth, seeds, -1 if limit is None else limit))
+            rows = cursor.fetchall()
+            related = [(self._row_to_promise(row), row['hops']) for row in rows]
             
-            # Promises by category
-            cursor.execute("SELECT category, COUNT(*) as count FROM promises GROUP BY category ORDER BY count DESC")
-            promises_by_category = {row['category']: row['count'] for row in cursor.fetchall()}
+            if include_sources and related:
+                sources_by_promise = self._load_sources(cursor, [promise.id for promise, _ in related])
+                for promise, _ in related:
+                    promise.sources = sources_by_promise.get(promise.id, [])
             
-            # Average progress
-            cursor.execute("SELECT AVG(progress_percentage) as avg_progress FROM promises")
-            avg_progress = cursor.fetchone()['avg_progress'] or 0.0
+            return related
+    
+    def promises_by_tag(self, tag: str, limit: int = 50, include_sources: bool = True) -> List[Promise]:
+        """Get the most recently updated promises carrying ``tag``.
+        
+        Driven by the tag index, so the cost depends on how many promises
+        have the tag, not on the size of the promises table.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT p.* FROM promise_tags t
+                INNER JOIN promises p ON p.id = t.promise_id
+                WHERE t.tag = ?
+                ORDER BY p.date_updated DESC, p.id DESC
+                LIMIT ?
+            """, (tag, limit))
+            promises = [self._row_to_promise(row) for row in cursor.fetchall()]
             
-            # Fulfillment rate
-            fulfilled_count = promises_by_status.get('Fulfilled', 0) + promises_by_status.get('Partially Fulfilled', 0)
-            fulfillment_rate = (fulfilled_count / total_promises * 100) if total_promises > 0 else 0.0
+            if include_sources and promises:
+                sources_by_promise = self._load_sources(cursor, [promise.id for promise in promises])
+                for promise in promises:
+                    promise.sources = sources_by_promise.get(promise.id, [])
             
-            return {
-                'total_promises': total_promises,
-                'promises_by_status': promises_by_status,
-                'promises_by_category': promises_by_category,
-                'fulfillment_rate': fulfillment_rate,
-                'average_progress': avg_progress,
-                'most_active_categories': list(promises_by_category.keys())[:5],
-                'generated_at': datetime.now().isoformat()
-            }
+            return promises
+    
+    def get_tag_counts(self, limit: Optional[int] = None) -> Dict[str, int]:
+        """Number of promises per tag, most used first (ties by tag)."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT tag, COUNT(*) AS promise_count FROM promise_tags
+                GROUP BY tag ORDER BY promise_count DESC, tag
+                LIMIT ?
+            """, (limit if limit is not None else -1,))
+            return {row['tag']: row['promise_count'] for row in cursor.fetchall()}
+    
+    def record_validation_run(self, started_at: datetime, checks: List[Dict[str, Any]],
+                              status: str = 'success', message: Optional[str] = None) -> int:
+        """Store a finished link validation run and its per-source checks.
+        
+        Each check is a dict with ``source_id``, ``url``, ``is_valid``,
+        ``is_placeholder``, ``status_code``, ``latency_ms`` and
+        ``error_message``. Checks marked ``cached`` (sources an incremental
+        run didn't request) count towards the summary but aren't stored
+        again. Returns the run ID.
+        """
+        finished_at = datetime.now().isoformat()
+        placeholder_count = sum(1 for check in checks if check.get('is_placeholder'))
+        valid_count = sum(1 for check in checks if check['is_valid'] and not check.get('is_placeholder'))
+        fresh_checks = [check for check in checks if not check.get('cached')]
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO validation_runs (started_at, finished_at, status, message, total_count,
+                                             valid_count, invalid_count, placeholder_count, skipped_count)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                started_at.isoformat(), finished_at, status, message, len(checks),
+                valid_count, len(checks) - valid_count - placeholder_count, placeholder_count,
+                len(checks) - len(fresh_checks)
+            ))
+            run_id = cursor.lastrowid
+            
+            cursor.executemany("""
+                INSERT INTO link_checks (run_id, source_id, url, is_valid, is_placeholder,
+                                         status_code, latency_ms, error_message, checked_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(
+                run_id, check['source_id'], check['url'], bool(check['is_valid']),
+                bool(check.get('is_placeholder')), check.get('status_code'), check.get('latency_ms'),
+                check.get('error_message'), check.get('checked_at', finished_at)
+            ) for check in fresh_checks])
+            
+            conn.commit()
+            return run_id
+    
+    def record_link_check(self, source_id: int, url: Optional[str], is_valid: bool, status_code: int,
+                          latency_ms: Optional[float] = None, error_message: Optional[str] = None) -> int:
+        """Store a one-off check of a single source outside any run."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO link_checks (source_id, url, is_valid, status_code, latency_ms,
+                                         error_message, checked_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (source_id, url, is_valid, status_code, latency_ms, error_message,
+                  datetime.now().isoformat()))
+            conn.commit()
+            return cursor.lastrowid
+    
+    def get_latest_validation_run(self) -> Optional[Dict[str, Any]]:
+        """Get the summary of the most recent finished validation run."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM validation_runs
+                WHERE finished_at IS NOT NULL
+                ORDER BY finished_at DESC, id DESC
+                LIMIT 1
+            """)
+            row = cursor.fetchone()
+            return dict(row) if row else None
+    
+    def get_validation_run(self, run_id: int) -> Optional[Dict[str, Any]]:
+        """Get the summary of one validation run."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM validation_runs WHERE id = ?", (run_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+    
+    def get_validation_details(self, run_id: int) -> List[Dict[str, Any]]:
+        """Get every source's latest check as of a run, one entry per promise/source link.
+        
+        For a full run these are the run's own checks; sources an incremental
+        run skipped show their most recent earlier check.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT lc.source_id, ps.promise_id, s.title AS source_title, lc.url,
+                       lc.is_valid, lc.is_placeholder, lc.status_code, lc.latency_ms,
+                       lc.error_message, lc.checked_at
+                FROM sources s
+                INNER JOIN link_checks lc ON lc.id = (
+                    SELECT latest.id FROM link_checks latest
+                    WHERE latest.source_id = s.id
+                      AND latest.checked_at <= (SELECT finished_at FROM validation_runs WHERE id = ?)
+                    ORDER BY latest.checked_at DESC, latest.id DESC
+                    LIMIT 1
+                )
+                LEFT JOIN promise_sources ps ON ps.source_id = s.id
+                ORDER BY ps.promise_id, s.id
+            """, (run_id,))
+            
+            details = []
+            for row in cursor.fetchall():
+                detail = dict(row)
+                detail['is_valid'] = bool(detail['is_valid'])
+                detail['is_placeholder'] = bool(detail['is_placeholder'])
+                details.append(detail)
+            return details
+    
+    def get_link_check_history(self, source_id: int, limit: int = 20) -> List[Dict[str, Any]]:
+        """Get the most recent checks of one source, newest first."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT run_id, url, is_valid, is_placeholder, status_code, latency_ms,
+                       error_message, checked_at
+                FROM link_checks
+                WHERE source_id = ?
+                ORDER BY checked_at DESC, id DESC
+                LIMIT ?
+            """, (source_id, limit))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def get_link_states(self) -> Dict[int, Dict[str, Any]]:
+        """Get the stored link state of every source, keyed by source ID."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM link_states")
+            
+            states = {}
+            for row in cursor.fetchall():
+                state = dict(row)
+                state['is_valid'] = bool(state['is_valid'])
+                states[state['source_id']] = state
+            return states
+    
+    def save_link_states(self, states: List[Dict[str, Any]]) -> None:
+        """Insert or replace the link state of several sources."""
+        if not states:
+            return
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT OR REPLACE INTO link_states (source_id, url, etag, last_modified, is_valid,
+                                                   status_code, error_message, last_checked,
+                                                   next_check_at, ttl_seconds, success_streak,
+                                                   failure_streak)
+                VALUES (:source_id, :url, :etag, :last_modified, :is_valid, :status_code,
+                        :error_message, :last_checked, :next_check_at, :ttl_seconds,
+                        :success_streak, :failure_streak)
+            """, states)
+            conn.commit()
@@ -0,0 +1,261 @@
+"""
+Concurrent page fetching for the promise scrapers.
+"""
+
+import time
+import queue
+import random
+import asyncio
+import threading
+from contextlib import aclosing
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+from urllib.parse import urlparse
+
+import requests
+
+
+T = TypeVar('T')
+
+# Responses worth retrying; anything else below 400 or above is final
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Receives a page's FetchResult and an iterator over its body while it downloads
+Consumer = Callable[['FetchResult', Iterator[bytes]], None]
+
+
+@dataclass
+class FetchResult:
+    """The outcome of fetching one URL."""
+    url: str
+    content: Optional[bytes] = None
+    status_code: int = 0
+    encoding: Optional[str] = None  # Charset declared in the Content-Type header
+    error: Optional[str] = None
+    attempts: int = 0
+
+
+class AsyncFetcher:
+    """Fetches many URLs concurrently while staying polite to each domain.
+
+    Requests run on a thread pool through a shared ``requests.Session``; an
+    asyncio semaphore caps how many are in flight. Requests to the same
+    domain are spaced at least ``domain_delay`` seconds apart, while
+    different domains proceed in parallel. Connection errors, timeouts and
+    429/5xx responses are retried with exponential backoff and jitter
+    (``Retry-After`` is honoured when present).
+
+    With a ``consume`` callback, bodies aren't loaded: each response is
+    streamed into the callback on the worker that requested it, still
+    counted against the concurrency cap.
+    """
+
+    # Bytes per chunk handed to a consume callback
+    CHUNK_SIZE = 65536
+
+    def __init__(self, session: requests.Session, max_concurrency: int = 8,
+                 domain_delay: float = 1.0, max_retries: int = 3, backoff: float = 0.5,
+                 timeout: float = 15.0):
+        self.session = session
+        self.max_concurrency = max_concurrency
+        self.domain_delay = domain_delay
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+    async def fetch_all(self, urls: Iterable[str], consume: Optional[Consumer] = None) -> AsyncIterator[FetchResult]:
+        """Fetch every URL, yielding results in completion order.
+
+        With ``consume``, each successful response body is passed to it as
+        a stream of chunks instead of being stored in ``content``.
+        """
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        domain_locks: Dict[str, asyncio.Lock] = {}
+        next_slot: Dict[str, float] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            tasks = [
+                asyncio.ensure_future(self._fetch(url, semaphore, domain_locks, next_slot, executor, consume))
+                for url in urls
+            ]
+            try:
+                for task in asyncio.as_completed(tasks):
+                    yield await task
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    async def _fetch(self, url: str, semaphore: asyncio.Semaphore, domain_locks: Dict[str, asyncio.Lock],
+                     next_slot: Dict[str, float], executor: Executor,
+                     consume: Optional[Consumer] = None) -> FetchResult:
+        """Fetch one URL with retries, respecting the concurrency cap and domain delay.
+
+        Only failures before the body is read are retried; an error while
+        streaming to ``consume`` ends the fetch.
+        """
+        loop = asyncio.get_running_loop()
+        domain = urlparse(url).netloc.lower()
+        lock = domain_locks.setdefault(domain, asyncio.Lock())
+        result = FetchResult(url=url)
+
+        for attempt in range(self.max_retries + 1):
+            # Claim the domain's next request slot before taking a worker
+            async with lock:
+                wait = next_slot.get(domain, 0.0) - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                next_slot[domain] = time.monotonic() + self.domain_delay
+
+            retry_after = None
+            result.attempts = attempt + 1
+            async with semaphore:
+                try:
+                    response = await loop.run_in_executor(executor, self._get, url, consume is not None)
+                except requests.exceptions.RequestException as e:
+                    result.error = str(e)
+                else:
+                    result.status_code = response.status_code
+                    if response.status_code >= 400:
+                        response.close()
+                        result.error = f"HTTP {response.status_code}"
+                        if response.status_code not in RETRY_STATUSES:
+                            return result
+                        retry_after = self._retry_after(response)
+                    else:
+                        result.error = None
+                        if 'charset' in response.headers.get('Content-Type', '').lower():
+                            result.encoding = response.encoding
+                        if consume is None:
+                            result.content = response.content
+                        else:
+                            try:
+                                await loop.run_in_executor(executor, self._consume, response, result, consume)
+                            except requests.exceptions.RequestException as e:
+                                result.error = str(e)
+                        return result
+
+            if attempt < self.max_retries:
+                delay = self.backoff * (2 ** attempt) * (1 + random.random())
+                await asyncio.sleep(max(delay, retry_after or 0.0))
+
+        return result
+
+    def _get(self, url: str, stream: bool = False) -> requests.Response:
+        """Blocking GET, run on the worker pool."""
+        return self.session.get(url, timeout=self.timeout, stream=stream)
+
+    def _consume(self, response: requests.Response, result: FetchResult, consume: Consumer) -> None:
+        """Stream a response body into ``consume``, then release the connection."""
+        try:
+            consume(result, response.iter_content(chunk_size=self.CHUNK_SIZE))
+        finally:
+            response.close()
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        """Seconds to wait from a ``Retry-After`` header, if it holds a number."""
+        try:
+            return float(response.headers.get('Retry-After', ''))
+        except ValueError:
+            return None
+
+
+def run_pipeline(fetcher: AsyncFetcher, urls: Iterable[str],
+                 parse: Callable[[FetchResult], List[T]], parse_workers: int = 4) -> List[T]:
+    """Fetch ``urls`` and parse each page on a thread pool as soon as it arrives.
+
+    ``parse`` receives every successful FetchResult and returns a list of
+    items; failed fetches are reported and skipped. Items are returned in the
+    order of ``urls``, so results don't depend on network timing.
+    """
+    async def pipeline() -> Dict[str, List[T]]:
+        loop = asyncio.get_running_loop()
+        parsed: Dict[str, asyncio.Future] = {}
+
+        with ThreadPoolExecutor(max_workers=parse_workers) as parse_pool:
+            async for result in fetcher.fetch_all(urls):
+                if result.content is None:
+                    print(f"Error fetching {result.url}: {result.error} (after {result.attempts} attempts)")
+                    continue
+                parsed[result.url] = loop.run_in_executor(parse_pool, parse, result)
+
+            items_by_url = {}
+            for url, future in parsed.items():
+                try:
+                    items_by_url[url] = await future
+                except Exception as e:
+                    print(f"Error parsing {url}: {e}")
+            return items_by_url
+
+    urls = list(dict.fromkeys(urls))
+    items_by_url = asyncio.run(pipeline())
+    return [item for url in urls for item in items_by_url.get(url, [])]
+
+
+def stream_pipeline(fetcher: AsyncFetcher, urls: Iterable[str],
+                    parse: Callable[[FetchResult, Iterator[bytes]], Iterable[T]],
+                    buffer: int = 1000) -> Iterator[T]:
+    """Fetch ``urls`` and parse each body while it downloads, yielding items as they are produced.
+
+    Pages get the same concurrency cap, domain delay and retries as
+    ``run_pipeline``, but no page is held in memory: ``parse`` receives the
+    FetchResult and an iterator over the body's chunks, on the worker
+    reading them. Items from different pages interleave in the order they
+    are produced. At most ``buffer`` items wait for the caller; beyond that
+    the workers pause. Closing the iterator early returns at once; the
+    fetch stops in the background as each in-flight page delivers its next
+    chunk.
+    """
+    items: queue.Queue = queue.Queue(maxsize=buffer)
+    stopped = threading.Event()
+    done = object()
+
+    def put(item) -> bool:
+        """Hand an item to the caller, waiting for room; False once the caller is gone."""
+        while not stopped.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def consume(result: FetchResult, chunks: Iterator[bytes]) -> None:
+        try:
+            for item in parse(result, chunks):
+                if not put(item):
+                    return
+        except requests.exceptions.RequestException:
+            raise
+        except Exception as e:
+            print(f"Error parsing {result.url}: {e}")
+
+    async def pipeline() -> None:
+        async with aclosing(fetcher.fetch_all(urls, consume)) as results:
+            async for result in results:
+                if stopped.is_set():
+                    break
+                if result.error:
+                    print(f"Error fetching {result.url}: {result.error} (after {result.attempts} attempts)")
+
+    def run() -> None:
+        try:
+            asyncio.run(pipeline())
+        finally:
+            put(done)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is done:
+                break
+            yield item
+    finally:
+        stopped.set()
@@ -0,0 +1,108 @@
+"""
+Readers that turn JSONL and CSV exports into promises for bulk import.
+"""
+
+import csv
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from .models import Promise, PromiseStatus, Source, SourceType
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO date/datetime string; empty values become None."""
+    return datetime.fromisoformat(value) if value else None
+
+
+def _records(value: Any, key: str, item_type: type = dict) -> List[Any]:
+    """Check that a record field holds a list of ``item_type`` (missing means empty)."""
+    if not value:
+        return []
+    if not isinstance(value, list) or not all(isinstance(item, item_type) for item in value):
+        raise ValueError(f"'{key}' must be a list of {'objects' if item_type is dict else 'strings'}")
+    return value
+
+
+def source_from_dict(record: Dict[str, Any]) -> Source:
+    """Build a Source from a plain dict using the ``Source.to_dict`` keys."""
+    source = Source(
+        url=record.get('url') or None,
+        title=record.get('title') or "",
+        source_type=SourceType(record.get('source_type') or SourceType.OTHER.value),
+        date=_parse_date(record.get('date')),
+        description=record.get('description') or "",
+        reliability_score=float(record.get('reliability_score') or 1.0)
+    )
+    if record.get('created_at'):
+        source.created_at = _parse_date(record['created_at'])
+    return source
+
+
+def promise_from_dict(record: Dict[str, Any]) -> Promise:
+    """Build a Promise from a plain dict using the ``Promise.to_dict`` keys.
+
+    IDs in the record are ignored; the database assigns new ones.
+    """
+    if not isinstance(record, dict):
+        raise ValueError(f"expected a JSON object, got {type(record).__name__}")
+    if not record.get('text'):
+        raise ValueError("promise record has no text")
+
+    promise = Promise(
+        text=record['text'],
+        category=record.get('category') or "Other",
+        status=PromiseStatus(record.get('status') or PromiseStatus.NOT_STARTED.value),
+        priority=int(record.get('priority') or 3),
+        date_made=_parse_date(record.get('date_made')),
+        sources=[source_from_dict(source) for source in _records(record.get('sources'), 'sources')],
+        tags=list(_records(record.get('tags'), 'tags', str)),
+        notes=record.get('notes') or "",
+        progress_percentage=float(record.get('progress_percentage') or 0.0)
+    )
+    for key in ('date_updated', 'created_at'):
+        if record.get(key):
+            setattr(promise, key, _parse_date(record[key]))
+    return promise
+
+
+def iter_jsonl(path: str) -> Iterator[Promise]:
+    """Yield promises from a file holding one JSON object per line."""
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield promise_from_dict(json.loads(line))
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"{path}:{line_number}: {e}") from e
+
+
+def iter_csv(path: str) -> Iterator[Promise]:
+    """Yield promises from a CSV file with a header row.
+
+    Columns are the promise fields; ``tags`` is semicolon-separated and a
+    single source may be given as ``source_url``, ``source_title``,
+    ``source_type`` and ``source_date``.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        for line_number, row in enumerate(csv.DictReader(f), 2):
+            record: Dict[str, Any] = dict(row)
+            record['tags'] = [tag.strip() for tag in (row.get('tags') or "").split(';') if tag.strip()]
+            if row.get('source_url') or row.get('source_title'):
+                record['sources'] = [{
+                    'url': row.get('source_url'),
+                    'title': row.get('source_title'),
+                    'source_type': row.get('source_type'),
+                    'date': row.get('source_date')
+                }]
+            try:
+                yield promise_from_dict(record)
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"{path}:{line_number}: {e}") from e
+
+
+def iter_promises(path: str, file_format: Optional[str] = None) -> Iterator[Promise]:
+    """Yield promises from ``path``, picking the reader from ``file_format`` or the extension."""
+    file_format = file_format or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+    return iter_csv(path) if file_format == 'csv' else iter_jsonl(path)
@@ -0,0 +1,105 @@
+"""
+Multi-keyword substring matching for promise detection.
+"""
+
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton that finds every keyword contained in a text.
+
+    The automaton is compiled once into a deterministic transition table,
+    so one pass over the text (one dict lookup per character) reports all
+    keywords it contains, including overlapping ones and keywords nested
+    inside others. Matching is by substring and case-sensitive, the same
+    as ``keyword in text``; callers lowercase the text themselves.
+
+    Stepping one character at a time is slow in Python, so ``find`` walks
+    the text a space-separated word at a time and memoizes the automaton's
+    (state, word) -> (state, matches) steps. Natural-language text reuses a
+    small vocabulary, so almost every word is a single dict lookup.
+    """
+
+    # Memoized word steps kept before the cache is cleared
+    MAX_CACHED_STEPS = 200000
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = frozenset(keyword for keyword in keywords if keyword)
+        self._transitions, self._outputs = self._compile(sorted(self.keywords))
+        # Memoized steps per start state: word (with its trailing space) -> (end state, matches)
+        self._word_steps: List[Dict[str, Tuple[int, Optional[FrozenSet[str]]]]] = [{} for _ in self._transitions]
+        self._last_steps: List[Dict[str, Tuple[int, Optional[FrozenSet[str]]]]] = [{} for _ in self._transitions]
+        self._cached_steps = 0
+
+    def find(self, text: str) -> FrozenSet[str]:
+        """Get the set of keywords that occur in ``text``."""
+        if self._cached_steps >= self.MAX_CACHED_STEPS:
+            self._word_steps = [{} for _ in self._transitions]
+            self._last_steps = [{} for _ in self._transitions]
+            self._cached_steps = 0
+        word_steps, last_steps = self._word_steps, self._last_steps
+
+        found = set()
+        state = 0
+        # Every word but the last is stepped together with the space after it
+        words = text.split(' ')
+        last = words.pop()
+        for word in words:
+            step = word_steps[state].get(word)
+            if step is None:
+                step = word_steps[state][word] = self._step(state, word + ' ')
+                self._cached_steps += 1
+            state, output = step
+            if output:
+                found |= output
+
+        step = last_steps[state].get(last)
+        if step is None:
+            step = last_steps[state][last] = self._step(state, last)
+            self._cached_steps += 1
+        if step[1]:
+            found |= step[1]
+        return frozenset(found)
+
+    def _step(self, state: int, chunk: str) -> Tuple[int, Optional[FrozenSet[str]]]:
+        """Run the automaton over ``chunk`` from ``state``; return the end state and matches."""
+        transitions, outputs = self._transitions, self._outputs
+        found = set()
+        for char in chunk:
+            state = transitions[state].get(char, 0)
+            output = outputs[state]
+            if output:
+                found |= output
+        return state, frozenset(found) or None
+
+    @staticmethod
+    def _compile(keywords: List[str]):
+        """Build the goto/fail automaton and flatten it into full transition tables."""
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[set] = [set()]
+        for keyword in keywords:
+            state = 0
+            for char in keyword:
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append(set())
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state].add(keyword)
+
+        # Breadth-first, so a state's fail target is always resolved before it
+        fail = [0] * len(goto)
+        transitions: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            transitions[state] = dict(transitions[fail[state]])
+            transitions[state].update(goto[state])
+            outputs[state] |= outputs[fail[state]]
+            for char, child in goto[state].items():
+                fail[child] = transitions[fail[state]].get(char, 0)
+                queue.append(child)
+
+        frozen: List[Optional[FrozenSet[str]]] = [frozenset(output) or None for output in outputs]
+        return transitions, frozen
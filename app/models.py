@@ -2,12 +2,50 @@
 Data models for the Trump Promises Tracker application.
 """
 
+import sys
+import json
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Dict, Any, Union
 from enum import Enum
 
 
+# Models loaded in bulk drop the per-instance __dict__ (``slots`` needs Python 3.10+)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Origin of epoch-microsecond timestamps. Promise datetimes are naive local
+# times, so they are counted from a naive epoch without any timezone shift.
+EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch_us(value: datetime) -> int:
+    """Microseconds between ``EPOCH`` and a datetime.
+    
+    Timezone-aware values (e.g. imported ``...Z`` timestamps) are converted
+    to UTC and counted as naive UTC times.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - EPOCH) // _MICROSECOND
+
+
+def parse_timestamp(value: Union[str, int, None]) -> Optional[datetime]:
+    """Decode a stored timestamp: ISO 8601 text or epoch microseconds."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, int):
+        return EPOCH + _MICROSECOND * value
+    return datetime.fromisoformat(value)
+
+
+def format_timestamp(value: Union[str, int, None]) -> Optional[str]:
+    """A stored timestamp as ISO 8601 text; ISO values are passed through unparsed."""
+    if isinstance(value, int):
+        return parse_timestamp(value).isoformat()
+    return value or None
+
+
 class PromiseStatus(Enum):
     """Enumeration of possible promise statuses."""
     NOT_STARTED = "Not Started"
@@ -32,7 +70,7 @@ class SourceType(Enum):
     OTHER = "Other"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Source:
     """Represents a source for a promise."""
     id: Optional[int] = None
@@ -58,7 +96,7 @@ class Source:
         }
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Promise:
     """Represents a campaign promise."""
     id: Optional[int] = None
@@ -74,6 +112,7 @@ class Promise:
     progress_percentage: float = 0.0  # 0-100
     related_promises: List[int] = field(default_factory=list)  # IDs of related promises
     created_at: datetime = field(default_factory=datetime.now)
+    version: int = 1  # Incremented by every database write
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert promise to dictionary."""
@@ -90,7 +129,8 @@ class Promise:
             'notes': self.notes,
             'progress_percentage': self.progress_percentage,
             'related_promises': self.related_promises,
-            'created_at': self.created_at.isoformat()
+            'created_at': self.created_at.isoformat(),
+            'version': self.version
         }
     
     def add_source(self, source: Source) -> None:
@@ -99,13 +139,6 @@ class Promise:
             self.sources.append(source)
             self.date_updated = datetime.now()
     
-    def update_status(self, new_status: PromiseStatus, notes: str = "") -> None:
-        """Update the promise status."""
-        self.status = new_status
-        self.date_updated = datetime.now()
-        if notes:
-            self.notes += f"\n[{datetime.now().strftime('%Y-%m-%d')}] Status changed to {new_status.value}: {notes}"
-    
     def add_tag(self, tag: str) -> None:
         """Add a tag to this promise."""
         if tag not in self.tags:
@@ -113,7 +146,132 @@ class Promise:
             self.date_updated = datetime.now()
 
 
+class PromiseRow:
+    """Read-only view of a ``promises`` row with the attributes of a Promise.
+    
+    Keeps the raw row and decodes a column (timestamps in either storage
+    format, JSON lists, the status enum) only when it is read, so list and
+    analytics paths that touch a few fields don't build a datetime for
+    every timestamp of every promise. ``to_promise()`` gives a full,
+    mutable Promise.
+    """
+    
+    __slots__ = ('_row', 'sources')
+    
+    def __init__(self, row, sources: Optional[List[Source]] = None):
+        self._row = row
+        self.sources = sources if sources is not None else []
+    
+    @property
+    def id(self) -> int:
+        return self._row['id']
+    
+    @property
+    def text(self) -> str:
+        return self._row['text']
+    
+    @property
+    def category(self) -> str:
+        return self._row['category']
+    
+    @property
+    def status(self) -> PromiseStatus:
+        return PromiseStatus(self._row['status'])
+    
+    @property
+    def priority(self) -> int:
+        return self._row['priority']
+    
+    @property
+    def date_made(self) -> Optional[datetime]:
+        return parse_timestamp(self._row['date_made'])
+    
+    @property
+    def date_updated(self) -> datetime:
+        return parse_timestamp(self._row['date_updated'])
+    
+    @property
+    def tags(self) -> List[str]:
+        value = self._row['tags']
+        return json.loads(value) if value else []
+    
+    @property
+    def notes(self) -> str:
+        return self._row['notes'] or ""
+    
+    @property
+    def progress_percentage(self) -> float:
+        return self._row['progress_percentage']
+    
+    @property
+    def related_promises(self) -> List[int]:
+        value = self._row['related_promises']
+        return json.loads(value) if value else []
+    
+    @property
+    def created_at(self) -> datetime:
+        return parse_timestamp(self._row['created_at'])
+    
+    @property
+    def version(self) -> int:
+        return self._row['version']
+    
+    def to_promise(self) -> Promise:
+        """Decode every column into a full Promise."""
+        return Promise(
+            id=self.id,
+            text=self.text,
+            category=self.category,
+            status=self.status,
+            priority=self.priority,
+            date_made=self.date_made,
+            date_updated=self.date_updated,
+            sources=list(self.sources),
+            tags=self.tags,
+            notes=self.notes,
+            progress_percentage=self.progress_percentage,
+            related_promises=self.related_promises,
+            created_at=self.created_at,
+            version=self.version
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Same as ``Promise.to_dict()``; ISO timestamps are copied without parsing."""
+        row = self._row
+        return {
+            'id': row['id'],
+            'text': row['text'],
+            'category': row['category'],
+            'status': row['status'],
+            'priority': row['priority'],
+            'date_made': format_timestamp(row['date_made']),
+            'date_updated': format_timestamp(row['date_updated']),
+            'sources': [source.to_dict() for source in self.sources],
+            'tags': self.tags,
+            'notes': self.notes,
+            'progress_percentage': row['progress_percentage'],
+            'related_promises': self.related_promises,
+            'created_at': format_timestamp(row['created_at']),
+            'version': row['version']
+        }
+
+
+@dataclass
+class PromisePage:
+    """A page of promises returned by a keyset-paginated query."""
+    promises: List[PromiseRow] = field(default_factory=list)
+    next_cursor: Optional[str] = None  # Pass back to fetch the following page
+
+
 @dataclass
+class SearchResult:
+    """A full-text search hit."""
+    promise: Promise
+    snippet: str = ""
+    score: float = 0.0  # Higher is more relevant
+
+
+@dataclass(**_SLOTS)
 class ProgressUpdate:
     """Represents a progress update for a promise."""
     id: Optional[int] = None
@@ -137,6 +295,30 @@ class ProgressUpdate:
         }
 
 
+@dataclass(**_SLOTS)
+class PromiseEvent:
+    """One recorded status or progress change of a promise."""
+    id: Optional[int] = None
+    promise_id: int = 0
+    kind: str = "status"  # 'status' or 'progress'
+    old_value: Any = None  # Status value or progress percentage; None if unknown
+    new_value: Any = None
+    note: str = ""
+    changed_at: datetime = field(default_factory=datetime.now)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert event to dictionary."""
+        return {
+            'id': self.id,
+            'promise_id': self.promise_id,
+            'kind': self.kind,
+            'old_value': self.old_value,
+            'new_value': self.new_value,
+            'note': self.note,
+            'changed_at': self.changed_at.isoformat()
+        }
+
+
 @dataclass
 class AnalyticsData:
     """Represents analytics data for promises."""
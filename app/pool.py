@@ -0,0 +1,186 @@
+"""
+SQLite connection pooling for the Trump Promises Tracker.
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from typing import Dict
+
+
+class PooledConnection:
+    """A pooled SQLite connection and its bookkeeping timestamps."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class ConnectionPool:
+    """Hands each thread one long-lived SQLite connection.
+
+    Connections are opened lazily on a thread's first checkout, configured
+    once with the pragmas below and then reused. A connection idle for longer
+    than ``health_check_interval`` is pinged before reuse, and one older than
+    ``max_age`` is closed and reopened between transactions. Connections of
+    threads that have exited are closed when the next connection is opened.
+    """
+
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",       # Readers don't block the writer
+        "PRAGMA synchronous=NORMAL",     # Safe with WAL, far fewer fsyncs
+        "PRAGMA cache_size=-65536",      # 64 MiB page cache per connection
+        "PRAGMA mmap_size=268435456",    # Map up to 256 MiB of the file
+        "PRAGMA temp_store=MEMORY",
+    )
+
+    _pools: Dict[str, "ConnectionPool"] = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self, db_path: str, timeout: float = 30.0, max_age: float = 3600.0,
+                 health_check_interval: float = 30.0):
+        self.db_path = db_path
+        self.timeout = timeout
+        self.max_age = max_age
+        self.health_check_interval = health_check_interval
+        self._connections: Dict[int, PooledConnection] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._query_counts = threading.local()
+
+    @classmethod
+    def for_path(cls, db_path: str, **options) -> "ConnectionPool":
+        """Get the process-wide pool for a database file, creating it if needed.
+
+        ``options`` only apply when the pool is first created.
+        """
+        with cls._pools_lock:
+            pool = cls._pools.get(db_path)
+            if pool is None:
+                pool = cls._pools[db_path] = cls(db_path, **options)
+            return pool
+
+    def acquire(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening or recycling it as needed."""
+        if os.getpid() != self._pid:
+            self._reset_after_fork()
+
+        pooled = self._connections.get(threading.get_ident())
+        now = time.monotonic()
+
+        if pooled is not None and not self._in_transaction(pooled.conn):
+            if now - pooled.created_at > self.max_age:
+                self._discard(threading.get_ident())
+                pooled = None
+            elif now - pooled.last_used > self.health_check_interval and not self._is_healthy(pooled.conn):
+                self._discard(threading.get_ident())
+                pooled = None
+
+        if pooled is None:
+            pooled = self._open()
+
+        pooled.last_used = now
+        return pooled.conn
+
+    def close_thread(self) -> None:
+        """Close the calling thread's connection, if it has one."""
+        self._discard(threading.get_ident())
+
+    def close_all(self) -> None:
+        """Close every connection held by the pool."""
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for pooled in connections:
+            self._close_quietly(pooled.conn)
+
+    def start_query_count(self) -> None:
+        """Start counting the SQL statements the calling thread runs.
+
+        Counting installs a trace callback on the thread's connection only
+        while it is active, so uncounted work (e.g. bulk imports) pays
+        nothing for it. Statements run by triggers are not counted.
+        """
+        self._query_counts.count = 0
+        pooled = self._connections.get(threading.get_ident())
+        if pooled is not None:
+            pooled.conn.set_trace_callback(self._count_statement)
+
+    def stop_query_count(self) -> int:
+        """Stop counting for the calling thread and return the number of statements run."""
+        count = getattr(self._query_counts, 'count', None)
+        self._query_counts.count = None
+        pooled = self._connections.get(threading.get_ident())
+        if pooled is not None:
+            pooled.conn.set_trace_callback(None)
+        return count or 0
+
+    def _count_statement(self, statement: str) -> None:
+        """Trace callback: count one statement for the calling thread."""
+        if getattr(self._query_counts, 'count', None) is not None and not statement.startswith('--'):
+            self._query_counts.count += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Get the number of open connections in this pool."""
+        return {'open_connections': len(self._connections)}
+
+    def _open(self) -> PooledConnection:
+        """Open and configure a connection for the calling thread."""
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Enable column access by name
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        if getattr(self._query_counts, 'count', None) is not None:
+            conn.set_trace_callback(self._count_statement)
+
+        pooled = PooledConnection(conn)
+        with self._lock:
+            self._prune_dead_threads()
+            self._connections[threading.get_ident()] = pooled
+        return pooled
+
+    def _discard(self, thread_id: int) -> None:
+        """Drop and close the connection belonging to ``thread_id``."""
+        with self._lock:
+            pooled = self._connections.pop(thread_id, None)
+        if pooled is not None:
+            self._close_quietly(pooled.conn)
+
+    def _prune_dead_threads(self) -> None:
+        """Close connections of threads that no longer exist. Caller holds the lock."""
+        alive = {thread.ident for thread in threading.enumerate()}
+        for thread_id in [tid for tid in self._connections if tid not in alive]:
+            self._close_quietly(self._connections.pop(thread_id).conn)
+
+    def _reset_after_fork(self) -> None:
+        """Forget connections inherited from the parent process without closing them."""
+        self._connections = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    @staticmethod
+    def _in_transaction(conn: sqlite3.Connection) -> bool:
+        """Whether a connection has uncommitted work (False once it is closed)."""
+        try:
+            return conn.in_transaction
+        except sqlite3.ProgrammingError:
+            return False
+
+    @staticmethod
+    def _is_healthy(conn: sqlite3.Connection) -> bool:
+        """Check that a connection still answers queries."""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn: sqlite3.Connection) -> None:
+        """Close a connection, ignoring errors from an already broken one."""
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
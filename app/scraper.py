@@ -4,15 +4,18 @@ Web scraping utilities for collecting Trump's campaign promises from various sou
 
 import requests
 from bs4 import BeautifulSoup
-import time
 import re
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple, FrozenSet, Iterable, Iterator, Union
 from urllib.parse import urljoin, urlparse
 import feedparser
 from dataclasses import dataclass
 
 from .models import Promise, Source, SourceType, PromiseStatus
+from .fetcher import AsyncFetcher, FetchResult, run_pipeline, stream_pipeline
+from .keywords import KeywordMatcher
+from .transcripts import iter_html_text, iter_sentences
 
 
 @dataclass
@@ -27,14 +30,27 @@ class ScrapedPromise:
 
 
 class PromiseScraper:
-    """Scrapes campaign promises from various online sources."""
+    """Scrapes campaign promises from various online sources.
     
-    def __init__(self, delay_seconds: float = 1.0):
+    Pages are fetched concurrently (``max_concurrency`` at a time, requests
+    to one domain at least ``delay_seconds`` apart, failures retried up to
+    ``max_retries`` times) and parsed on ``parse_workers`` threads as they
+    arrive.
+    """
+    
+    def __init__(self, delay_seconds: float = 1.0, max_concurrency: int = 8,
+                 max_retries: int = 3, parse_workers: int = 4):
         self.delay_seconds = delay_seconds
+        self.parse_workers = parse_workers
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max_concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.fetcher = AsyncFetcher(self.session, max_concurrency=max_concurrency,
+                                    domain_delay=delay_seconds, max_retries=max_retries)
         
         # Keywords that commonly indicate promises
         self.promise_keywords = [
@@ -54,35 +70,73 @@ class PromiseScraper:
             'Tax Policy': ['tax', 'taxes', 'irs', 'deduction', 'credit', 'revenue'],
             'Infrastructure': ['infrastructure', 'roads', 'bridges', 'transportation', 'airports']
         }
+        
+        # Word lists used to judge and score candidate promises
+        self.future_indicators = ['will', 'going to', 'plan to', 'intend to', 'shall']
+        self.strong_commitments = ['pledge', 'promise', 'guarantee', 'commit', 'swear']
+        self.action_words = ['build', 'create', 'eliminate', 'reduce', 'increase', 'implement']
+        self.vague_words = ['maybe', 'possibly', 'might', 'could', 'probably']
+        
+        # Tags and the phrases that trigger them
+        self.tag_rules = [
+            ('taxes', ['tax']),
+            ('employment', ['job']),
+            ('border-security', ['border', 'wall']),
+            ('healthcare', ['health']),
+            ('trade', ['trade']),
+            ('energy', ['energy']),
+            ('immediate', ['day one', 'first day', 'immediately']),
+            ('100-days', ['100 days', 'first 100']),
+        ]
+        
+        # One automaton over every list above, so each text is scanned once
+        self.keyword_matcher = KeywordMatcher(
+            self.promise_keywords + self.future_indicators + self.strong_commitments +
+            self.action_words + self.vague_words +
+            [keyword for keywords in self.category_keywords.values() for keyword in keywords] +
+            [keyword for tag, keywords in self.tag_rules for keyword in keywords]
+        )
+        self._promise_keyword_set = frozenset(self.promise_keywords)
+        self._future_indicator_set = frozenset(self.future_indicators)
+        self._strong_commitment_set = frozenset(self.strong_commitments)
+        self._action_word_set = frozenset(self.action_words)
+        self._vague_word_set = frozenset(self.vague_words)
+        self._tag_rule_sets = [(tag, frozenset(keywords)) for tag, keywords in self.tag_rules]
+        self._keyword_categories: Dict[str, List[str]] = {}
+        for category, keywords in self.category_keywords.items():
+            for keyword in keywords:
+                self._keyword_categories.setdefault(keyword, []).append(category)
+        # Detection, scoring, categorizing and tagging usually see the same sentence
+        self._keyword_hits = lru_cache(maxsize=4096)(self._find_keywords)
     
     def scrape_campaign_website(self, url: str) -> List[ScrapedPromise]:
         """Scrape promises from campaign website."""
+        return self.scrape_campaign_websites([url])
+    
+    def scrape_campaign_websites(self, urls: List[str]) -> List[ScrapedPromise]:
+        """Scrape promises from several campaign websites concurrently."""
+        return run_pipeline(self.fetcher, urls, self._parse_campaign_page, self.parse_workers)
+    
+    def _parse_campaign_page(self, page: FetchResult) -> List[ScrapedPromise]:
+        """Extract promises from a fetched campaign web page."""
         promises = []
+        soup = BeautifulSoup(page.content, 'html.parser')
         
-        try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Look for promise-related content
-            promise_sections = soup.find_all(['p', 'li', 'div'], 
-                                           text=re.compile('|'.join(self.promise_keywords), re.IGNORECASE))
-            
-            for section in promise_sections:
-                text = section.get_text().strip()
-                if len(text) > 20 and self._is_likely_promise(text):
-                    promises.append(ScrapedPromise(
-                        text=text,
-                        source_url=url,
-                        source_title=soup.title.get_text() if soup.title else "Campaign Website",
-                        date_found=datetime.now(),
-                        confidence_score=self._calculate_promise_confidence(text)
-                    ))
-            
-        except Exception as e:
-            print(f"Error scraping {url}: {e}")
+        # Look for promise-related content
+        promise_sections = soup.find_all(['p', 'li', 'div'], 
+                                       text=re.compile('|'.join(self.promise_keywords), re.IGNORECASE))
+        
+        for section in promise_sections:
+            text = section.get_text().strip()
+            if len(text) > 20 and self._is_likely_promise(text):
+                promises.append(ScrapedPromise(
+                    text=text,
+                    source_url=page.url,
+                    source_title=soup.title.get_text() if soup.title else "Campaign Website",
+                    date_found=datetime.now(),
+                    confidence_score=self._calculate_promise_confidence(text)
+                ))
         
-        time.sleep(self.delay_seconds)
         return promises
     
     def scrape_news_articles(self, search_query: str = "Trump promises") -> List[ScrapedPromise]:
@@ -92,78 +146,78 @@ class PromiseScraper:
         print(f"Would search for news articles with query: {search_query}")
         return []
     
-    def scrape_speech_transcripts(self, transcript_urls: List[str]) -> List[ScrapedPromise]:
-        """Scrape promises from speech transcripts."""
-        promises = []
+    def scrape_speech_transcripts(self, transcript_urls: Iterable[str]) -> Iterator[ScrapedPromise]:
+        """Scrape promises from speech transcripts, yielding them while the pages stream in.
         
-        for url in transcript_urls:
-            try:
-                response = self.session.get(url)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Extract text content
-                text_content = soup.get_text()
-                
-                # Split into sentences and analyze each
-                sentences = re.split(r'[.!?]+', text_content)
-                
-                for sentence in sentences:
-                    sentence = sentence.strip()
-                    if len(sentence) > 20 and self._is_likely_promise(sentence):
-                        promises.append(ScrapedPromise(
-                            text=sentence,
-                            source_url=url,
-                            source_title="Speech Transcript",
-                            date_found=datetime.now(),
-                            confidence_score=self._calculate_promise_confidence(sentence)
-                        ))
-                
-            except Exception as e:
-                print(f"Error scraping transcript {url}: {e}")
-            
-            time.sleep(self.delay_seconds)
+        Transcripts are fetched concurrently like the other sources, but
+        each one is parsed as it downloads, so memory use stays bounded
+        however long the transcripts are.
+        """
+        return stream_pipeline(self.fetcher, transcript_urls, self._parse_transcript)
+    
+    def stream_speech_transcript(self, url: str) -> Iterator[ScrapedPromise]:
+        """Download one transcript, yielding promises while the page is still streaming in."""
+        return self.scrape_speech_transcripts([url])
+    
+    def iter_transcript_promises(self, chunks: Iterable[Union[bytes, str]], url: str,
+                                 encoding: str = 'utf-8') -> Iterator[ScrapedPromise]:
+        """Lazily extract promises from transcript HTML arriving in chunks.
         
-        return promises
+        The markup is parsed incrementally and split into sentences on the
+        fly, so neither the full text nor a full sentence list is built.
+        """
+        for sentence in iter_sentences(iter_html_text(chunks, encoding)):
+            sentence = sentence.strip()
+            if len(sentence) > 20 and self._is_likely_promise(sentence):
+                yield ScrapedPromise(
+                    text=sentence,
+                    source_url=url,
+                    source_title="Speech Transcript",
+                    date_found=datetime.now(),
+                    confidence_score=self._calculate_promise_confidence(sentence)
+                )
+    
+    def _parse_transcript(self, page: FetchResult, chunks: Iterator[bytes]) -> Iterator[ScrapedPromise]:
+        """Extract promises from a speech transcript as its body streams in."""
+        return self.iter_transcript_promises(chunks, page.url, page.encoding or 'utf-8')
     
     def scrape_rss_feeds(self, feed_urls: List[str]) -> List[ScrapedPromise]:
         """Scrape promises from RSS feeds."""
+        return run_pipeline(self.fetcher, feed_urls, self._parse_feed, self.parse_workers)
+    
+    def _parse_feed(self, page: FetchResult) -> List[ScrapedPromise]:
+        """Extract promises from a fetched RSS feed."""
         promises = []
+        feed = feedparser.parse(page.content)
         
-        for feed_url in feed_urls:
-            try:
-                feed = feedparser.parse(feed_url)
-                
-                for entry in feed.entries:
-                    # Analyze entry content for promises
-                    content = entry.get('description', '') or entry.get('summary', '')
-                    
-                    if self._contains_promise_language(content):
-                        promises.append(ScrapedPromise(
-                            text=content[:500] + "..." if len(content) > 500 else content,
-                            source_url=entry.get('link', feed_url),
-                            source_title=entry.get('title', 'RSS Feed Entry'),
-                            date_found=datetime.now(),
-                            confidence_score=self._calculate_promise_confidence(content)
-                        ))
-                
-            except Exception as e:
-                print(f"Error scraping RSS feed {feed_url}: {e}")
+        for entry in feed.entries:
+            # Analyze entry content for promises
+            content = entry.get('description', '') or entry.get('summary', '')
             
-            time.sleep(self.delay_seconds)
+            if self._contains_promise_language(content):
+                promises.append(ScrapedPromise(
+                    text=content[:500] + "..." if len(content) > 500 else content,
+                    source_url=entry.get('link', page.url),
+                    source_title=entry.get('title', 'RSS Feed Entry'),
+                    date_found=datetime.now(),
+                    confidence_score=self._calculate_promise_confidence(content)
+                ))
         
         return promises
     
+    def _find_keywords(self, text: str) -> FrozenSet[str]:
+        """Get every known keyword contained in the lowercased text."""
+        return self.keyword_matcher.find(text.lower())
+    
     def _is_likely_promise(self, text: str) -> bool:
         """Determine if text is likely to contain a promise."""
-        text_lower = text.lower()
+        hits = self._keyword_hits(text)
         
         # Check for promise keywords
-        has_promise_keywords = any(keyword in text_lower for keyword in self.promise_keywords)
+        has_promise_keywords = not hits.isdisjoint(self._promise_keyword_set)
         
         # Check for future tense indicators
-        future_indicators = ['will', 'going to', 'plan to', 'intend to', 'shall']
-        has_future_tense = any(indicator in text_lower for indicator in future_indicators)
+        has_future_tense = not hits.isdisjoint(self._future_indicator_set)
         
         # Check minimum length
         is_substantial = len(text.split()) >= 5
@@ -172,44 +226,42 @@ class PromiseScraper:
     
     def _contains_promise_language(self, text: str) -> bool:
         """Check if text contains promise-related language."""
-        return any(keyword in text.lower() for keyword in self.promise_keywords)
+        return not self._keyword_hits(text).isdisjoint(self._promise_keyword_set)
     
     def _calculate_promise_confidence(self, text: str) -> float:
         """Calculate confidence score for a potential promise."""
         score = 0.0
-        text_lower = text.lower()
+        hits = self._keyword_hits(text)
         
         # Base score for promise keywords
-        keyword_matches = sum(1 for keyword in self.promise_keywords if keyword in text_lower)
+        keyword_matches = len(hits & self._promise_keyword_set)
         score += min(keyword_matches * 0.2, 0.6)
         
         # Bonus for specific commitment language
-        strong_commitments = ['pledge', 'promise', 'guarantee', 'commit', 'swear']
-        if any(commitment in text_lower for commitment in strong_commitments):
+        if not hits.isdisjoint(self._strong_commitment_set):
             score += 0.3
         
         # Bonus for actionable language
-        action_words = ['build', 'create', 'eliminate', 'reduce', 'increase', 'implement']
-        if any(action in text_lower for action in action_words):
+        if not hits.isdisjoint(self._action_word_set):
             score += 0.2
         
         # Penalty for vague language
-        vague_words = ['maybe', 'possibly', 'might', 'could', 'probably']
-        if any(vague in text_lower for vague in vague_words):
+        if not hits.isdisjoint(self._vague_word_set):
             score -= 0.2
         
         return min(max(score, 0.0), 1.0)
     
     def categorize_promise(self, promise_text: str) -> str:
         """Automatically categorize a promise based on its content."""
-        text_lower = promise_text.lower()
+        hits = self._keyword_hits(promise_text)
         
         # Count keyword matches for each category
-        category_scores = {}
-        for category, keywords in self.category_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in text_lower)
-            if score > 0:
-                category_scores[category] = score
+        matches: Dict[str, int] = {}
+        for keyword in hits:
+            for category in self._keyword_categories.get(keyword, ()):
+                matches[category] = matches.get(category, 0) + 1
+        category_scores = {category: matches[category] for category in self.category_keywords
+                           if category in matches}
         
         # Return category with highest score, or 'Other' if no matches
         if category_scores:
@@ -242,30 +294,8 @@ class PromiseScraper:
     
     def _extract_tags(self, text: str) -> List[str]:
         """Extract relevant tags from promise text."""
-        tags = []
-        text_lower = text.lower()
-        
-        # Policy area tags
-        if 'tax' in text_lower:
-            tags.append('taxes')
-        if 'job' in text_lower:
-            tags.append('employment')
-        if 'border' in text_lower or 'wall' in text_lower:
-            tags.append('border-security')
-        if 'health' in text_lower:
-            tags.append('healthcare')
-        if 'trade' in text_lower:
-            tags.append('trade')
-        if 'energy' in text_lower:
-            tags.append('energy')
-        
-        # Timeline tags
-        if any(phrase in text_lower for phrase in ['day one', 'first day', 'immediately']):
-            tags.append('immediate')
-        if any(phrase in text_lower for phrase in ['100 days', 'first 100']):
-            tags.append('100-days')
-        
-        return tags
+        hits = self._keyword_hits(text)
+        return [tag for tag, keywords in self._tag_rule_sets if not hits.isdisjoint(keywords)]
 
 
 # Example usage and predefined source lists
@@ -0,0 +1,265 @@
+"""
+Token-set similarity index for finding related promises.
+"""
+
+import re
+import math
+import sqlite3
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> Set[str]:
+    """Split text into the set of lowercase word tokens used for similarity."""
+    return set(TOKEN_PATTERN.findall(text.lower()))
+
+
+def jaccard(tokens1: Set[str], tokens2: Set[str]) -> float:
+    """Jaccard similarity of two token sets (0.0 if either is empty)."""
+    if not tokens1 or not tokens2:
+        return 0.0
+    intersection = len(tokens1 & tokens2)
+    return intersection / (len(tokens1) + len(tokens2) - intersection)
+
+
+class SimilarityIndex:
+    """Inverted index of promise token sets, stored next to the promises.
+
+    Lookups use prefix filtering: a promise of m tokens can only reach
+    Jaccard similarity t with a query of n tokens if t*n <= m <= n/t and
+    the two share at least ceil(t*n) tokens, so it must contain one of any
+    n - ceil(t*n) + 1 of the query's tokens. Candidates are read from the
+    posting lists of the query's rarest tokens only (by the document
+    frequencies kept in ``token_frequencies``), which skips the long lists
+    of common words, and each candidate's exact Jaccard score is then
+    counted from its own indexed tokens. Results are the same as scoring
+    every promise; no promise text is re-tokenized at query time.
+
+    When every token is common, the rarest posting lists still cover most
+    of the table. ``max_candidates`` bounds the work for such queries:
+    only the first postings read from those lists, rarest token first,
+    are scored, so the cost no longer grows with the table but a match
+    sharing only common tokens with the query can be missed.
+    """
+
+    # Promise IDs per ``IN (...)`` query when loading token sets
+    BATCH_SIZE = 500
+
+    def create_schema(self, cursor: sqlite3.Cursor) -> None:
+        """Create the index tables if they don't exist."""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS promise_tokens (
+                token TEXT NOT NULL,
+                promise_id INTEGER NOT NULL,
+                PRIMARY KEY (token, promise_id)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_promise_tokens_promise ON promise_tokens (promise_id, token)")
+
+        # Token set size per promise, for the length filter and the Jaccard denominator
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS promise_token_counts (
+                promise_id INTEGER PRIMARY KEY,
+                token_count INTEGER NOT NULL
+            )
+        """)
+
+        # Number of promises containing each token, to pick the rarest for candidate lookups
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS token_frequencies (
+                token TEXT PRIMARY KEY,
+                promise_count INTEGER NOT NULL
+            ) WITHOUT ROWID
+        """)
+
+    def index_promise(self, cursor: sqlite3.Cursor, promise_id: int, text: str) -> None:
+        """Add or refresh one promise's token set, touching only the tokens that changed."""
+        tokens = tokenize(text)
+        old_tokens = self._load_token_sets(cursor, [promise_id]).get(promise_id, set())
+
+        cursor.executemany(
+            "DELETE FROM promise_tokens WHERE token = ? AND promise_id = ?",
+            ((token, promise_id) for token in old_tokens - tokens)
+        )
+        cursor.executemany(
+            "INSERT OR IGNORE INTO promise_tokens (token, promise_id) VALUES (?, ?)",
+            ((token, promise_id) for token in tokens - old_tokens)
+        )
+        cursor.execute("""
+            INSERT OR REPLACE INTO promise_token_counts (promise_id, token_count) VALUES (?, ?)
+        """, (promise_id, len(tokens)))
+        self._add_frequencies(cursor, Counter(tokens - old_tokens))
+        self._add_frequencies(cursor, {token: -1 for token in old_tokens - tokens})
+
+    def index_new_promises(self, cursor: sqlite3.Cursor, promises: Iterable[Tuple[int, str]]) -> None:
+        """Index freshly inserted (promise_id, text) pairs; skips the diff against old tokens."""
+        token_sets = [(promise_id, tokenize(text)) for promise_id, text in promises]
+        cursor.executemany(
+            "INSERT OR IGNORE INTO promise_tokens (token, promise_id) VALUES (?, ?)",
+            ((token, promise_id) for promise_id, tokens in token_sets for token in tokens)
+        )
+        cursor.executemany(
+            "INSERT OR REPLACE INTO promise_token_counts (promise_id, token_count) VALUES (?, ?)",
+            ((promise_id, len(tokens)) for promise_id, tokens in token_sets)
+        )
+        self._add_frequencies(cursor, Counter(token for _, tokens in token_sets for token in tokens))
+
+    def remove_promise(self, cursor: sqlite3.Cursor, promise_id: int) -> None:
+        """Drop a promise from the index."""
+        old_tokens = self._load_token_sets(cursor, [promise_id]).get(promise_id, set())
+        cursor.execute("DELETE FROM promise_tokens WHERE promise_id = ?", (promise_id,))
+        cursor.execute("DELETE FROM promise_token_counts WHERE promise_id = ?", (promise_id,))
+        self._add_frequencies(cursor, {token: -1 for token in old_tokens})
+
+    def rebuild(self, cursor: sqlite3.Cursor) -> int:
+        """Re-index every promise from scratch. Returns the number indexed."""
+        cursor.execute("DELETE FROM promise_tokens")
+        cursor.execute("DELETE FROM promise_token_counts")
+        cursor.execute("DELETE FROM token_frequencies")
+
+        rows = cursor.execute("SELECT id, text FROM promises").fetchall()
+        token_sets = [(row[0], tokenize(row[1])) for row in rows]
+
+        cursor.executemany(
+            "INSERT INTO promise_tokens (token, promise_id) VALUES (?, ?)",
+            ((token, promise_id) for promise_id, tokens in token_sets for token in tokens)
+        )
+        cursor.executemany(
+            "INSERT INTO promise_token_counts (promise_id, token_count) VALUES (?, ?)",
+            ((promise_id, len(tokens)) for promise_id, tokens in token_sets)
+        )
+        self.count_frequencies(cursor)
+        return len(token_sets)
+
+    def count_frequencies(self, cursor: sqlite3.Cursor) -> None:
+        """Recount ``token_frequencies`` from the posting lists."""
+        cursor.execute("DELETE FROM token_frequencies")
+        cursor.execute("""
+            INSERT INTO token_frequencies (token, promise_count)
+            SELECT token, COUNT(*) FROM promise_tokens GROUP BY token
+        """)
+
+    def query(self, cursor: sqlite3.Cursor, text: str, threshold: float,
+              exclude_id: Optional[int] = None, limit: Optional[int] = None,
+              max_candidates: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Find promises whose Jaccard similarity to ``text`` is at least ``threshold``.
+
+        ``threshold`` must be greater than zero. Returns (promise_id, score)
+        pairs, most similar first. With ``max_candidates``, at most that
+        many postings are read (see the class docstring).
+        """
+        tokens = sorted(tokenize(text))
+        if not tokens or threshold <= 0:
+            return []
+
+        size = len(tokens)
+        # Small epsilons keep the bounds conservative under float rounding.
+        # min_count is both the smallest token count a match can have and the
+        # fewest tokens it must share with the query.
+        min_count = max(math.ceil(threshold * size - 1e-9), 1)
+        max_count = math.floor(size / threshold + 1e-9)
+        if min_count > size:
+            return []
+
+        # A match shares min_count tokens, so it has one of any size - min_count + 1 of
+        # them: candidates come from the posting lists of the rarest ones, and only the
+        # min_count - 1 most common tokens are probed per candidate
+        frequencies = self._load_frequencies(cursor, tokens)
+        tokens.sort(key=lambda token: (frequencies.get(token, 0), token))
+        rare, common = tokens[:size - min_count + 1], tokens[size - min_count + 1:]
+        if exclude_id is None:
+            exclude_id = -1
+        if max_candidates is not None:
+            return self._query_bounded(cursor, tokens, rare, threshold, min_count, max_count,
+                                       exclude_id, limit, max_candidates)
+
+        cursor.execute(f"""
+            SELECT promise_id, score FROM (
+                SELECT candidate.promise_id,
+                       CAST(overlap AS REAL) / (? + c.token_count - overlap) AS score
+                FROM (
+                    SELECT promise_id,
+                           COUNT(*) + (SELECT COUNT(*) FROM promise_tokens common
+                                       WHERE common.promise_id = rare.promise_id
+                                         AND common.token IN ({",".join("?" * len(common))})) AS overlap
+                    FROM promise_tokens rare
+                    WHERE token IN ({",".join("?" * len(rare))})
+                    GROUP BY promise_id
+                ) candidate
+                INNER JOIN promise_token_counts c ON c.promise_id = candidate.promise_id
+                WHERE c.token_count BETWEEN ? AND ?
+                  AND candidate.promise_id != ?
+            )
+            WHERE score >= ?
+            ORDER BY score DESC, promise_id
+            LIMIT ?
+        """, [size] + common + rare + [min_count, max_count, exclude_id, threshold,
+                                       -1 if limit is None else limit])
+
+        return [(row[0], row[1]) for row in cursor.fetchall()]
+
+    @staticmethod
+    def _query_bounded(cursor: sqlite3.Cursor, tokens: List[str], rare: List[str], threshold: float,
+                       min_count: int, max_count: int, exclude_id: int, limit: Optional[int],
+                       max_candidates: int) -> List[Tuple[int, float]]:
+        """``query`` over the first ``max_candidates`` postings of the ``rare`` tokens.
+
+        The posting lists are read one after the other, rarest first, and
+        the ``LIMIT`` stops the read; each candidate's overlap with all of
+        ``tokens`` is then counted from the index.
+        """
+        postings = " UNION ALL ".join(
+            "SELECT promise_id FROM promise_tokens WHERE token = ? AND promise_id != ?" for _ in rare
+        )
+        cursor.execute(f"""
+            SELECT c.promise_id, c.token_count, COUNT(*) AS overlap
+            FROM (SELECT DISTINCT promise_id FROM ({postings} LIMIT ?)) candidate
+            INNER JOIN promise_token_counts c ON c.promise_id = candidate.promise_id
+            INNER JOIN promise_tokens t ON t.promise_id = candidate.promise_id
+            WHERE c.token_count BETWEEN ? AND ?
+              AND t.token IN ({",".join("?" * len(tokens))})
+            GROUP BY c.promise_id
+        """, [value for token in rare for value in (token, exclude_id)]
+             + [max_candidates, min_count, max_count] + tokens)
+
+        size = len(tokens)
+        scored = [(promise_id, overlap / (size + token_count - overlap))
+                  for promise_id, token_count, overlap in cursor.fetchall()]
+        # Same order as the exact query
+        scored = sorted((match for match in scored if match[1] >= threshold), key=lambda match: (-match[1], match[0]))
+        return scored if limit is None else scored[:limit]
+
+    def _load_frequencies(self, cursor: sqlite3.Cursor, tokens: List[str]) -> Dict[str, int]:
+        """Number of indexed promises containing each of ``tokens`` (absent tokens are omitted)."""
+        frequencies: Dict[str, int] = {}
+        for start in range(0, len(tokens), self.BATCH_SIZE):
+            chunk = tokens[start:start + self.BATCH_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            cursor.execute(f"SELECT token, promise_count FROM token_frequencies WHERE token IN ({placeholders})",
+                           chunk)
+            frequencies.update(cursor.fetchall())
+        return frequencies
+
+    @staticmethod
+    def _add_frequencies(cursor: sqlite3.Cursor, deltas: Dict[str, int]) -> None:
+        """Add ``deltas`` (token -> change in promise count) to ``token_frequencies``."""
+        cursor.executemany("""
+            INSERT INTO token_frequencies (token, promise_count) VALUES (?, ?)
+            ON CONFLICT (token) DO UPDATE SET promise_count = promise_count + excluded.promise_count
+        """, deltas.items())
+
+    def _load_token_sets(self, cursor: sqlite3.Cursor, promise_ids: List[int]) -> Dict[int, Set[str]]:
+        """Load the indexed token sets of several promises."""
+        token_sets: Dict[int, Set[str]] = {}
+        for start in range(0, len(promise_ids), self.BATCH_SIZE):
+            chunk = promise_ids[start:start + self.BATCH_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            cursor.execute(f"""
+                SELECT promise_id, token FROM promise_tokens WHERE promise_id IN ({placeholders})
+            """, chunk)
+            for promise_id, token in cursor.fetchall():
+                token_sets.setdefault(promise_id, set()).add(token)
+        return token_sets
@@ -0,0 +1,101 @@
+"""
+Streaming text and sentence extraction for large HTML transcripts.
+"""
+
+import re
+import codecs
+from html.parser import HTMLParser
+from typing import Iterable, Iterator, List, Union
+
+
+SENTENCE_END = re.compile(r'[.!?]+')
+
+# Elements whose contents are never visible text
+SKIPPED_TAGS = {'script', 'style', 'template', 'noscript'}
+
+
+class HTMLTextStream(HTMLParser):
+    """Incremental HTML parser that hands out the document's text as it is fed.
+
+    Feed markup in arbitrary pieces with ``feed`` and collect the text seen
+    so far with ``drain``; nothing but the pending text is kept, so memory
+    use does not depend on the document size.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._pending: List[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self._pending.append(data)
+
+    def drain(self) -> str:
+        """Return and forget the text parsed since the last call."""
+        text = "".join(self._pending)
+        self._pending = []
+        return text
+
+
+def iter_html_text(chunks: Iterable[Union[bytes, str]], encoding: str = 'utf-8') -> Iterator[str]:
+    """Parse HTML arriving in chunks, yielding its text piece by piece.
+
+    Byte chunks are decoded incrementally, so a multi-byte character split
+    across chunks is handled correctly.
+    """
+    parser = HTMLTextStream()
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    except LookupError:  # Unknown charset name from the server
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    for chunk in chunks:
+        parser.feed(decoder.decode(chunk) if isinstance(chunk, bytes) else chunk)
+        text = parser.drain()
+        if text:
+            yield text
+
+    parser.feed(decoder.decode(b'', final=True))
+    parser.close()
+    text = parser.drain()
+    if text:
+        yield text
+
+
+def iter_sentences(texts: Iterable[str], max_sentence_chars: int = 10000) -> Iterator[str]:
+    """Split streamed text into sentences at runs of ``.``, ``!`` and ``?``.
+
+    Yields the same pieces as ``re.split(r'[.!?]+', "".join(texts))`` while
+    holding only the unfinished sentence in memory. A "sentence" that grows
+    past ``max_sentence_chars`` without punctuation is cut there to keep
+    that bound.
+    """
+    buffer = ""
+    for text in texts:
+        buffer += text
+        start = 0
+        for match in SENTENCE_END.finditer(buffer):
+            # A run touching the end of the buffer may continue in the next chunk
+            if match.end() == len(buffer):
+                break
+            yield buffer[start:match.start()]
+            start = match.end()
+        buffer = buffer[start:]
+
+        while len(buffer) > max_sentence_chars and not SENTENCE_END.search(buffer):
+            yield buffer[:max_sentence_chars]
+            buffer = buffer[max_sentence_chars:]
+
+    # Same as re.split: text after the last terminator is the final piece
+    parts = SENTENCE_END.split(buffer)
+    yield from parts
+
@@ -0,0 +1,198 @@
+"""
+Response caching for the read-only routes, keyed on the database's data version.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import timezone
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import Response, make_response, request, session
+
+from ..database import DatabaseManager
+
+
+# (body, content type, custom ``X-`` headers) of a cached response
+CachedBody = Tuple[bytes, str, Dict[str, str]]
+
+# Per-request diagnostics that must not be replayed from a cached copy
+UNCACHED_HEADERS = ('X-Cache', 'X-DB-Query-Count')
+
+
+class MemoryCacheBackend:
+    """Least-recently-used cache of response bodies, local to the process."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedBody]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedBody]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedBody) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class DiskCacheBackend:
+    """Response bodies stored as files, shared by every worker process.
+
+    Keys include the data version, so entries are never updated in place:
+    files are written once (atomically, via rename) and entries for old
+    versions are pruned once the directory holds more than ``max_entries``.
+    """
+
+    def __init__(self, directory: str, max_entries: int = 1024):
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str) -> Optional[CachedBody]:
+        try:
+            with open(self._path(key), 'rb') as f:
+                header = json.loads(f.readline())
+                return f.read(), header['content_type'], header['headers']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set(self, key: str, entry: CachedBody) -> None:
+        body, content_type, headers = entry
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(json.dumps({'content_type': content_type, 'headers': headers}).encode() + b"\n")
+                f.write(body)
+            os.replace(temp_path, self._path(key))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        self._prune()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest() + '.cache')
+
+    def _prune(self) -> None:
+        """Drop the oldest entries when the directory grows past ``max_entries``."""
+        try:
+            paths = [entry.path for entry in os.scandir(self.directory) if entry.name.endswith('.cache')]
+            if len(paths) <= self.max_entries:
+                return
+            paths.sort(key=os.path.getmtime)
+            for path in paths[:len(paths) - self.max_entries]:
+                os.remove(path)
+        except OSError:
+            pass  # Another worker pruned concurrently
+
+
+class ResponseCache:
+    """Caches GET responses by route and query string for one data version.
+
+    Every response gets a strong ``ETag`` derived from the data version and
+    the request, plus ``Last-Modified`` from the last write, so clients can
+    revalidate with ``If-None-Match``/``If-Modified-Since`` and get a 304
+    without the view running at all. Complete 200 bodies are stored in the
+    backend; streamed responses only get the validators. Requests with
+    pending flash messages bypass the cache since they render per-session
+    content. Views whose output also depends on the clock (trend windows,
+    generation times) pass ``max_age``: their entries and ETags then also
+    change every ``max_age`` seconds, and they get no ``Last-Modified``.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, backend=None):
+        self.db_manager = db_manager
+        self.backend = backend or MemoryCacheBackend()
+        self.hits = 0
+        self.misses = 0
+
+    def cached(self, view: Optional[Callable] = None, max_age: Optional[int] = None) -> Callable:
+        """Decorate a view so its responses are cached and revalidated.
+
+        Use as ``@cached`` or, for time-dependent views, ``@cached(max_age=...)``.
+        """
+        if view is None:
+            return lambda view: self.cached(view, max_age)
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET' or session.get('_flashes'):
+                return view(*args, **kwargs)
+
+            version, modified = self.db_manager.get_data_version()
+            if max_age:
+                # The data version doesn't cover the clock: start a new bucket every max_age seconds
+                version = f"{version}@{int(time.time() // max_age)}"
+                modified = None
+            key = self._key(version)
+            etag = hashlib.sha256(key.encode()).hexdigest()[:32]
+
+            if self._not_modified(etag, modified):
+                response = Response(status=304)
+                return self._add_validators(response, etag, modified)
+
+            entry = self.backend.get(key)
+            if entry is not None:
+                self.hits += 1
+                body, content_type, headers = entry
+                response = Response(body, content_type=content_type, headers=headers)
+                response.headers['X-Cache'] = 'HIT'
+                return self._add_validators(response, etag, modified)
+
+            self.misses += 1
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            if not response.is_streamed:
+                headers = {name: value for name, value in response.headers.items()
+                           if name.startswith('X-') and name not in UNCACHED_HEADERS}
+                self.backend.set(key, (response.get_data(), response.content_type, headers))
+            response.headers['X-Cache'] = 'MISS'
+            return self._add_validators(response, etag, modified)
+
+        return wrapper
+
+    @staticmethod
+    def _key(version: Any) -> str:
+        """Cache key: data version, endpoint and sorted query arguments."""
+        args = sorted(request.args.items(multi=True))
+        return json.dumps([version, request.endpoint, request.view_args, args], sort_keys=True)
+
+    @staticmethod
+    def _not_modified(etag: str, modified) -> bool:
+        """Whether the request's conditional headers match the current data."""
+        if request.if_none_match:
+            return request.if_none_match.contains(etag)
+        if request.if_modified_since and modified:
+            return modified.replace(microsecond=0) <= request.if_modified_since.astimezone(timezone.utc)
+        return False
+
+    @staticmethod
+    def _add_validators(response: Response, etag: str, modified) -> Response:
+        """Attach the ETag/Last-Modified headers and require revalidation."""
+        response.set_etag(etag)
+        if modified:
+            response.last_modified = modified
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+
+def create_response_cache(db_manager: DatabaseManager, cache_dir: Optional[str] = None,
+                          max_entries: int = 256) -> ResponseCache:
+    """Build the response cache, on disk when ``cache_dir`` is set and in memory otherwise."""
+    if cache_dir:
+        return ResponseCache(db_manager, DiskCacheBackend(cache_dir, max_entries))
+    return ResponseCache(db_manager, MemoryCacheBackend(max_entries))
@@ -4,8 +4,6 @@ Web interface routes for link validation monitoring
 
 from flask import render_template, jsonify, request
 from datetime import datetime
-import json
-import os
 
 def add_link_validation_routes(app, db):
     """Add link validation routes to the Flask app."""
@@ -14,7 +12,7 @@ def add_link_validation_routes(app, db):
     def link_validation_dashboard():
         """Display link validation dashboard."""
         # Load latest validation results
-        results = load_latest_validation_results()
+        results = load_latest_validation_results(db)
         
         return render_template('admin/link_validation.html', 
                              validation_results=results,
@@ -25,7 +23,7 @@ def add_link_validation_routes(app, db):
         """API endpoint for link validation status."""
         try:
             from link_validation_integration import get_link_validation_status
-            status = get_link_validation_status()
+            status = get_link_validation_status(db)
             return jsonify(status)
         except ImportError:
             return jsonify({
@@ -38,7 +36,7 @@ def add_link_validation_routes(app, db):
         """Manually trigger link validation."""
         try:
             from link_validation_integration import run_validation_protocol
-            results = run_validation_protocol()
+            results = run_validation_protocol(db)
             return jsonify({
                 'status': 'success',
                 'message': 'Validation completed',
@@ -62,8 +60,10 @@ def add_link_validation_routes(app, db):
                 return jsonify({'error': 'Source not found'}), 404
             
             # Validate the source
-            validator = LinkValidator()
-            is_valid, status_code, error_msg = validator.validate_url(source.url)
+            validator = LinkValidator(db)
+            is_valid, status_code, error_msg, latency = validator.check_url(source.url)
+            db.record_link_check(source_id, source.url, is_valid, status_code, latency,
+                                 error_msg if not is_valid else None)
             
             return jsonify({
                 'source_id': source_id,
@@ -71,31 +71,18 @@ def add_link_validation_routes(app, db):
                 'is_valid': is_valid,
                 'status_code': status_code,
                 'error_message': error_msg if not is_valid else None,
+                'latency_ms': latency,
                 'validated_at': datetime.now().isoformat()
             })
         
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
-def load_latest_validation_results():
-    """Load the latest validation results from file."""
-    results_file = "latest_validation_results.json"
-    
-    if not os.path.exists(results_file):
-        return {
-            'status': 'no_data',
-            'message': 'No validation results available',
-            'summary': {
-                'valid_count': 0,
-                'invalid_count': 0,
-                'placeholder_count': 0,
-                'validation_date': None
-            }
-        }
-    
+def load_latest_validation_results(db):
+    """Load the latest validation run and its details from the database."""
     try:
-        with open(results_file, 'r') as f:
-            return json.load(f)
+        from link_validation_integration import load_validation_results
+        return load_validation_results(db)
     except Exception as e:
         return {
             'status': 'error',
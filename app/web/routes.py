@@ -2,15 +2,49 @@
 Flask web routes for the Trump Promises Tracker.
 """
 
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
+import json
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for, flash
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List
+from markupsafe import Markup, escape
 
-from ..database import DatabaseManager
+from ..database import DatabaseManager, StaleVersionError, HIGHLIGHT_START, HIGHLIGHT_END
 from ..models import Promise, Source, PromiseStatus, SourceType
 from ..analyzer import PromiseAnalyzer
 from config import Config
 from .link_validation_routes import add_link_validation_routes
+from .cache import create_response_cache
+
+
+# Promises serialized per chunk written to a streamed response
+STREAM_CHUNK_SIZE = 200
+
+
+def _stream_json_array(items: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """Serialize ``items`` as one JSON array, a chunk of elements at a time."""
+    yield "["
+    separator = ""
+    chunk: List[str] = []
+    for item in items:
+        chunk.append(json.dumps(item))
+        if len(chunk) >= STREAM_CHUNK_SIZE:
+            yield separator + ",".join(chunk)
+            separator, chunk = ",", []
+    if chunk:
+        yield separator + ",".join(chunk)
+    yield "]"
+
+
+def _stream_ndjson(items: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """Serialize ``items`` as newline-delimited JSON, a chunk of lines at a time."""
+    chunk: List[str] = []
+    for item in items:
+        chunk.append(json.dumps(item) + "\n")
+        if len(chunk) >= STREAM_CHUNK_SIZE:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
 
 
 def create_app() -> Flask:
@@ -18,15 +52,36 @@ def create_app() -> Flask:
     app = Flask(__name__, static_folder='static', static_url_path='/static')
     app.config.from_object(Config)
     
-    # Initialize database
-    db_manager = DatabaseManager()
-    analyzer = PromiseAnalyzer(db_manager)
+    # Initialize database (pooled: one reusable connection per worker thread)
+    db_manager = DatabaseManager(
+        timestamp_format=Config.DB_TIMESTAMP_FORMAT,
+        max_age=Config.DB_POOL_MAX_AGE,
+        health_check_interval=Config.DB_POOL_HEALTH_CHECK_INTERVAL
+    )
+    analyzer = PromiseAnalyzer(db_manager, backend=Config.ANALYTICS_BACKEND)
+    app.extensions['db_manager'] = db_manager
+    
+    # Rendered read-only pages, valid until the next write to the database
+    response_cache = create_response_cache(db_manager, Config.RESPONSE_CACHE_DIR, Config.RESPONSE_CACHE_MAX_ENTRIES)
+    app.extensions['response_cache'] = response_cache
+    
+    @app.before_request
+    def start_query_count():
+        db_manager.pool.start_query_count()
+    
+    @app.after_request
+    def add_query_count(response):
+        # Streamed bodies run their queries later and are not included
+        response.headers['X-DB-Query-Count'] = str(db_manager.pool.stop_query_count())
+        return response
     
     @app.route('/')
+    @response_cache.cached
     def index():
         """Home page with dashboard."""
-        analytics = analyzer.generate_analytics_report()
-        recent_promises = db_manager.get_all_promises()[:10]  # Get 10 most recent
+        # Summary counters plus ten indexed rows: a fixed number of queries
+        analytics = db_manager.get_analytics_data()
+        recent_promises = db_manager.recent_promises(10)
         
         return render_template('index.html', 
                              analytics=analytics,
@@ -37,7 +92,8 @@ def create_app() -> Flask:
         """List all promises with filtering options."""
         category = request.args.get('category')
         status = request.args.get('status')
-        page = int(request.args.get('page', 1))
+        tag = request.args.get('tag')
+        cursor = request.args.get('cursor')
         per_page = 20
         
         # Convert status string to enum if provided
@@ -48,25 +104,34 @@ def create_app() -> Flask:
             except ValueError:
                 status_filter = None
         
-        # Get filtered promises
-        all_promises = db_manager.get_all_promises(category=category, status=status_filter)
+        filters = {'category': category, 'status': status_filter, 'tag': tag}
         
-        # Simple pagination
-        start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
-        promises_page = all_promises[start_idx:end_idx]
+        # Pagination info; malformed or out-of-range page numbers are clamped
+        total_pages = (db_manager.count_promises(filters) + per_page - 1) // per_page
+        page = min(max(request.args.get('page', 1, type=int), 1), max(total_pages, 1))
+        
+        # Follow the cursor from the previous page when we have one; plain
+        # page-number links fall back to an offset.
+        promises_page = None
+        if cursor:
+            try:
+                promises_page = db_manager.query_promises(filters, limit=per_page, cursor=cursor)
+            except ValueError:
+                promises_page = None
+        if promises_page is None:
+            promises_page = db_manager.query_promises(filters, limit=per_page, offset=(page - 1) * per_page)
         
-        # Pagination info
-        total_pages = (len(all_promises) + per_page - 1) // per_page
         has_prev = page > 1
-        has_next = page < total_pages
+        has_next = promises_page.next_cursor is not None
         
         return render_template('promises.html',
-                             promises=promises_page,
+                             promises=promises_page.promises,
+                             next_cursor=promises_page.next_cursor,
                              categories=Config.PROMISE_CATEGORIES,
                              statuses=[s.value for s in PromiseStatus],
                              current_category=category,
                              current_status=status,
+                             current_tag=tag,
                              page=page,
                              total_pages=total_pages,
                              has_prev=has_prev,
@@ -83,8 +148,8 @@ def create_app() -> Flask:
         # Get progress updates
         progress_updates = db_manager.get_progress_updates(promise_id)
         
-        # Get similar promises
-        similar_promises = analyzer.find_similar_promises(promise, threshold=0.2)[:5]
+        # Related promises (explicit links and stored similarity edges), two hops out
+        similar_promises = db_manager.get_related([promise_id], depth=2, limit=5)
         
         # Analyze promise complexity
         complexity_analysis = analyzer.analyze_promise_complexity(promise)
@@ -96,45 +161,21 @@ def create_app() -> Flask:
                              complexity=complexity_analysis)
     
     @app.route('/analytics')
+    @response_cache.cached(max_age=PromiseAnalyzer.DASHBOARD_CACHE_SECONDS)
     def analytics():
         """Analytics dashboard."""
-        # Get analytics data
+        # Counters from the aggregates table, distributions and trends from one SQL pass
         analytics_data = db_manager.get_analytics_data()
-        trends = analyzer.analyze_promise_trends()
-        
-        # Get all promises for additional analysis
-        all_promises = db_manager.get_all_promises()
-        recommendations = analyzer.generate_priority_recommendations(all_promises)[:10]
-        
-        # Get recent promises (last 10)
-        recent_promises = sorted(all_promises, key=lambda p: p.date_updated or p.date_made, reverse=True)[:10]
-        
-        # Calculate priority distribution
-        priority_data = {}
-        for i in range(1, 6):
-            priority_data[f'Priority {i}'] = sum(1 for p in all_promises if p.priority == i)
-        
-        # Calculate progress distribution
-        progress_data = {
-            '0%': sum(1 for p in all_promises if p.progress_percentage == 0),
-            '1-25%': sum(1 for p in all_promises if 0 < p.progress_percentage <= 25),
-            '26-50%': sum(1 for p in all_promises if 25 < p.progress_percentage <= 50),
-            '51-75%': sum(1 for p in all_promises if 50 < p.progress_percentage <= 75),
-            '76-99%': sum(1 for p in all_promises if 75 < p.progress_percentage < 100),
-            '100%': sum(1 for p in all_promises if p.progress_percentage == 100)
-        }
-        
-        # Count high priority promises
-        high_priority_count = sum(1 for p in all_promises if p.priority == 5)
+        dashboard = analyzer.compute_dashboard_analytics()
+        recent_promises = db_manager.recent_promises(10, include_sources=False)
         
         return render_template('analytics.html',
                              analytics_data=analytics_data,
-                             trends=trends,
-                             recommendations=recommendations,
+                             trends=dashboard['trends'],
                              recent_promises=recent_promises,
-                             priority_data=priority_data,
-                             progress_data=progress_data,
-                             high_priority_count=high_priority_count)
+                             priority_data=dashboard['priority_data'],
+                             progress_data=dashboard['progress_data'],
+                             high_priority_count=dashboard['high_priority_count'])
     
     @app.route('/add_promise', methods=['GET', 'POST'])
     def add_promise():
@@ -182,10 +223,20 @@ def create_app() -> Flask:
         return render_template('add_promise.html', categories=Config.PROMISE_CATEGORIES)
     
     @app.route('/api/promises')
+    @response_cache.cached
     def api_promises():
-        """API endpoint to get promises as JSON."""
+        """API endpoint to get promises as JSON.
+        
+        Without ``limit`` every matching promise is streamed, as a JSON array
+        or, with ``format=ndjson``, one object per line. With ``limit`` the
+        response is one keyset page; the cursor for the next page is returned
+        in the ``X-Next-Cursor`` header. ``fields`` (comma-separated) limits
+        the keys of each promise; ``tag`` keeps promises carrying that tag.
+        """
         category = request.args.get('category')
         status = request.args.get('status')
+        tag = request.args.get('tag')
+        fields = [field.strip() for field in request.args.get('fields', '').split(',') if field.strip()]
         
         status_filter = None
         if status:
@@ -194,10 +245,50 @@ def create_app() -> Flask:
             except ValueError:
                 pass
         
-        promises = db_manager.get_all_promises(category=category, status=status_filter)
-        return jsonify([promise.to_dict() for promise in promises])
+        filters = {'category': category, 'status': status_filter, 'tag': tag}
+        limit = request.args.get('limit', type=int)
+        if limit is None:
+            try:
+                promises = db_manager.iter_promise_dicts(filters, fields)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            
+            if request.args.get('format') == 'ndjson':
+                return Response(_stream_ndjson(promises), mimetype='application/x-ndjson')
+            return Response(_stream_json_array(promises), mimetype='application/json')
+        
+        unknown = [field for field in fields if field not in DatabaseManager.PROMISE_FIELDS]
+        if unknown:
+            return jsonify({'error': f"Unknown promise fields: {', '.join(unknown)}"}), 400
+        
+        try:
+            promises_page = db_manager.query_promises(
+                filters,
+                order=request.args.get('order', '-date_updated'),
+                limit=min(max(limit, 1), 1000),
+                cursor=request.args.get('cursor')
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        promise_dicts = [promise.to_dict() for promise in promises_page.promises]
+        if fields:
+            promise_dicts = [{field: promise[field] for field in fields} for promise in promise_dicts]
+        response = jsonify(promise_dicts)
+        if promises_page.next_cursor:
+            response.headers['X-Next-Cursor'] = promises_page.next_cursor
+        return response
+    
+    @app.route('/api/tags')
+    @response_cache.cached
+    def api_tags():
+        """API endpoint for tag usage counts, most used first (``limit`` caps the list)."""
+        limit = request.args.get('limit', type=int)
+        tag_counts = db_manager.get_tag_counts(limit)
+        return jsonify([{'tag': tag, 'count': count} for tag, count in tag_counts.items()])
     
     @app.route('/api/analytics')
+    @response_cache.cached(max_age=PromiseAnalyzer.DASHBOARD_CACHE_SECONDS)
     def api_analytics():
         """API endpoint to get analytics data as JSON."""
         analytics_data = analyzer.generate_analytics_report()
@@ -211,7 +302,6 @@ def create_app() -> Flask:
             return jsonify({'error': 'No data provided'}), 400
         
         new_status = data.get('status')
-        notes = data.get('notes', '')
         
         if not new_status:
             return jsonify({'error': 'Status is required'}), 400
@@ -221,16 +311,7 @@ def create_app() -> Flask:
         except ValueError:
             return jsonify({'error': 'Invalid status'}), 400
         
-        promise = db_manager.get_promise(promise_id)
-        if not promise:
-            return jsonify({'error': 'Promise not found'}), 404
-        
-        promise.update_status(status_enum, notes)
-        
-        if db_manager.update_promise(promise):
-            return jsonify({'success': True, 'message': 'Status updated successfully'})
-        else:
-            return jsonify({'error': 'Failed to update status'}), 500
+        return _patch_promise(promise_id, {'status': status_enum}, data, 'Status updated successfully')
     
     @app.route('/api/promise/<int:promise_id>/update_progress', methods=['POST'])
     def api_update_progress(promise_id: int):
@@ -240,7 +321,6 @@ def create_app() -> Flask:
             return jsonify({'error': 'No data provided'}), 400
         
         progress = data.get('progress')
-        notes = data.get('notes', '')
         
         if progress is None:
             return jsonify({'error': 'Progress is required'}), 400
@@ -252,21 +332,52 @@ def create_app() -> Flask:
         except ValueError:
             return jsonify({'error': 'Invalid progress value'}), 400
         
-        promise = db_manager.get_promise(promise_id)
-        if not promise:
-            return jsonify({'error': 'Promise not found'}), 404
+        return _patch_promise(promise_id, {'progress_percentage': progress}, data, 'Progress updated successfully')
+    
+    @app.route('/api/promise/<int:promise_id>', methods=['PATCH'])
+    def api_patch_promise(promise_id: int):
+        """API endpoint to change some fields of a promise.
+        
+        The JSON body maps promise fields to new values; ``version`` and
+        ``notes`` are not fields but the expected version and the note for
+        the change history.
+        """
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+        
+        changes = {field: value for field, value in data.items() if field not in ('version', 'notes')}
+        if not changes:
+            return jsonify({'error': 'No fields to change'}), 400
+        return _patch_promise(promise_id, changes, data, 'Promise updated successfully')
+    
+    def _patch_promise(promise_id: int, changes: Dict[str, Any], data: Dict[str, Any], message: str):
+        """Apply a patch from an API request body, answering 404/409/400 as appropriate.
         
-        old_progress = promise.progress_percentage
-        promise.progress_percentage = progress
-        promise.date_updated = datetime.now()
+        A ``version`` in the body makes the write conditional: if the promise
+        has been changed since, nothing is written and 409 is returned with
+        the current version.
+        """
+        expected_version = data.get('version')
+        if expected_version is not None and (isinstance(expected_version, bool) or not isinstance(expected_version, int)):
+            return jsonify({'error': 'Version must be an integer'}), 400
         
-        if notes:
-            promise.notes += f"\n[{datetime.now().strftime('%Y-%m-%d')}] Progress updated from {old_progress}% to {progress}%: {notes}"
+        try:
+            version = db_manager.patch_promise(promise_id, changes, expected_version, data.get('notes') or "")
+        except StaleVersionError as e:
+            return jsonify({'error': str(e), 'current_version': e.current_version}), 409
+        except (ValueError, TypeError) as e:
+            return jsonify({'error': str(e)}), 400
         
-        if db_manager.update_promise(promise):
-            return jsonify({'success': True, 'message': 'Progress updated successfully'})
-        else:
-            return jsonify({'error': 'Failed to update progress'}), 500
+        if version is None:
+            return jsonify({'error': 'Promise not found'}), 404
+        return jsonify({'success': True, 'message': message, 'version': version})
+    
+    @app.route('/api/promise/<int:promise_id>/events')
+    def api_promise_events(promise_id: int):
+        """API endpoint for a promise's status/progress history, newest first."""
+        events = db_manager.get_promise_events(promise_id, kind=request.args.get('kind'))
+        return jsonify([event.to_dict() for event in events])
     
     @app.route('/search')
     def search():
@@ -275,29 +386,29 @@ def create_app() -> Flask:
         if not query:
             return render_template('search.html', promises=[], query='')
         
-        # Simple text search (could be improved with full-text search)
-        all_promises = db_manager.get_all_promises()
-        matching_promises = [
-            promise for promise in all_promises
-            if query.lower() in promise.text.lower() or 
-               query.lower() in promise.category.lower() or
-               any(query.lower() in tag.lower() for tag in promise.tags)
-        ]
+        results = db_manager.search_promises(query, limit=100)
+        snippets = {result.promise.id: _highlight(result.snippet) for result in results}
         
-        return render_template('search.html', promises=matching_promises, query=query)
+        return render_template('search.html',
+                             promises=[result.promise for result in results],
+                             snippets=snippets,
+                             query=query)
     
     @app.route('/categories')
+    @response_cache.cached
     def categories():
         """Show promises grouped by category."""
         analytics_data = db_manager.get_analytics_data()
+        # First 5 promises of every category from one grouped query
+        promises_by_category = db_manager.recent_promises_by_category(5)
         category_data = []
         
         for category, count in analytics_data['promises_by_category'].items():
-            category_promises = db_manager.get_all_promises(category=category)
             category_data.append({
                 'name': category,
                 'count': count,
-                'promises': category_promises[:5]  # Show first 5 promises
+                'fulfillment_rate': analytics_data['fulfillment_by_category'][category],
+                'promises': promises_by_category.get(category, [])
             })
         
         # Sort by count
@@ -319,3 +430,9 @@ def create_app() -> Flask:
     add_link_validation_routes(app, db_manager)
     
     return app
+
+
+def _highlight(snippet: str) -> Markup:
+    """Escape a search snippet and turn its match markers into <mark> tags."""
+    escaped = str(escape(snippet))
+    return Markup(escaped.replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_END, '</mark>'))
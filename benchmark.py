@@ -0,0 +1,576 @@
+"""
+Performance benchmarks for the Trump Promises Tracker.
+
+Each command builds a throwaway database of synthetic promises so the
+numbers are independent of the real data set. Run with:
+
+    python benchmark.py --help
+"""
+
+import os
+import sys
+import json
+import math
+import gc
+import time
+import random
+import tracemalloc
+import dataclasses
+import tempfile
+from contextlib import contextmanager
+from unittest import mock
+from datetime import datetime, timedelta
+
+import click
+
+# Add the project root to sys.path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.analyzer import PromiseAnalyzer
+from app.database import DatabaseManager
+from app.models import Promise, PromiseStatus, Source, SourceType
+from app.scraper import PromiseScraper
+from config import Config
+
+
+WORDS = [
+    'build', 'wall', 'border', 'tax', 'cut', 'jobs', 'economy', 'trade', 'deal',
+    'china', 'energy', 'oil', 'drill', 'healthcare', 'veterans', 'military',
+    'day', 'one', 'first', 'end', 'inflation', 'prices', 'manufacturing', 'tariffs',
+    'american', 'workers', 'deport', 'crime', 'police', 'schools', 'freedom',
+]
+
+
+class CountingDatabaseManager(DatabaseManager):
+    """DatabaseManager that counts every SQL statement it executes."""
+
+    query_count = 0
+
+    @contextmanager
+    def get_connection(self):
+        with super().get_connection() as conn:
+            conn.set_trace_callback(self._count)
+            try:
+                yield conn
+            finally:
+                conn.set_trace_callback(None)
+
+    def _count(self, statement):
+        CountingDatabaseManager.query_count += 1
+
+
+def synthetic_text(rng: random.Random) -> str:
+    """A few common policy words mixed with a long tail of rarer ones."""
+    words = [rng.choice(WORDS) for _ in range(rng.randint(2, 5))]
+    words += [f"term{int(rng.paretovariate(1.0)) % 50000}" for _ in range(rng.randint(4, 15))]
+    rng.shuffle(words)
+    return " ".join(words)
+
+
+def seed_database(db: DatabaseManager, count: int, sources_per_promise: int = 2,
+                  index_similarity: bool = True) -> None:
+    """Insert ``count`` synthetic promises with shared and unique sources.
+
+    With ``sources_per_promise=0`` only the promises table is filled.
+    """
+    rng = random.Random(42)
+    now = datetime.now()
+    statuses = [s.value for s in PromiseStatus]
+
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+
+        if sources_per_promise:
+            source_rows = []
+            for i in range(count):
+                source_rows.append((
+                    f"https://example.org/source/{i}", f"Source {i}", SourceType.OTHER.value,
+                    now.isoformat(), "Synthetic source", 0.9, now.isoformat()
+                ))
+            cursor.executemany("""
+                INSERT INTO sources (url, title, source_type, date, description, reliability_score, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, source_rows)
+            first_source_id = cursor.execute("SELECT MIN(id) FROM sources").fetchone()[0]
+
+        promise_rows = []
+        for i in range(count):
+            updated = now - timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+            promise_rows.append((
+                synthetic_text(rng),
+                rng.choice(Config.PROMISE_CATEGORIES),
+                rng.choice(statuses),
+                rng.randint(1, 5),
+                db._ts(updated - timedelta(days=400)),
+                db._ts(updated),
+                json.dumps(rng.sample(WORDS, 3)),
+                "",
+                float(rng.choice([0, 10, 25, 50, 75, 100])),
+                json.dumps([]),
+                db._ts(updated - timedelta(days=30)),
+            ))
+        cursor.executemany("""
+            INSERT INTO promises (text, category, status, priority, date_made, date_updated,
+                                tags, notes, progress_percentage, related_promises, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, promise_rows)
+        first_promise_id = cursor.execute("SELECT MIN(id) FROM promises").fetchone()[0]
+
+        if sources_per_promise:
+            link_rows = []
+            for i in range(count):
+                promise_id = first_promise_id + i
+                link_rows.append((promise_id, first_source_id + i))
+                for _ in range(sources_per_promise - 1):
+                    link_rows.append((promise_id, first_source_id + rng.randrange(count)))
+            cursor.executemany(
+                "INSERT OR IGNORE INTO promise_sources (promise_id, source_id) VALUES (?, ?)", link_rows
+            )
+        conn.commit()
+
+    # Raw inserts bypass add_promise, so index the new rows explicitly
+    if index_similarity:
+        db.rebuild_similarity_index()
+
+
+@contextmanager
+def temporary_database(count: int):
+    """Yield a CountingDatabaseManager over a freshly seeded temp database."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = CountingDatabaseManager(os.path.join(tmp_dir, 'bench.db'))
+        seed_database(db, count)
+        try:
+            yield db
+        finally:
+            db.close()
+
+
+def legacy_get_all_promises(db: DatabaseManager):
+    """The original per-promise source loader, kept as a baseline."""
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM promises ORDER BY date_updated DESC")
+        promises = []
+        for row in cursor.fetchall():
+            promise = db._row_to_promise(row)
+            cursor.execute("""
+                SELECT s.* FROM sources s
+                INNER JOIN promise_sources ps ON s.id = ps.source_id
+                WHERE ps.promise_id = ?
+            """, (promise.id,))
+            promise.sources = [db._row_to_source(source_row) for source_row in cursor.fetchall()]
+            promises.append(promise)
+        return promises
+
+
+class LegacyKeywordScorer:
+    """The original scraper keyword checks (one substring scan per keyword), kept as a baseline."""
+    
+    def __init__(self, scraper: PromiseScraper):
+        self.scraper = scraper
+    
+    def is_likely_promise(self, text):
+        text_lower = text.lower()
+        has_promise_keywords = any(keyword in text_lower for keyword in self.scraper.promise_keywords)
+        future_indicators = ['will', 'going to', 'plan to', 'intend to', 'shall']
+        has_future_tense = any(indicator in text_lower for indicator in future_indicators)
+        return has_promise_keywords and has_future_tense and len(text.split()) >= 5
+    
+    def confidence(self, text):
+        score = 0.0
+        text_lower = text.lower()
+        keyword_matches = sum(1 for keyword in self.scraper.promise_keywords if keyword in text_lower)
+        score += min(keyword_matches * 0.2, 0.6)
+        if any(c in text_lower for c in ['pledge', 'promise', 'guarantee', 'commit', 'swear']):
+            score += 0.3
+        if any(a in text_lower for a in ['build', 'create', 'eliminate', 'reduce', 'increase', 'implement']):
+            score += 0.2
+        if any(v in text_lower for v in ['maybe', 'possibly', 'might', 'could', 'probably']):
+            score -= 0.2
+        return min(max(score, 0.0), 1.0)
+    
+    def categorize(self, text):
+        text_lower = text.lower()
+        category_scores = {}
+        for category, keywords in self.scraper.category_keywords.items():
+            score = sum(1 for keyword in keywords if keyword in text_lower)
+            if score > 0:
+                category_scores[category] = score
+        return max(category_scores, key=category_scores.get) if category_scores else 'Other'
+    
+    def tags(self, text):
+        tags = []
+        text_lower = text.lower()
+        if 'tax' in text_lower:
+            tags.append('taxes')
+        if 'job' in text_lower:
+            tags.append('employment')
+        if 'border' in text_lower or 'wall' in text_lower:
+            tags.append('border-security')
+        if 'health' in text_lower:
+            tags.append('healthcare')
+        if 'trade' in text_lower:
+            tags.append('trade')
+        if 'energy' in text_lower:
+            tags.append('energy')
+        if any(phrase in text_lower for phrase in ['day one', 'first day', 'immediately']):
+            tags.append('immediate')
+        if any(phrase in text_lower for phrase in ['100 days', 'first 100']):
+            tags.append('100-days')
+        return tags
+
+
+def legacy_dashboard_analytics(db: DatabaseManager, days_back: int, now: datetime):
+    """The original analytics page figures: Python passes over every hydrated promise."""
+    promises = db.get_all_promises(include_sources=False)
+    cutoff = now - timedelta(days=days_back)
+    recent = [p for p in promises if p.date_updated >= cutoff]
+    older = [p for p in promises if p.date_updated < cutoff]
+    recent_avg = sum(p.progress_percentage for p in recent) / len(recent) if recent else 0
+    older_avg = sum(p.progress_percentage for p in older) / len(older) if older else 0
+
+    category_activity = {}
+    for promise in recent:
+        category_activity[promise.category] = category_activity.get(promise.category, 0) + 1
+
+    fulfilled = [PromiseStatus.FULFILLED, PromiseStatus.PARTIALLY_FULFILLED]
+    return {
+        'trends': {
+            'new_promises': len([p for p in recent if p.created_at >= cutoff]),
+            'status_changes': len(recent),
+            'category_activity': category_activity,
+            'progress_trends': {
+                'recent_average_progress': recent_avg,
+                'older_average_progress': older_avg,
+                'progress_change': recent_avg - older_avg
+            },
+            'fulfillment_velocity': len([p for p in recent if p.status in fulfilled]) / days_back
+        },
+        'priority_data': {f'Priority {i}': sum(1 for p in promises if p.priority == i) for i in range(1, 6)},
+        'progress_data': {
+            '0%': sum(1 for p in promises if p.progress_percentage == 0),
+            '1-25%': sum(1 for p in promises if 0 < p.progress_percentage <= 25),
+            '26-50%': sum(1 for p in promises if 25 < p.progress_percentage <= 50),
+            '51-75%': sum(1 for p in promises if 50 < p.progress_percentage <= 75),
+            '76-99%': sum(1 for p in promises if 75 < p.progress_percentage < 100),
+            '100%': sum(1 for p in promises if p.progress_percentage == 100)
+        },
+        'high_priority_count': sum(1 for p in promises if p.priority == 5)
+    }
+
+
+def assert_same_analytics(expected, actual, path="result"):
+    """Compare analytics results: counts exactly, floats up to summation order."""
+    if isinstance(expected, dict):
+        assert expected.keys() == actual.keys(), f"{path}: {sorted(expected)} != {sorted(actual)}"
+        for key in expected:
+            assert_same_analytics(expected[key], actual[key], f"{path}.{key}")
+    elif isinstance(expected, float) or isinstance(actual, float):
+        assert math.isclose(expected, actual, rel_tol=1e-9, abs_tol=1e-9), f"{path}: {expected} != {actual}"
+    else:
+        assert expected == actual, f"{path}: {expected} != {actual}"
+
+
+def synthetic_transcript(rng: random.Random, sentences: int):
+    """Rally-style sentences: mostly filler, some promise and policy language."""
+    filler = ('we', 'the', 'people', 'folks', 'believe', 'me', 'tremendous', 'great', 'country',
+              'nobody', 'has', 'ever', 'seen', 'anything', 'like', 'it', 'they', 'said', 'and', 'our')
+    for _ in range(sentences):
+        words = [rng.choice(filler) for _ in range(rng.randint(6, 30))]
+        for _ in range(rng.randint(0, 3)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(WORDS))
+        if rng.random() < 0.4:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(['will', 'we will', "we're going to", 'maybe']))
+        yield " ".join(words).capitalize()
+
+
+def measure(db: CountingDatabaseManager, func):
+    """Return (result, query_count, seconds) for one call of ``func``."""
+    CountingDatabaseManager.query_count = 0
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    return result, CountingDatabaseManager.query_count, elapsed
+
+
+def unslotted(cls):
+    """A plain ``__dict__``-based copy of a slotted model dataclass, as a baseline."""
+    specs = [
+        (f.name, f.type, dataclasses.field(default=f.default, default_factory=f.default_factory))
+        for f in dataclasses.fields(cls)
+    ]
+    methods = {name: value for name, value in vars(cls).items()
+               if callable(value) and not name.startswith('__')}
+    return dataclasses.make_dataclass(cls.__name__, specs, namespace=methods)
+
+
+def retained_memory(func):
+    """Return (result, bytes still allocated by ``func``'s result, seconds).
+
+    Time is measured in a separate untraced call, since tracemalloc slows
+    allocation-heavy code down considerably.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, retained, elapsed
+
+
+@click.group()
+def cli():
+    """Trump Promises Tracker benchmarks"""
+    pass
+
+
+@cli.command()
+@click.option('--sizes', default='1000,10000,100000', help='Comma-separated promise counts')
+def hydration(sizes: str):
+    """Compare N+1 and batched source hydration in get_all_promises."""
+    click.echo(f"{'promises':>10} {'loader':>8} {'queries':>9} {'seconds':>9}")
+    for size in [int(s) for s in sizes.split(',')]:
+        with temporary_database(size) as db:
+            legacy, legacy_queries, legacy_time = measure(db, lambda: legacy_get_all_promises(db))
+            batched, batched_queries, batched_time = measure(db, db.get_all_promises)
+
+            assert len(legacy) == len(batched) == size
+            click.echo(f"{size:>10} {'legacy':>8} {legacy_queries:>9} {legacy_time:>9.3f}")
+            click.echo(f"{size:>10} {'batched':>8} {batched_queries:>9} {batched_time:>9.3f}")
+
+
+@cli.command()
+@click.option('--sizes', default='10000,100000', help='Comma-separated promise counts')
+@click.option('--repeat', type=int, default=20, help='Runs per query')
+def search(sizes: str, repeat: int):
+    """Time FTS5 search_promises against the old in-Python substring scan."""
+    queries = ['border', 'tax cut', 'manufact', 'china tariffs', 'veterans day one']
+    click.echo(f"{'promises':>10} {'query':>18} {'hits':>6} {'fts ms':>8} {'scan ms':>8}")
+    for size in [int(s) for s in sizes.split(',')]:
+        with temporary_database(size) as db:
+            for query in queries:
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    hits = db.search_promises(query, limit=20)
+                fts_ms = (time.perf_counter() - start) / repeat * 1000
+
+                start = time.perf_counter()
+                all_promises = db.get_all_promises()
+                matches = [p for p in all_promises if query.lower() in p.text.lower()]
+                scan_ms = (time.perf_counter() - start) * 1000
+
+                click.echo(f"{size:>10} {query:>18} {len(hits):>6} {fts_ms:>8.2f} {scan_ms:>8.1f}")
+
+
+@cli.command()
+@click.option('--sentences', type=int, default=200000, help='Transcript sentences to classify')
+@click.option('--repeat', type=int, default=3, help='Runs per matcher (best is reported)')
+def keywords(sentences: int, repeat: int):
+    """Time scraper promise detection/scoring/tagging: per-keyword scans vs. one automaton pass."""
+    corpus = list(synthetic_transcript(random.Random(42), sentences))
+    legacy = LegacyKeywordScorer(PromiseScraper())
+    
+    def classify_legacy():
+        return [(legacy.confidence(s), legacy.categorize(s), legacy.tags(s))
+                for s in corpus if legacy.is_likely_promise(s)]
+    
+    def classify_automaton():
+        # A fresh scraper per run, so no run profits from an earlier one's caches
+        scraper = PromiseScraper()
+        return [(scraper._calculate_promise_confidence(s), scraper.categorize_promise(s), scraper._extract_tags(s))
+                for s in corpus if scraper._is_likely_promise(s)]
+    
+    def best_of(func):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - start)
+        return result, min(timings)
+    
+    legacy_results, legacy_time = best_of(classify_legacy)
+    automaton_results, automaton_time = best_of(classify_automaton)
+    scraper = PromiseScraper()
+    
+    assert legacy_results == automaton_results
+    click.echo(f"{sentences} sentences, {len(legacy_results)} likely promises "
+               f"({len(scraper.keyword_matcher.keywords)} keywords)")
+    click.echo(f"{'matcher':>10} {'seconds':>9} {'us/sentence':>12}")
+    for name, elapsed in [('legacy', legacy_time), ('automaton', automaton_time)]:
+        click.echo(f"{name:>10} {elapsed:>9.3f} {elapsed / sentences * 1e6:>12.2f}")
+
+
+@cli.command()
+@click.option('--sizes', default='100000,1000000', help='Comma-separated promise counts')
+@click.option('--legacy-max', type=int, default=200000,
+              help='Largest size to also run the hydrate-everything Python baseline on')
+@click.option('--timestamp-format', type=click.Choice(['iso', 'epoch_us']), default='iso',
+              help='Storage format of the benchmark database\'s timestamps')
+def analytics(sizes: str, legacy_max: int, timestamp_format: str):
+    """Time analytics page figures: Python loops vs. SQL aggregates vs. pandas."""
+    from app.analytics_frame import FrameAnalytics, pandas_available
+    if not pandas_available():
+        raise click.ClickException("pandas is not installed")
+
+    click.echo(f"{'promises':>10} {'backend':>16} {'seconds':>9}")
+    for size in [int(s) for s in sizes.split(',')]:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db = DatabaseManager(os.path.join(tmp_dir, 'bench.db'), timestamp_format=timestamp_format)
+            seed_database(db, size, sources_per_promise=0, index_similarity=False)
+            now = datetime.now()
+            sql_analyzer = PromiseAnalyzer(db)
+            frame = FrameAnalytics(db)
+
+            timings = []
+            if size <= legacy_max:
+                start = time.perf_counter()
+                legacy = legacy_dashboard_analytics(db, 30, now)
+                timings.append(('python', time.perf_counter() - start))
+
+            start = time.perf_counter()
+            sql = sql_analyzer.compute_dashboard_analytics(30, now)
+            sql_series = sql_analyzer.monthly_series()
+            timings.append(('sql', time.perf_counter() - start))
+
+            start = time.perf_counter()
+            frame.frame
+            timings.append(('pandas load', time.perf_counter() - start))
+            start = time.perf_counter()
+            vectorized = frame.compute_dashboard_analytics(30, now)
+            vectorized_series = frame.monthly_series()
+            timings.append(('pandas compute', time.perf_counter() - start))
+
+            if size <= legacy_max:
+                # Status changes now come from promise_events; the legacy figure
+                # counted every promise updated in the window
+                legacy['trends']['status_changes'] = sql['trends']['status_changes']
+                assert_same_analytics(legacy, sql)
+            assert_same_analytics(sql, vectorized)
+            assert sql_series == vectorized_series
+            assert sql_analyzer.db_manager.get_analytics_data()['promises_by_status'] == \
+                dict(sorted(frame.count_by_status().items()))
+
+            for name, elapsed in timings:
+                click.echo(f"{size:>10} {name:>16} {elapsed:>9.3f}")
+            db.close()
+
+
+@cli.command()
+@click.option('--size', type=int, default=100000, help='Promise count')
+def memory(size: int):
+    """Retained memory of loaded promises: plain vs. slotted dataclasses vs. lazy rows."""
+    plain_classes = {'Promise': unslotted(Promise), 'Source': unslotted(Source)}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(os.path.join(tmp_dir, 'bench.db'))
+        seed_database(db, size, index_similarity=False)
+
+        def plain(include_sources):
+            # get_all_promises builds models through the names in app.database
+            with mock.patch.multiple('app.database', **plain_classes):
+                return db.get_all_promises(include_sources=include_sources)
+
+        cases = [
+            ('dataclass', 'yes', lambda: plain(True)),
+            ('slots', 'yes', lambda: db.get_all_promises()),
+            ('dataclass', 'no', lambda: plain(False)),
+            ('slots', 'no', lambda: db.get_all_promises(include_sources=False)),
+            ('rows', 'no', db.get_promise_rows),
+        ]
+
+        click.echo(f"{size} promises")
+        click.echo(f"{'model':>10} {'sources':>8} {'MiB':>8} {'bytes/promise':>14} {'seconds':>9}")
+        for name, with_sources, load in cases:
+            result, retained, elapsed = retained_memory(load)
+            assert len(result) == size
+            assert (name == 'dataclass') == hasattr(result[0], '__dict__')
+            del result
+            click.echo(f"{name:>10} {with_sources:>8} {retained / 2**20:>8.1f} "
+                       f"{retained / size:>14.0f} {elapsed:>9.3f}")
+        db.close()
+
+
+@cli.command()
+@click.option('--size', type=int, default=100000, help='Promise count')
+@click.option('--repeat', type=int, default=20, help='Runs per list page')
+def timestamps(size: int, repeat: int):
+    """Promise reads with ISO text vs. epoch-microsecond timestamps."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'bench.db')
+        db = DatabaseManager(path)
+        seed_database(db, size, index_similarity=False)
+
+        def read_all():
+            return [promise.to_dict() for promise in db.get_all_promises(include_sources=False)]
+
+        def list_pages():
+            # The list endpoints: keyset pages of lazy rows serialized to dicts
+            page, dicts = db.query_promises(limit=100), []
+            for _ in range(repeat):
+                dicts += [promise.to_dict() for promise in page.promises]
+                page = db.query_promises(limit=100, cursor=page.next_cursor)
+            return dicts
+
+        def timed(func):
+            start = time.perf_counter()
+            result = func()
+            return result, time.perf_counter() - start
+
+        click.echo(f"{size} promises")
+        click.echo(f"{'format':>10} {'MiB':>7} {'hydrate s':>10} {'pages ms':>9} {'dicts s':>8}")
+        results = []
+        for timestamp_format in ('iso', 'epoch_us'):
+            if timestamp_format != db.timestamp_format:
+                _, elapsed = timed(lambda: db.migrate_timestamps(timestamp_format))
+                click.echo(f"migrated to {timestamp_format} in {elapsed:.3f}s")
+                with db.get_connection() as conn:
+                    conn.execute("VACUUM")
+            _, hydrate_time = timed(lambda: db.get_all_promises(include_sources=False))
+            pages, pages_time = timed(list_pages)
+            dicts, dicts_time = timed(read_all)
+            results.append((pages, dicts))
+            click.echo(f"{timestamp_format:>10} {os.path.getsize(path) / 2**20:>7.1f} {hydrate_time:>10.3f} "
+                       f"{pages_time * 1000:>9.1f} {dicts_time:>8.3f}")
+
+        assert results[0] == results[1]
+        db.close()
+
+
+@cli.command()
+@click.option('--sizes', default='5000,50000,200000', help='Comma-separated promise counts')
+@click.option('--adds', type=int, default=20, help='Promises added (and linked) per size')
+@click.option('--rebuild-max', type=int, default=50000, help='Largest size to also time rebuild_relations on')
+def relations(sizes: str, adds: int, rebuild_max: int):
+    """Time similarity linking per written promise and a full rebuild_relations."""
+    click.echo(f"{'promises':>10} {'add ms':>8} {'rebuild s':>10} {'edges':>9}")
+    for size in [int(s) for s in sizes.split(',')]:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db = DatabaseManager(os.path.join(tmp_dir, 'bench.db'))
+            seed_database(db, size, sources_per_promise=0)
+            rng = random.Random(size)
+
+            start = time.perf_counter()
+            for _ in range(adds):
+                db.add_promise(Promise(text=synthetic_text(rng), category='Other'))
+            add_ms = (time.perf_counter() - start) / adds * 1000
+
+            rebuild, edges = "-", "-"
+            if size <= rebuild_max:
+                start = time.perf_counter()
+                edges = db.rebuild_relations()
+                rebuild = f"{time.perf_counter() - start:.1f}"
+
+            click.echo(f"{size:>10} {add_ms:>8.2f} {rebuild:>10} {edges:>9}")
+            db.close()
+
+
+if __name__ == '__main__':
+    cli()
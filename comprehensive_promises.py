@@ -493,7 +493,7 @@ def add_comprehensive_promises():
     ]
     
     # Add all comprehensive promises to database
-    added_promises = []
+    promises = []
     for promise_data in comprehensive_promises:
         # Create sources
         sources = []
@@ -522,9 +522,13 @@ def add_comprehensive_promises():
             date_updated=datetime.now() - timedelta(days=50)   # Simulate recent updates
         )
         
-        promise_id = db_manager.add_promise(promise)
-        added_promises.append(promise_id)
-        print(f"Added promise {promise_id}: {promise.text[:60]}...")
+        promises.append(promise)
+    
+    # One transaction for the whole set
+    db_manager.bulk_add_promises(promises, link_related=True)
+    added_promises = [promise.id for promise in promises]
+    for promise in promises:
+        print(f"Added promise {promise.id}: {promise.text[:60]}...")
     
     print(f"\n✅ Added {len(added_promises)} comprehensive campaign promises!")
     return added_promises
@@ -9,6 +9,17 @@ class Config:
     
     # Database
     DATABASE_URL = os.environ.get('DATABASE_URL', os.path.join(PROJECT_ROOT, 'data', 'promises.db'))
+    DB_POOL_MAX_AGE = int(os.environ.get('DB_POOL_MAX_AGE', 3600))  # Recycle connections after N seconds
+    DB_POOL_HEALTH_CHECK_INTERVAL = int(os.environ.get('DB_POOL_HEALTH_CHECK_INTERVAL', 30))  # Ping idle connections
+    # Timestamp storage of a newly created database: 'iso' (text) or 'epoch_us' (integer microseconds)
+    DB_TIMESTAMP_FORMAT = os.environ.get('DB_TIMESTAMP_FORMAT', 'iso')
+    
+    # Response cache for read-only pages; set a directory to share it between worker processes
+    RESPONSE_CACHE_DIR = os.environ.get('RESPONSE_CACHE_DIR')
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 256))
+    
+    # Analytics backend: 'sql' (aggregate queries) or 'pandas' (vectorized, needs pandas)
+    ANALYTICS_BACKEND = os.environ.get('ANALYTICS_BACKEND', 'sql')
     
     # Flask settings
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
@@ -23,6 +34,16 @@ class Config:
     REQUEST_DELAY = 1  # Delay between requests in seconds
     MAX_REQUESTS_PER_MINUTE = 30
     
+    # Link validation settings
+    LINK_CHECK_MAX_WORKERS = int(os.environ.get('LINK_CHECK_MAX_WORKERS', 16))  # Concurrent checks overall
+    LINK_CHECK_TIMEOUT = float(os.environ.get('LINK_CHECK_TIMEOUT', 10))  # Read timeout in seconds
+    LINK_CHECK_CONNECT_TIMEOUT = float(os.environ.get('LINK_CHECK_CONNECT_TIMEOUT', 5))
+    LINK_CHECK_HOST_RATE = float(os.environ.get('LINK_CHECK_HOST_RATE', 2))  # Requests per second per host
+    LINK_CHECK_HOST_BURST = int(os.environ.get('LINK_CHECK_HOST_BURST', 2))
+    LINK_CHECK_MIN_TTL = int(os.environ.get('LINK_CHECK_MIN_TTL', 3600))  # Re-check failing links after 1 hour
+    LINK_CHECK_DEFAULT_TTL = int(os.environ.get('LINK_CHECK_DEFAULT_TTL', 6 * 3600))
+    LINK_CHECK_MAX_TTL = int(os.environ.get('LINK_CHECK_MAX_TTL', 7 * 24 * 3600))  # Stable links at least weekly
+    
     # Data directories
     DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
     LOGS_DIR = os.path.join(PROJECT_ROOT, 'logs')
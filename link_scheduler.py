@@ -7,8 +7,6 @@ import schedule
 import time
 import threading
 from datetime import datetime, timedelta
-import json
-import os
 
 # Import our validation protocol
 from link_validation_protocol import LinkValidator, run_validation_protocol
@@ -16,43 +14,33 @@ from link_validation_protocol import LinkValidator, run_validation_protocol
 class LinkValidationScheduler:
     """Schedules and manages automated link validation."""
     
-    def __init__(self):
-        self.validator = LinkValidator()
+    def __init__(self, db=None):
+        self.validator = LinkValidator(db)
         self.last_validation = None
         self.validation_results = None
         self.is_running = False
         
-    def run_scheduled_validation(self):
-        """Run validation and store results."""
+    def run_scheduled_validation(self, incremental=True):
+        """Run validation and store results.
+        
+        Scheduled runs are incremental: only sources whose check TTL has
+        expired are requested.
+        """
         print(f"🕐 {datetime.now().strftime('%H:%M:%S')} - Running scheduled link validation...")
         
+        started_at = datetime.now()
         try:
-            self.validation_results = run_validation_protocol()
+            self.validation_results = run_validation_protocol(self.validator, incremental=incremental)
             self.last_validation = datetime.now()
             
-            # Save results to JSON for web interface
-            results_file = "latest_validation_results.json"
-            with open(results_file, 'w') as f:
-                # Convert datetime objects to strings for JSON serialization
-                serializable_results = self._make_json_serializable(self.validation_results)
-                json.dump(serializable_results, f, indent=2)
+            # Record the run in the database for the web interface
+            self.validator.save_results(self.validation_results, started_at)
             
             print("✅ Validation completed and results saved")
             
         except Exception as e:
             print(f"❌ Validation failed: {e}")
     
-    def _make_json_serializable(self, data):
-        """Convert complex objects to JSON-serializable format."""
-        if isinstance(data, dict):
-            return {k: self._make_json_serializable(v) for k, v in data.items()}
-        elif isinstance(data, list):
-            return [self._make_json_serializable(item) for item in data]
-        elif isinstance(data, datetime):
-            return data.isoformat()
-        else:
-            return data
-    
     def start_scheduler(self):
         """Start the validation scheduler."""
         if self.is_running:
@@ -67,9 +55,9 @@ class LinkValidationScheduler:
         schedule.every().monday.at("08:00").do(self.run_comprehensive_validation)  # Weekly comprehensive
         
         print("📅 Link validation scheduler started:")
-        print("   • Every 6 hours: Quick validation")
-        print("   • Daily at 9 AM: Standard validation") 
-        print("   • Mondays at 8 AM: Comprehensive validation")
+        print("   • Every 6 hours: Quick validation (links due for a re-check)")
+        print("   • Daily at 9 AM: Standard validation (links due for a re-check)")
+        print("   • Mondays at 8 AM: Comprehensive validation (every link)")
         
         # Run initial validation
         self.run_scheduled_validation()
@@ -89,8 +77,8 @@ class LinkValidationScheduler:
         """Run comprehensive validation with additional checks."""
         print("🔍 Running comprehensive validation...")
         
-        # Run standard validation
-        self.run_scheduled_validation()
+        # Run a full validation, ignoring check TTLs
+        self.run_scheduled_validation(incremental=False)
         
         # Additional comprehensive checks
         self._check_reliability_scores()
@@ -169,8 +157,10 @@ class LinkValidationScheduler:
 # Global scheduler instance
 link_scheduler = LinkValidationScheduler()
 
-def start_link_validation_service():
+def start_link_validation_service(db=None):
     """Start the link validation service."""
+    if db is not None:
+        link_scheduler.validator.db = db
     return link_scheduler.start_scheduler()
 
 def get_link_validation_status():
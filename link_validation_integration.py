@@ -11,13 +11,17 @@ project_root = os.path.dirname(os.path.abspath(__file__))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-def start_link_validation_service():
-    """Start the background link validation service."""
+def start_link_validation_service(db=None):
+    """Start the background link validation service.
+    
+    Pass the web app's DatabaseManager so the scheduler thread draws its
+    connection from the same pool.
+    """
     try:
         from link_scheduler import LinkValidationScheduler
         
         # Create and start the scheduler
-        scheduler = LinkValidationScheduler()
+        scheduler = LinkValidationScheduler(db)
         
         # Start the scheduler in a background thread
         scheduler_thread = scheduler.start_scheduler()
@@ -32,114 +36,105 @@ def start_link_validation_service():
         print(f"⚠ Error starting link validation service: {e}")
         return False
 
-def run_validation_protocol():
-    """Run the validation protocol manually."""
+def run_validation_protocol(db=None, incremental=False):
+    """Run the validation protocol manually and record the run in the database.
+    
+    With ``incremental`` set, sources checked within their TTL are skipped.
+    """
+    from datetime import datetime
+    
+    started_at = datetime.now()
     try:
         from link_validation_protocol import LinkValidator
         from app.database import DatabaseManager
         
         # Initialize components
-        db = DatabaseManager()
-        validator = LinkValidator()
-        
-        # Get all sources from database
-        promises = db.get_all_promises()
-        all_sources = []
-        
-        for promise in promises:
-            for source in promise.sources:
-                all_sources.append({
-                    'id': source.id,
-                    'promise_id': promise.id,
-                    'title': source.title,
-                    'url': source.url,
-                    'source_type': source.source_type.value if source.source_type else 'unknown'
-                })
-        
-        # Run validation
-        print(f"Validating {len(all_sources)} sources...")
+        db = db or DatabaseManager()
+        validator = LinkValidator(db)
         
-        valid_count = 0
-        invalid_count = 0
-        placeholder_count = 0
-        details = []
+        # Requests are conditional on each source's stored ETag/Last-Modified
+        results = validator.validate_all_sources(incremental=incremental)
         
-        for source in all_sources:
-            is_valid, status_code, error_msg = validator.validate_url(source['url'])
-            is_placeholder = validator.is_placeholder_url(source['url'])
-            
-            if is_placeholder:
-                placeholder_count += 1
-            elif is_valid:
-                valid_count += 1
-            else:
-                invalid_count += 1
-            
-            details.append({
-                'source_id': source['id'],
-                'promise_id': source['promise_id'],
-                'source_title': source['title'],
-                'url': source['url'],
-                'is_valid': is_valid,
-                'is_placeholder': is_placeholder,
-                'status_code': status_code,
-                'error_message': error_msg
-            })
+        run_id = validator.save_results(results, started_at)
+        results = load_validation_results(db, run_id)
+        summary = results['summary']
         
-        # Generate results
-        from datetime import datetime
-        
-        results = {
-            'status': 'success',
-            'summary': {
-                'valid_count': valid_count,
-                'invalid_count': invalid_count,
-                'placeholder_count': placeholder_count,
-                'total_count': len(all_sources),
-                'validation_date': datetime.now().isoformat()
-            },
-            'details': details
-        }
-        
-        # Save results to file for web interface
-        import json
-        with open('latest_validation_results.json', 'w') as f:
-            json.dump(results, f, indent=2)
-        
-        print(f"✓ Validation completed: {valid_count} valid, {invalid_count} invalid, {placeholder_count} placeholders")
+        print(f"✓ Validation completed: {summary['valid_count']} valid, {summary['invalid_count']} invalid, "
+              f"{summary['placeholder_count']} placeholders")
         return results
         
     except Exception as e:
+        if db is not None:
+            try:
+                db.record_validation_run(started_at, [], status='error', message=str(e))
+            except Exception:
+                pass
+        
         error_result = {
             'status': 'error',
             'message': str(e),
-            'summary': {
-                'valid_count': 0,
-                'invalid_count': 0,
-                'placeholder_count': 0,
-                'total_count': 0,
-                'validation_date': None
-            },
+            'summary': run_summary(None),
             'details': []
         }
         
         print(f"✗ Validation failed: {e}")
         return error_result
 
-def get_link_validation_status():
+def run_summary(run):
+    """Summary dict of a ``validation_runs`` row (all zeros when there is none)."""
+    if not run:
+        return {
+            'valid_count': 0,
+            'invalid_count': 0,
+            'placeholder_count': 0,
+            'total_count': 0,
+            'skipped_count': 0,
+            'validation_date': None
+        }
+    
+    return {
+        'valid_count': run['valid_count'],
+        'invalid_count': run['invalid_count'],
+        'placeholder_count': run['placeholder_count'],
+        'total_count': run['total_count'],
+        'skipped_count': run['skipped_count'],
+        'validation_date': run['finished_at']
+    }
+
+def load_validation_results(db, run_id=None):
+    """Load a run (the latest by default) with its per-link details from the database."""
+    if run_id is None:
+        run = db.get_latest_validation_run()
+    else:
+        run = db.get_validation_run(run_id)
+    
+    if not run:
+        return {
+            'status': 'no_data',
+            'message': 'No validation results available',
+            'summary': run_summary(None),
+            'details': []
+        }
+    
+    return {
+        'status': run['status'],
+        'message': run['message'],
+        'run_id': run['id'],
+        'summary': run_summary(run),
+        'details': db.get_validation_details(run['id'])
+    }
+
+def get_link_validation_status(db=None):
     """Get the current status of the link validation system."""
     try:
-        import json
+        from app.database import DatabaseManager
         
-        # Check if results file exists
-        if os.path.exists('latest_validation_results.json'):
-            with open('latest_validation_results.json', 'r') as f:
-                results = json.load(f)
-            
+        run = (db or DatabaseManager()).get_latest_validation_run()
+        if run:
             return {
                 'status': 'available',
-                'last_run': results['summary']['validation_date'],
-                'summary': results['summary']
+                'last_run': run['finished_at'],
+                'summary': run_summary(run)
             }
         else:
             return {
@@ -6,9 +6,12 @@ Continuously monitors and validates all source links to ensure they are working
 import sys
 import os
 import requests
+import threading
 import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Iterable
 from urllib.parse import urlparse
 
 # Add the app directory to path
@@ -16,40 +19,282 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
 
 from app.database import DatabaseManager
 from app.models import Source, SourceType
+from config import Config
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` requests per second, bursts up to ``capacity``."""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def try_acquire(self) -> float:
+        """Take a token if one is available.
+        
+        Returns 0 on success, otherwise the seconds until the next token.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+    
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            delay = self.try_acquire()
+            if not delay:
+                return
+            time.sleep(delay)
+
 
 class LinkValidator:
-    """Validates and monitors source links for the Trump Promises Tracker."""
+    """Validates and monitors source links for the Trump Promises Tracker.
+    
+    URLs are checked concurrently by up to ``max_workers`` threads. Politeness
+    is enforced per host: each host gets its own token bucket and its own
+    ``requests.Session``, so connections to a host are reused while
+    unrelated hosts are checked in parallel. Batches are scheduled per host
+    from the calling thread (see ``_run_checks``), so workers never sit out
+    a host's rate limit.
+    """
     
-    def __init__(self):
-        self.db = DatabaseManager()
-        self.timeout = 10  # seconds
+    def __init__(self, db: Optional[DatabaseManager] = None,
+                 max_workers: int = Config.LINK_CHECK_MAX_WORKERS,
+                 timeout: float = Config.LINK_CHECK_TIMEOUT,
+                 connect_timeout: float = Config.LINK_CHECK_CONNECT_TIMEOUT,
+                 host_rate: float = Config.LINK_CHECK_HOST_RATE,
+                 host_burst: int = Config.LINK_CHECK_HOST_BURST,
+                 min_ttl: int = Config.LINK_CHECK_MIN_TTL,
+                 default_ttl: int = Config.LINK_CHECK_DEFAULT_TTL,
+                 max_ttl: int = Config.LINK_CHECK_MAX_TTL):
+        self.db = db or DatabaseManager()
+        self.max_workers = max_workers
+        self.timeout = (connect_timeout, timeout)  # seconds: (connect, read)
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self.min_ttl = min_ttl  # seconds between checks of a source, see _next_state
+        self.default_ttl = default_ttl
+        self.max_ttl = max_ttl
         self.user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._sessions: Dict[str, requests.Session] = {}
+        self._hosts_lock = threading.Lock()
+        
     def validate_url(self, url: str) -> Tuple[bool, int, str]:
         """
         Validate a single URL.
         Returns: (is_valid, status_code, error_message)
         """
+        is_valid, status_code, error_msg, latency = self.check_url(url)
+        return is_valid, status_code, error_msg
+    
+    def check_url(self, url: str) -> Tuple[bool, int, str, float]:
+        """
+        Validate a single URL, waiting for its host's rate limit.
+        Returns: (is_valid, status_code, error_message, latency_ms)
+        """
+        result = self._check(url)
+        return result['is_valid'], result['status_code'], result['error_message'], result['latency_ms']
+    
+    def validate_urls(self, urls: Iterable[str]) -> Dict[str, Tuple[bool, int, str, float]]:
+        """Check many URLs concurrently. Each distinct URL is requested once.
+        
+        Returns a dict mapping every URL to its ``check_url`` result.
+        """
+        checks = self._run_checks(dict.fromkeys(urls, (None, None)))
+        return {url: (result['is_valid'], result['status_code'], result['error_message'], result['latency_ms'])
+                for url, result in checks.items()}
+    
+    def revalidate_urls(self, validators: Dict[str, Tuple[Optional[str], Optional[str]]]) -> Dict[str, Dict]:
+        """Check many URLs concurrently with conditional requests.
+        
+        ``validators`` maps each URL to the (ETag, Last-Modified) pair from its
+        previous check, either of which may be None. Returns a dict mapping
+        every URL to a result dict that also carries the new validators.
+        """
+        return self._run_checks(validators)
+    
+    def _run_checks(self, validators: Dict[str, Tuple[Optional[str], Optional[str]]]) -> Dict[str, Dict]:
+        """Check URLs on the worker pool, scheduling requests per host.
+        
+        Each host has a queue. A request is only handed to a worker once its
+        host's bucket has a token and fewer than ``host_burst`` of the host's
+        requests are in flight; otherwise the host is skipped and the workers
+        go to other hosts. This thread sleeps only when every pending host is
+        throttled and nothing is running.
+        """
+        if not validators:
+            return {}
+        
+        queues: Dict[str, deque] = {}
+        for url, (etag, last_modified) in validators.items():
+            queues.setdefault(urlparse(url).netloc.lower(), deque()).append((url, 'HEAD', etag, last_modified))
+        
+        max_per_host = max(self.host_burst, 1)
+        max_workers = min(self.max_workers, len(validators))
+        in_flight = Counter()
+        running = {}  # future -> (host, job)
+        results = {}
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while queues or running:
+                next_token = None
+                for host in list(queues):
+                    bucket = self._host_state(host)[0]
+                    queue = queues[host]
+                    while queue and in_flight[host] < max_per_host and len(running) < max_workers:
+                        delay = bucket.try_acquire()
+                        if delay:
+                            next_token = delay if next_token is None else min(next_token, delay)
+                            break
+                        job = queue.popleft()
+                        running[executor.submit(self._request, *job)] = (host, job)
+                        in_flight[host] += 1
+                    if not queue:
+                        del queues[host]
+                
+                if not running:
+                    time.sleep(next_token)  # Every pending host is waiting for a token
+                    continue
+                
+                done, _ = wait(running, timeout=next_token, return_when=FIRST_COMPLETED)
+                for future in done:
+                    host, (url, method, etag, last_modified) = running.pop(future)
+                    in_flight[host] -= 1
+                    result = future.result()
+                    if result is None:  # HEAD not allowed: retry with GET, which needs another token
+                        queues.setdefault(host, deque()).appendleft((url, 'GET', etag, last_modified))
+                    else:
+                        results[url] = result
+        
+        return {url: results[url] for url in validators}
+    
+    def _check(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> Dict:
+        """Request a URL (HEAD, falling back to GET), waiting for its host's rate limit."""
+        bucket = self._host_state(urlparse(url).netloc.lower())[0]
+        bucket.acquire()
+        result = self._request(url, 'HEAD', etag, last_modified)
+        if result is None:
+            bucket.acquire()
+            result = self._request(url, 'GET', etag, last_modified)
+        return result
+    
+    def _request(self, url: str, method: str, etag: Optional[str] = None,
+                 last_modified: Optional[str] = None) -> Optional[Dict]:
+        """Send one request without rate limiting and describe the outcome.
+        
+        With an ETag or Last-Modified value the request is conditional; a 304
+        reply counts as a valid link. Returns None when a HEAD request gets
+        405, so the caller can retry with GET.
+        """
+        session = self._host_state(urlparse(url).netloc.lower())[1]
+        
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        
+        result = {'etag': etag, 'last_modified': last_modified}
+        start = time.perf_counter()
         try:
-            headers = {'User-Agent': self.user_agent}
-            response = requests.head(url, timeout=self.timeout, headers=headers, allow_redirects=True)
-            
-            if response.status_code == 405:  # Method not allowed, try GET
-                response = requests.get(url, timeout=self.timeout, headers=headers, allow_redirects=True)
-            
-            if response.status_code < 400:
-                return True, response.status_code, "OK"
+            if method == 'HEAD':
+                response = session.head(url, timeout=self.timeout, headers=headers, allow_redirects=True)
+                if response.status_code == 405:  # Method not allowed, try GET
+                    return None
             else:
-                return False, response.status_code, f"HTTP {response.status_code}"
+                response = session.get(url, timeout=self.timeout, headers=headers, allow_redirects=True, stream=True)
+                response.close()  # Only the status is needed, skip the body
+            
+            result['latency_ms'] = (time.perf_counter() - start) * 1000
+            result['status_code'] = response.status_code
+            result['is_valid'] = response.status_code < 400
+            result['error_message'] = "OK" if result['is_valid'] else f"HTTP {response.status_code}"
+            if response.status_code != 304:
+                result['etag'] = response.headers.get('ETag')
+                result['last_modified'] = response.headers.get('Last-Modified')
+            return result
                 
         except requests.exceptions.Timeout:
-            return False, 0, "Timeout"
+            error_msg = "Timeout"
         except requests.exceptions.ConnectionError:
-            return False, 0, "Connection Error"
+            error_msg = "Connection Error"
         except requests.exceptions.RequestException as e:
-            return False, 0, f"Request Error: {str(e)}"
+            error_msg = f"Request Error: {str(e)}"
         except Exception as e:
-            return False, 0, f"Unknown Error: {str(e)}"
+            error_msg = f"Unknown Error: {str(e)}"
+        
+        result.update(is_valid=False, status_code=0, error_message=error_msg,
+                      latency_ms=(time.perf_counter() - start) * 1000)
+        return result
+    
+    def _next_state(self, source_id: int, url: str, state: Optional[Dict], result: Dict,
+                    now: datetime) -> Dict:
+        """Work out a source's stored link state after a check.
+        
+        A link that keeps passing has its TTL doubled (up to ``max_ttl``);
+        any failure cuts it to a quarter (down to ``min_ttl``) so broken or
+        flaky links are watched closely. A link that recovers starts again
+        from ``default_ttl``.
+        """
+        if state is None or state['url'] != url:
+            state = {'ttl_seconds': self.default_ttl, 'is_valid': True,
+                     'success_streak': 0, 'failure_streak': 0}
+        
+        if result['is_valid']:
+            ttl = min(state['ttl_seconds'] * 2, self.max_ttl) if state['is_valid'] else self.default_ttl
+            success_streak, failure_streak = state['success_streak'] + 1, 0
+        else:
+            ttl = max(state['ttl_seconds'] // 4, self.min_ttl)
+            success_streak, failure_streak = 0, state['failure_streak'] + 1
+        
+        return {
+            'source_id': source_id,
+            'url': url,
+            'etag': result['etag'],
+            'last_modified': result['last_modified'],
+            'is_valid': result['is_valid'],
+            'status_code': result['status_code'],
+            'error_message': result['error_message'],
+            'last_checked': now.isoformat(),
+            'next_check_at': (now + timedelta(seconds=ttl)).isoformat(),
+            'ttl_seconds': ttl,
+            'success_streak': success_streak,
+            'failure_streak': failure_streak
+        }
+    
+    def close(self):
+        """Close the per-host sessions."""
+        with self._hosts_lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            self._buckets.clear()
+        for session in sessions:
+            session.close()
+    
+    def _host_state(self, host: str) -> Tuple[TokenBucket, requests.Session]:
+        """Get (creating on first use) the rate limiter and session for a host."""
+        with self._hosts_lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                session.headers['User-Agent'] = self.user_agent
+                adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(self.host_burst, 1))
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[host] = session
+                self._buckets[host] = TokenBucket(self.host_rate, self.host_burst)
+            return self._buckets[host], session
     
     def is_placeholder_url(self, url: str) -> bool:
         """Check if URL is a placeholder that should be flagged."""
@@ -70,8 +315,14 @@ class LinkValidator:
         except:
             return True
     
-    def validate_all_sources(self) -> Dict:
-        """Validate all sources in the database."""
+    def validate_all_sources(self, incremental: bool = False) -> Dict:
+        """Validate all sources in the database.
+        
+        Every request is conditional on the ETag/Last-Modified seen last time.
+        With ``incremental`` set, sources whose TTL hasn't expired are not
+        requested at all; their last known result is reported instead and
+        marked ``cached``.
+        """
         print("🔍 Starting comprehensive source validation...")
         
         # Get all sources
@@ -94,12 +345,26 @@ class LinkValidator:
             'summary': {}
         }
         
+        states = self.db.get_link_states()
+        now = datetime.now()
+        
+        # Decide which sources need a request; each URL is requested once
+        validators = {}
+        for source in sources:
+            url, state = source['url'], states.get(source['id'])
+            if self.is_placeholder_url(url) or (incremental and self._is_fresh(state, url, now)):
+                continue
+            if url not in validators or validators[url] == (None, None):
+                validators[url] = (state['etag'], state['last_modified']) if state and state['url'] == url else (None, None)
+        
+        print(f"  Checking {len(validators)} URLs concurrently ({self.max_workers} workers)...")
+        checks = self.revalidate_urls(validators)
+        
+        new_states = []
         for source in sources:
             source_id, url, title, reliability_score, promise_ids = source
             promise_ids = promise_ids.split(',') if promise_ids else []
             
-            print(f"  Checking: {title[:50]}...")
-            
             # Check for placeholder URLs first
             if self.is_placeholder_url(url):
                 results['placeholder_links'].append({
@@ -111,37 +376,73 @@ class LinkValidator:
                 })
                 continue
             
-            # Validate the URL
-            is_valid, status_code, error_msg = self.validate_url(url)
+            state = states.get(source_id)
+            if url in checks:
+                check = checks[url]
+                new_states.append(self._next_state(source_id, url, state, check, now))
+                source_info = {'status_code': check['status_code'], 'latency_ms': check['latency_ms']}
+            else:
+                check = state
+                source_info = {'status_code': state['status_code'], 'latency_ms': None, 'cached': True}
             
-            source_info = {
+            source_info.update({
                 'source_id': source_id,
                 'url': url,
                 'title': title,
-                'status_code': status_code,
                 'promise_ids': promise_ids,
                 'reliability_score': reliability_score
-            }
+            })
             
-            if is_valid:
+            if check['is_valid']:
                 results['valid_links'].append(source_info)
             else:
-                source_info['error'] = error_msg
+                source_info['error'] = check['error_message']
                 results['invalid_links'].append(source_info)
-            
-            # Rate limiting to be respectful
-            time.sleep(0.5)
+        
+        self.db.save_link_states(new_states)
         
         # Generate summary
         results['summary'] = {
             'valid_count': len(results['valid_links']),
             'invalid_count': len(results['invalid_links']),
             'placeholder_count': len(results['placeholder_links']),
+            'checked_count': len(validators),
             'validation_date': datetime.now().isoformat()
         }
         
         return results
     
+    @staticmethod
+    def _is_fresh(state: Optional[Dict], url: str, now: datetime) -> bool:
+        """Whether a source was checked recently enough to skip in an incremental run."""
+        return (state is not None and state['url'] == url
+                and datetime.fromisoformat(state['next_check_at']) > now)
+    
+    def save_results(self, results: Dict, started_at: datetime) -> int:
+        """Record the output of ``validate_all_sources`` as a validation run. Returns the run ID."""
+        checks = []
+        for link in results['valid_links'] + results['invalid_links']:
+            checks.append({
+                'source_id': link['source_id'],
+                'url': link['url'],
+                'is_valid': 'error' not in link,
+                'status_code': link['status_code'],
+                'latency_ms': link.get('latency_ms'),
+                'error_message': link.get('error'),
+                'cached': link.get('cached', False)
+            })
+        for link in results['placeholder_links']:
+            checks.append({
+                'source_id': link['source_id'],
+                'url': link['url'],
+                'is_valid': False,
+                'is_placeholder': True,
+                'status_code': 0,
+                'error_message': link['issue']
+            })
+        
+        return self.db.record_validation_run(started_at, checks)
+    
     def generate_report(self, results: Dict) -> str:
         """Generate a human-readable validation report."""
         report = []
@@ -301,9 +602,12 @@ class LinkValidator:
         
         return fixes_applied
 
-def run_validation_protocol():
-    """Run the complete validation protocol."""
-    validator = LinkValidator()
+def run_validation_protocol(validator: Optional[LinkValidator] = None, incremental: bool = False):
+    """Run the complete validation protocol.
+    
+    ``incremental`` skips sources whose check TTL hasn't expired.
+    """
+    validator = validator or LinkValidator()
     
     print("🚀 Starting Link Validation Protocol...")
     print("=" * 50)
@@ -314,7 +618,7 @@ def run_validation_protocol():
         print(f"✅ Auto-fixed {fixes} placeholder sources")
     
     # Step 2: Validate all sources
-    results = validator.validate_all_sources()
+    results = validator.validate_all_sources(incremental=incremental)
     
     # Step 3: Generate and save report
     report = validator.generate_report(results)
@@ -236,7 +236,7 @@ def add_recent_campaign_promises():
     ]
     
     # Add recent promises to database
-    added_promises = []
+    promises = []
     for promise_data in recent_promises:
         # Create sources
         sources = []
@@ -265,9 +265,13 @@ def add_recent_campaign_promises():
             date_updated=datetime.now() - timedelta(days=10)  # Very recent updates
         )
         
-        promise_id = db_manager.add_promise(promise)
-        added_promises.append(promise_id)
-        print(f"Added recent promise {promise_id}: {promise.text[:50]}...")
+        promises.append(promise)
+    
+    # One transaction for the whole set
+    db_manager.bulk_add_promises(promises, link_related=True)
+    added_promises = [promise.id for promise in promises]
+    for promise in promises:
+        print(f"Added recent promise {promise.id}: {promise.text[:50]}...")
     
     print(f"\n✅ Added {len(added_promises)} recent campaign promises!")
     return added_promises
@@ -185,7 +185,7 @@ def create_sample_data():
     ]
     
     # Add promises to database
-    added_promises = []
+    promises = []
     for promise_data in sample_promises:
         # Create sources
         sources = []
@@ -214,9 +214,13 @@ def create_sample_data():
             date_updated=datetime.now() - timedelta(days=100)   # Simulate recent update
         )
         
-        promise_id = db_manager.add_promise(promise)
-        added_promises.append(promise_id)
-        print(f"Added promise {promise_id}: {promise.text[:50]}...")
+        promises.append(promise)
+    
+    # One transaction for the whole set
+    db_manager.bulk_add_promises(promises, link_related=True)
+    added_promises = [promise.id for promise in promises]
+    for promise in promises:
+        print(f"Added promise {promise.id}: {promise.text[:50]}...")
     
     print(f"\nAdded {len(added_promises)} sample promises to the database.")
     return added_promises
@@ -0,0 +1,111 @@
+"""
+Shared fixtures: a DatabaseManager on a temporary file, promise builders, a
+Flask test client on its own database and local HTTP servers.
+"""
+
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import DatabaseManager
+from app.models import Promise, PromiseStatus, Source, SourceType
+
+
+@pytest.fixture
+def db(tmp_path):
+    db_manager = DatabaseManager(str(tmp_path / 'promises.db'))
+    yield db_manager
+    db_manager.close()
+
+
+@pytest.fixture
+def make_promise():
+    """Build a Promise; ``days_ago`` spaces out ``date_updated`` for ordering tests."""
+    def make(text="Cut taxes for working families", days_ago=0, **fields):
+        updated = datetime(2024, 6, 1, 12, 0) - timedelta(days=days_ago)
+        fields.setdefault('sources', [Source(url=f"https://example.org/{text.replace(' ', '-')}", title="Source",
+                                             source_type=SourceType.RALLY_SPEECH)])
+        fields.setdefault('date_made', datetime(2016, 6, 1))
+        return Promise(text=text, date_updated=updated, created_at=updated, **fields)
+    return make
+
+
+@pytest.fixture
+def seeded(db, make_promise):
+    """Twelve promises across two categories, updated a day apart (newest has the lowest index)."""
+    ids = []
+    for i in range(12):
+        promise = make_promise(f"Promise number {i} about border security and tax relief", days_ago=i,
+                               category='Economy' if i % 2 else 'Immigration',
+                               status=PromiseStatus.IN_PROGRESS if i % 3 else PromiseStatus.NOT_STARTED,
+                               tags=['border'] if i % 2 else ['tax', 'jobs'])
+        ids.append(db.add_promise(promise))
+    return ids
+
+
+@pytest.fixture
+def count_queries():
+    """Call ``func`` and return (result, number of SQL statements it ran on this thread)."""
+    def count(db, func):
+        db.pool.start_query_count()
+        try:
+            result = func()
+        finally:
+            queries = db.pool.stop_query_count()
+        return result, queries
+    return count
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """The Flask app, on its own temporary database."""
+    path = str(tmp_path / 'web.db')
+
+    class TestDatabaseManager(DatabaseManager):
+        def __init__(self, *args, **kwargs):
+            super().__init__(path, **kwargs)
+
+    monkeypatch.setattr('app.web.routes.DatabaseManager', TestDatabaseManager)
+    from app.web.routes import create_app
+    flask_app = create_app()
+    flask_app.config['TESTING'] = True
+    yield flask_app
+    flask_app.extensions['db_manager'].close()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def web_db(app):
+    """The app's DatabaseManager, for seeding data behind the client."""
+    return app.extensions['db_manager']
+
+
+@pytest.fixture
+def http_server():
+    """Start local HTTP servers: ``http_server(handler_class)`` returns a server with ``url`` and ``requests``.
+
+    Handlers can append to ``self.server.requests`` to record what they saw.
+    """
+    servers = []
+
+    def start(handler_class):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), handler_class)
+        server.requests = []
+        server.url = f"http://127.0.0.1:{server.server_port}"
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        servers.append(server)
+        return server
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,99 @@
+"""
+Tests for the pandas analytics backend: parity with the SQL aggregates.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from app.analytics_frame import FrameAnalytics, load_promise_frame
+from app.analyzer import PromiseAnalyzer
+from app.database import DatabaseManager
+from app.models import EPOCH, PromiseStatus, to_epoch_us
+
+NOW = datetime(2024, 6, 1, 12, 0)
+
+OFFSETS = [None, timezone.utc, timezone(timedelta(hours=5)), timezone(timedelta(hours=-7, minutes=-30))]
+
+
+def random_promises(make_promise, count, seed, offsets=(None,)):
+    """Promises spread over a year before ``NOW``, with timestamps in the given UTC offsets."""
+    rng = random.Random(seed)
+    promises = []
+    for i in range(count):
+        promise = make_promise(f"Promise {i}", category=rng.choice(['Economy', 'Immigration', 'Trade']),
+                               status=rng.choice(list(PromiseStatus)), priority=rng.randint(1, 5),
+                               progress_percentage=float(rng.choice([0, 10, 25, 40, 50, 75, 90, 100])))
+        updated = NOW - timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+        offset = rng.choice(offsets)
+        promise.date_updated = updated if offset is None else updated.replace(tzinfo=timezone.utc).astimezone(offset)
+        promise.created_at = promise.date_updated - timedelta(days=rng.randint(0, 60))
+        promises.append(promise)
+    return promises
+
+
+@pytest.fixture
+def make_db(tmp_path):
+    managers = []
+
+    def make(timestamp_format, promises):
+        managers.append(DatabaseManager(str(tmp_path / f'{timestamp_format}.db'), timestamp_format=timestamp_format))
+        for promise in promises:
+            managers[-1].add_promise(promise)
+        return managers[-1]
+    yield make
+    for manager in managers:
+        manager.close()
+
+
+def assert_same_analytics(expected, actual):
+    """Counts must match exactly; float averages up to summation order."""
+    if isinstance(expected, dict):
+        assert expected.keys() == actual.keys()
+        for key in expected:
+            assert_same_analytics(expected[key], actual[key])
+    else:
+        assert actual == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('timestamp_format', ['iso', 'epoch_us'])
+def test_matches_the_sql_backend(make_db, make_promise, timestamp_format):
+    db = make_db(timestamp_format, random_promises(make_promise, 300, seed=7))
+    sql, frame = PromiseAnalyzer(db), PromiseAnalyzer(db, backend='pandas')
+
+    for days_back in [7, 30, 400]:
+        assert_same_analytics(sql.compute_dashboard_analytics(days_back, now=NOW),
+                              frame.compute_dashboard_analytics(days_back, now=NOW))
+    assert frame.monthly_series() == sql.monthly_series()
+    assert FrameAnalytics(db).count_by_status() == db.get_analytics_data()['promises_by_status']
+
+
+def test_mixed_offsets_are_compared_in_utc(make_db, make_promise):
+    promises = random_promises(make_promise, 300, seed=8, offsets=OFFSETS)
+    iso_db = make_db('iso', promises)
+    # Epoch storage converts aware values to UTC, so its SQL figures are the reference
+    epoch_db = make_db('epoch_us', promises)
+
+    frame = load_promise_frame(iso_db)
+
+    expected = [EPOCH + timedelta(microseconds=to_epoch_us(promise.date_updated)) for promise in promises]
+    assert list(frame.sort_values('id')['date_updated']) == [pd.Timestamp(value) for value in expected]
+    assert_same_analytics(PromiseAnalyzer(epoch_db).compute_dashboard_analytics(30, now=NOW),
+                          PromiseAnalyzer(iso_db, backend='pandas').compute_dashboard_analytics(30, now=NOW))
+    assert PromiseAnalyzer(iso_db, backend='pandas').monthly_series() == \
+        PromiseAnalyzer(epoch_db).monthly_series()
+
+
+def test_frame_follows_the_data_version(db, make_promise):
+    analyzer = PromiseAnalyzer(db, backend='pandas')
+    assert analyzer.compute_dashboard_analytics(30, now=NOW)['priority_data']['Priority 5'] == 0
+
+    promise_id = db.add_promise(make_promise(priority=5))
+    assert analyzer.compute_dashboard_analytics(30, now=NOW)['high_priority_count'] == 1
+
+    db.patch_promise(promise_id, {'priority': 2})
+    assert analyzer.compute_dashboard_analytics(30, now=NOW)['priority_data'] == \
+        {'Priority 1': 0, 'Priority 2': 1, 'Priority 3': 0, 'Priority 4': 0, 'Priority 5': 0}
@@ -0,0 +1,140 @@
+"""
+Tests for PromiseAnalyzer's report, dashboard and complexity figures.
+"""
+
+from collections import Counter
+from datetime import datetime
+
+import pytest
+
+from app.analyzer import PromiseAnalyzer, compute_complexity, text_hash
+from app.models import PromiseStatus
+
+
+@pytest.fixture
+def analyzer(db):
+    return PromiseAnalyzer(db)
+
+
+class TestAnalyticsReport:
+    def test_report_matches_the_promises(self, db, seeded, analyzer, count_queries):
+        db.patch_promise(seeded[3], {'status': 'Fulfilled', 'progress_percentage': 100.0})
+        db.patch_promise(seeded[8], {'progress_percentage': 30.0})
+        promises = db.get_all_promises()
+
+        report, queries = count_queries(db, analyzer.generate_analytics_report)
+
+        assert queries == 2  # Aggregates plus one LIMIT query, however many promises there are
+        assert report.total_promises == 12
+        assert report.promises_by_status == Counter(promise.status.value for promise in promises)
+        assert report.promises_by_category == {'Economy': 6, 'Immigration': 6}
+        assert report.fulfillment_rate == pytest.approx(100 / 12)
+        assert report.average_progress == pytest.approx(130 / 12)
+        assert [update['promise_id'] for update in report.recent_updates] == \
+            [promise.id for promise in promises[:10]]
+
+    def test_empty_database(self, analyzer):
+        report = analyzer.generate_analytics_report()
+
+        assert (report.total_promises, report.recent_updates) == (0, [])
+
+
+NOW = datetime(2024, 6, 1, 12, 0)
+
+
+@pytest.fixture
+def dashboard_promises(db, make_promise):
+    """Two promises updated in the last 30 days before ``NOW`` and two older ones."""
+    return [db.add_promise(make_promise(text, days_ago=days_ago, category=category, priority=priority,
+                                        progress_percentage=progress, status=status))
+            for text, days_ago, category, priority, progress, status in [
+                ("Cut taxes on day one", 0, 'Economy', 5, 100.0, PromiseStatus.FULFILLED),
+                ("Secure the southern border", 10, 'Immigration', 3, 40.0, PromiseStatus.IN_PROGRESS),
+                ("Balance the budget", 45, 'Economy', 1, 0.0, PromiseStatus.NOT_STARTED),
+                ("Renegotiate trade deals", 60, 'Trade', 5, 80.0, PromiseStatus.NOT_STARTED)]]
+
+
+class TestDashboardAnalytics:
+    def test_figures(self, dashboard_promises, analyzer):
+        dashboard = analyzer.compute_dashboard_analytics(30, now=NOW)
+
+        assert dashboard['trends'] == {
+            'new_promises': 2,
+            'status_changes': 2,  # Initial statuses of the two recent promises
+            'category_activity': {'Economy': 1, 'Immigration': 1},
+            'progress_trends': {'recent_average_progress': 70.0, 'older_average_progress': 40.0,
+                                'progress_change': 30.0},
+            'fulfillment_velocity': 1 / 30,
+        }
+        assert dashboard['priority_data'] == {'Priority 1': 1, 'Priority 2': 0, 'Priority 3': 1,
+                                              'Priority 4': 0, 'Priority 5': 2}
+        assert dashboard['progress_data'] == {'0%': 1, '1-25%': 0, '26-50%': 1, '51-75%': 0, '76-99%': 1,
+                                              '100%': 1}
+        assert dashboard['high_priority_count'] == 2
+
+    def test_empty_database(self, analyzer):
+        dashboard = analyzer.compute_dashboard_analytics(30, now=NOW)
+
+        assert dashboard['trends']['progress_trends'] == {'recent_average_progress': 0, 'older_average_progress': 0,
+                                                          'progress_change': 0}
+        assert set(dashboard['progress_data'].values()) == {0}
+
+    def test_results_are_memoized_until_the_next_write(self, db, dashboard_promises, analyzer, count_queries):
+        first, queries = count_queries(db, analyzer.compute_dashboard_analytics)
+        second, cached_queries = count_queries(db, analyzer.compute_dashboard_analytics)
+
+        assert second is first
+        assert (queries, cached_queries) == (4, 1)  # A hit only reads the data version
+
+        db.patch_promise(dashboard_promises[2], {'priority': 4})
+        assert analyzer.compute_dashboard_analytics()['priority_data']['Priority 4'] == 1
+
+    def test_analytics_page(self, client, web_db, make_promise):
+        web_db.add_promise(make_promise("Cut taxes on day one", priority=5, progress_percentage=100.0))
+
+        response = client.get('/analytics')
+
+        assert response.status_code == 200
+        assert "Cut taxes on day one" in response.get_data(as_text=True)
+
+
+class TestComplexityMetrics:
+    def test_compute_complexity(self):
+        metrics = compute_complexity("We will build 300 miles of wall by 2018. It will cost $10,000,000, maybe.")
+
+        assert metrics == {
+            'word_count': 14, 'sentence_count': 3, 'avg_words_per_sentence': pytest.approx(14 / 3),
+            'specific_numbers': 5, 'specific_dates': 1, 'specific_amounts': 1,
+            'action_words': 1, 'qualifier_words': 1,
+            'complexity_score': pytest.approx(0.99), 'specificity_level': 'Very Specific'}
+
+    def test_metrics_are_computed_once_per_text(self, db, seeded, analyzer, monkeypatch):
+        computed = []
+        monkeypatch.setattr('app.analyzer.compute_complexity',
+                            lambda text: computed.append(text) or compute_complexity(text))
+        promises = db.get_all_promises()
+
+        first = analyzer.get_complexity(promises)
+        second = analyzer.get_complexity(promises)
+
+        assert len(computed) == 12
+        assert second == first == {promise.text: compute_complexity(promise.text) for promise in promises}
+
+        db.patch_promise(seeded[0], {'text': "Eliminate the deficit within 8 years"})
+        edited = db.get_promise(seeded[0])
+        assert analyzer.analyze_promise_complexity(edited) == compute_complexity(edited.text)
+        assert computed[12:] == [edited.text]
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_backfill_computes_missing_and_prunes_stale_metrics(self, db, seeded, analyzer, monkeypatch, workers):
+        monkeypatch.setattr(PromiseAnalyzer, 'PROCESS_POOL_MIN_TEXTS', 2)
+        analyzer.get_complexity([db.get_promise(seeded[0])])
+        db.patch_promise(seeded[0], {'text': "Eliminate the deficit within 8 years"})
+
+        counts = analyzer.backfill_complexity(workers=workers, batch_size=5)
+
+        assert counts == {'scanned': 12, 'computed': 12, 'pruned': 1}
+        texts = [text for _, text in db.get_promise_texts()]
+        assert db.get_promise_metrics([text_hash(text) for text in texts]) == \
+            {text_hash(text): pytest.approx(compute_complexity(text)) for text in texts}
+        assert analyzer.backfill_complexity(workers=workers) == {'scanned': 12, 'computed': 0, 'pruned': 0}
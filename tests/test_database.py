@@ -0,0 +1,591 @@
+"""
+Tests for DatabaseManager.
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.database import DatabaseManager, StaleVersionError, HIGHLIGHT_START, HIGHLIGHT_END
+from app.models import ProgressUpdate, PromiseStatus, Source, SourceType
+from link_validation_protocol import LinkValidator
+
+
+class TestSourceHydration:
+    def test_query_count_does_not_grow_with_promises(self, db, make_promise, count_queries):
+        for i in range(3):
+            db.add_promise(make_promise(f"Promise {i}"))
+        _, few = count_queries(db, db.get_all_promises)
+
+        for i in range(3, 40):
+            db.add_promise(make_promise(f"Promise {i}"))
+        promises, many = count_queries(db, db.get_all_promises)
+
+        assert len(promises) == 40
+        assert few == many == 2
+
+    def test_sources_are_attached_to_their_promises(self, db, make_promise):
+        shared = Source(url="https://example.org/shared", title="Shared", source_type=SourceType.INTERVIEW)
+        first = db.add_promise(make_promise("First promise", sources=[shared]))
+        second = db.add_promise(make_promise("Second promise", days_ago=1,
+                                             sources=[shared, Source(url="https://example.org/own", title="Own",
+                                                                     source_type=SourceType.POLICY_DOCUMENT)]))
+        bare = db.add_promise(make_promise("Promise without sources", days_ago=2, sources=[]))
+
+        promises = {promise.id: promise for promise in db.get_all_promises()}
+
+        assert [source.url for source in promises[first].sources] == ["https://example.org/shared"]
+        assert [source.url for source in promises[second].sources] == \
+            ["https://example.org/shared", "https://example.org/own"]
+        assert promises[bare].sources == []
+        # A source linked to several promises is built once
+        assert promises[first].sources[0] is promises[second].sources[0]
+
+    def test_filters_apply_to_sources(self, db, seeded):
+        promises = db.get_all_promises(category='Economy')
+
+        assert {promise.category for promise in promises} == {'Economy'}
+        assert all(len(promise.sources) == 1 for promise in promises)
+        assert sum(len(sources) for sources in db.get_sources_by_promise().values()) == len(seeded)
+
+    def test_batched_lookups_span_several_chunks(self, db, seeded, count_queries):
+        db.SOURCE_BATCH_SIZE = 5
+
+        promises, queries = count_queries(db, lambda: db.get_promises_by_ids(list(reversed(seeded))))
+
+        assert [promise.id for promise in promises] == list(reversed(seeded))
+        assert all(promise.sources[0].url.startswith("https://example.org/Promise-number")
+                   for promise in promises)
+        assert queries == 6  # three chunks of promises, three of sources
+        assert db.get_sources_by_promise(seeded).keys() == set(seeded)
+
+
+class TestKeysetPagination:
+    def test_cursor_walk_matches_full_ordering(self, db, seeded):
+        expected = [promise.id for promise in db.get_all_promises(include_sources=False)]
+
+        seen, cursor = [], None
+        while True:
+            page = db.query_promises(limit=5, cursor=cursor)
+            seen += [promise.id for promise in page.promises]
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert seen == expected
+        assert len(seen) == len(seeded)
+
+    def test_ascending_order_with_filter(self, db, seeded):
+        first = db.query_promises({'category': 'Economy'}, order='created_at', limit=4)
+        second = db.query_promises({'category': 'Economy'}, order='created_at', limit=4, cursor=first.next_cursor)
+
+        promises = first.promises + second.promises
+        assert all(promise.category == 'Economy' for promise in promises)
+        assert [promise.created_at for promise in promises] == sorted(promise.created_at for promise in promises)
+        assert second.next_cursor is None
+        assert len(promises) == 6
+
+    def test_ties_are_broken_by_id(self, db, make_promise):
+        ids = [db.add_promise(make_promise(f"Same time promise {i}")) for i in range(5)]
+
+        first = db.query_promises(limit=2)
+        rest = db.query_promises(limit=10, cursor=first.next_cursor)
+
+        assert [p.id for p in first.promises + rest.promises] == sorted(ids, reverse=True)
+
+    def test_count_and_offset_use_the_same_filters(self, db, seeded):
+        filters = {'category': 'Immigration', 'status': 'Not Started'}
+
+        page = db.query_promises(filters, limit=1, offset=1)
+
+        assert db.count_promises(filters) == 2
+        assert [promise.id for promise in page.promises] == [seeded[6]]
+        assert page.next_cursor is None
+
+    def test_rejects_bad_order_and_cursor(self, db, seeded):
+        with pytest.raises(ValueError):
+            db.query_promises(order='text')
+        with pytest.raises(ValueError):
+            db.query_promises(cursor='not-a-cursor')
+
+
+class TestStreamedPromiseDicts:
+    def test_matches_promise_to_dict(self, db, seeded):
+        expected = [promise.to_dict() for promise in db.get_all_promises(category='Economy')]
+
+        assert list(db.iter_promise_dicts({'category': 'Economy'}, batch_size=4)) == expected
+        assert len(list(db.iter_promise_dicts(batch_size=5))) == len(seeded)
+
+    def test_fields_limit_the_keys(self, db, seeded):
+        first = next(db.iter_promise_dicts(fields=['text', 'sources', 'text']))
+
+        assert list(first) == ['text', 'sources']
+        assert first['sources'][0]['url'].startswith("https://example.org/Promise-number-0")
+        with pytest.raises(ValueError, match="Unknown promise fields: secret"):
+            db.iter_promise_dicts(fields=['text', 'secret'])
+
+    def test_sources_are_loaded_per_batch(self, db, seeded, count_queries):
+        dicts, queries = count_queries(db, lambda: list(db.iter_promise_dicts(batch_size=5)))
+        _, without_sources = count_queries(db, lambda: list(db.iter_promise_dicts(fields=['id'], batch_size=5)))
+
+        assert len(dicts) == 12
+        assert queries == 4  # One cursor, three batches of sources
+        assert without_sources == 1
+
+
+class TestFullTextSearch:
+    def test_prefix_terms_must_all_match(self, db, make_promise):
+        wall = db.add_promise(make_promise("Build a wall on the southern border"))
+        db.add_promise(make_promise("Bring manufacturing jobs back"))
+
+        assert [result.promise.id for result in db.search_promises('bord sou')] == [wall]
+        assert db.search_promises('border jobs') == []
+        assert db.search_promises('  ?! ') == []
+
+    def test_text_matches_rank_above_tag_matches(self, db, make_promise):
+        tagged = db.add_promise(make_promise("Lower prices at the pump", tags=['energy']))
+        text = db.add_promise(make_promise("Unleash American energy production", days_ago=1))
+
+        results = db.search_promises('energy')
+
+        assert [result.promise.id for result in results] == [text, tagged]
+        assert results[0].score > results[1].score
+
+    def test_snippets_mark_the_matches(self, db, make_promise):
+        db.add_promise(make_promise("Cut taxes for working families"))
+
+        snippet = db.search_promises('taxes')[0].snippet
+
+        assert snippet == f"Cut {HIGHLIGHT_START}taxes{HIGHLIGHT_END} for working families"
+
+    def test_index_follows_text_changes_and_deletes(self, db, seeded):
+        assert db.search_promises('manufacturing') == []
+
+        db.patch_promise(seeded[3], {'text': 'Bring manufacturing jobs back home'})
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM promises WHERE id = ?", (seeded[4],))
+            conn.commit()
+
+        assert [result.promise.id for result in db.search_promises('manufact')] == [seeded[3]]
+        found = {result.promise.id for result in db.search_promises('security')}
+        assert found == set(seeded) - {seeded[3], seeded[4]}
+
+    def test_existing_rows_are_indexed_once(self, db, seeded):
+        reopened = DatabaseManager(db.db_path)
+
+        assert len(reopened.search_promises('relief')) == len(seeded)
+
+    def test_like_fallback_without_fts5(self, db, seeded):
+        db.fts_enabled = False
+
+        results = db.search_promises('number 1')
+
+        assert {result.promise.id for result in results} == {seeded[1], seeded[10], seeded[11]}
+
+
+class TestAnalyticsAggregates:
+    def test_aggregates_follow_inserts_updates_and_deletes(self, db, seeded):
+        db.update_status(seeded[0], PromiseStatus.FULFILLED)
+        db.update_progress(seeded[1], 80.0)
+        db.patch_promise(seeded[2], {'category': 'Trade'})
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM promises WHERE id = ?", (seeded[3],))
+            conn.commit()
+
+        assert db.check_aggregates() == []
+        analytics = db.get_analytics_data()
+        assert analytics['total_promises'] == len(seeded) - 1
+        assert analytics['promises_by_status'] == {'Fulfilled': 1, 'In Progress': 8, 'Not Started': 2}
+        assert analytics['promises_by_category'] == {'Economy': 5, 'Immigration': 5, 'Trade': 1}
+        assert analytics['fulfillment_by_category']['Immigration'] == pytest.approx(20.0)
+        assert analytics['fulfillment_rate'] == pytest.approx(100 / 11)
+        assert analytics['average_progress'] == pytest.approx(80 / 11)
+
+    def test_empty_pairs_are_dropped(self, db, make_promise):
+        promise_id = db.add_promise(make_promise(category='Trade'))
+        db.patch_promise(promise_id, {'category': 'Energy'})
+
+        with db.get_connection() as conn:
+            pairs = conn.execute("SELECT category FROM promise_aggregates").fetchall()
+        assert [row['category'] for row in pairs] == ['Energy']
+
+    def test_drift_is_detected_and_rebuilt(self, db, seeded):
+        with db.get_connection() as conn:
+            conn.execute("UPDATE promise_aggregates SET promise_count = promise_count + 1")
+            conn.commit()
+
+        assert {(m['status'], m['category']) for m in db.check_aggregates()} == \
+            {('Not Started', 'Economy'), ('Not Started', 'Immigration'),
+             ('In Progress', 'Economy'), ('In Progress', 'Immigration')}
+        db.rebuild_aggregates()
+        assert db.check_aggregates() == []
+
+    def test_reads_do_not_scan_promises(self, db, seeded, count_queries):
+        _, queries = count_queries(db, db.get_analytics_data)
+
+        assert queries == 1
+
+    def test_recent_promises_by_category(self, db, seeded, count_queries):
+        by_category, queries = count_queries(db, lambda: db.recent_promises_by_category(2))
+
+        assert queries == 1
+        assert {category: [promise.id for promise in promises] for category, promises in by_category.items()} == \
+            {'Immigration': [seeded[0], seeded[2]], 'Economy': [seeded[1], seeded[3]]}
+
+
+def link_state(source_id):
+    now = datetime.now().isoformat()
+    return dict(source_id=source_id, url="https://example.org/state", etag=None, last_modified=None, is_valid=1,
+                status_code=200, error_message=None, last_checked=now, next_check_at=now, ttl_seconds=60,
+                success_streak=1, failure_streak=0)
+
+
+def raw_update(db, sql):
+    with db.get_connection() as conn:
+        conn.execute(sql)
+        conn.commit()
+
+
+def fix_placeholders(db):
+    validator = LinkValidator(db)
+    try:
+        assert validator.auto_fix_placeholder_sources() == 1
+    finally:
+        validator.close()
+
+
+class TestDataVersion:
+    """Every write bumps the version, whichever code path makes it."""
+
+    @pytest.mark.parametrize('write', [
+        lambda db, promise_id, source_id: db.patch_promise(promise_id, {'status': 'Fulfilled'}),
+        lambda db, promise_id, source_id: db.add_progress_update(ProgressUpdate(
+            promise_id=promise_id, update_text="Bill signed", date=datetime(2024, 7, 1), impact_score=0.5)),
+        lambda db, promise_id, source_id: db.save_promise_metrics({'abc': dict.fromkeys(db.METRIC_COLUMNS, 1)}),
+        lambda db, promise_id, source_id: db.record_validation_run(datetime.now(), [dict(
+            source_id=source_id, url="https://example.com/speech", is_valid=True, status_code=200,
+            latency_ms=5.0, error_message=None)]),
+        lambda db, promise_id, source_id: db.save_link_states([link_state(source_id)]),
+        lambda db, promise_id, source_id: raw_update(db, "UPDATE sources SET reliability_score = 0.5"),
+        lambda db, promise_id, source_id: raw_update(db, f"DELETE FROM promises WHERE id = {promise_id}"),
+        lambda db, promise_id, source_id: fix_placeholders(db),
+    ], ids=['patch', 'progress', 'metrics', 'validation-run', 'link-states', 'raw-update', 'raw-delete',
+            'auto-fix'])
+    def test_writes_bump_the_version(self, db, make_promise, write):
+        promise_id = db.add_promise(make_promise(sources=[Source(
+            url="https://example.com/speech", title="Placeholder", source_type=SourceType.RALLY_SPEECH)]))
+        source_id = db.get_promise(promise_id).sources[0].id
+        version, modified = db.get_data_version()
+
+        write(db, promise_id, source_id)
+
+        new_version, new_modified = db.get_data_version()
+        assert new_version > version
+        assert new_modified >= modified and new_modified.tzinfo == timezone.utc
+
+    def test_reads_and_rollbacks_keep_the_version(self, db, seeded):
+        version = db.get_data_version()
+
+        db.get_all_promises()
+        with db.get_connection() as conn:
+            conn.execute("UPDATE promises SET notes = 'discarded'")
+            conn.rollback()
+
+        assert db.get_data_version() == version
+
+    def test_counter_carries_on_from_schema_meta(self, db, tmp_path):
+        with db.get_connection() as conn:
+            conn.execute("DROP TABLE data_version")
+            conn.execute("INSERT INTO schema_meta (key, value) VALUES ('data_version', '41'), "
+                         "('data_modified', '2024-06-01T12:00:00+00:00')")
+            conn.commit()
+
+        reopened = DatabaseManager(str(tmp_path / 'promises.db'))
+
+        assert reopened.get_data_version() == (41, datetime(2024, 6, 1, 12, tzinfo=timezone.utc))
+        reopened.add_source(Source(url=None, title="New", source_type=SourceType.OTHER))
+        assert reopened.get_data_version()[0] == 42
+
+
+class TestTagIndex:
+    def test_tags_follow_the_json_column(self, db, seeded):
+        assert db.get_tag_counts() == {'border': 6, 'jobs': 6, 'tax': 6}
+
+        db.patch_promise(seeded[0], {'tags': ['energy', 'energy', '']})
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM promises WHERE id = ?", (seeded[1],))
+            conn.execute("UPDATE promises SET tags = 'not json' WHERE id = ?", (seeded[2],))
+            conn.commit()
+
+        assert db.get_tag_counts() == {'border': 5, 'jobs': 4, 'tax': 4, 'energy': 1}
+        assert db.get_tag_counts(limit=1) == {'border': 5}
+        assert [promise.id for promise in db.promises_by_tag('energy')] == [seeded[0]]
+
+    def test_tag_filter_uses_the_index(self, db, seeded):
+        page = db.query_promises({'tag': 'jobs', 'category': 'Immigration'}, limit=3)
+
+        assert [promise.id for promise in page.promises] == seeded[0:6:2]
+        assert db.count_promises({'tag': 'jobs'}) == 6
+        assert [promise.id for promise in db.promises_by_tag('border', limit=2)] == [seeded[1], seeded[3]]
+        with db.get_connection() as conn:
+            plan = " ".join(row[3] for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT promise_id FROM promise_tags WHERE tag = ?", ('jobs',)))
+        assert "USING PRIMARY KEY" in plan or "USING COVERING INDEX" in plan
+
+    def test_existing_promises_are_backfilled(self, db, seeded, tmp_path):
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM promise_tags")
+            conn.execute("DELETE FROM schema_meta WHERE key = 'tags_built'")
+            conn.commit()
+
+        reopened = DatabaseManager(str(tmp_path / 'promises.db'))
+
+        assert reopened.get_tag_counts() == {'border': 6, 'jobs': 6, 'tax': 6}
+
+
+def similar_edges(db):
+    with db.get_connection() as conn:
+        return {tuple(row) for row in conn.execute(
+            "SELECT promise_id, related_id, score FROM promise_relations WHERE kind = 'similar'")}
+
+
+class TestRelations:
+    def test_manual_relations_follow_related_promises(self, db, seeded):
+        db.patch_promise(seeded[0], {'related_promises': [seeded[5], seeded[0], 'bogus']})
+
+        assert (seeded[0], 1) in [(promise.id, hops) for promise, hops in db.get_related([seeded[5]])]
+        db.patch_promise(seeded[0], {'related_promises': []})
+        with db.get_connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM promise_relations WHERE kind = 'manual'").fetchone()[0] == 0
+
+    def test_walks_both_directions_up_to_depth(self, db, make_promise):
+        first, second, third = (db.add_promise(make_promise(f"Unique words {word}", related_promises=[]))
+                                for word in ['alpha', 'beta', 'gamma'])
+        db.patch_promise(second, {'related_promises': [first]})
+        db.patch_promise(third, {'related_promises': [second]})
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM promise_relations WHERE kind = 'similar'")
+            conn.commit()
+
+        assert [(promise.id, hops) for promise, hops in db.get_related([first], depth=1)] == [(second, 1)]
+        assert [(promise.id, hops) for promise, hops in db.get_related([first], depth=2)] == [(second, 1), (third, 2)]
+        assert [promise.id for promise, _ in db.get_related([first, second], depth=2)] == [third]
+
+    def test_similar_edges_match_a_rebuild_after_text_changes(self, db, seeded):
+        db.rebuild_relations()
+        # seeded[4] was in its neighbours' lists; they must be recomputed, not just lose the edge
+        db.patch_promise(seeded[4], {'text': "Completely unrelated words here"})
+        incremental = similar_edges(db)
+
+        db.rebuild_relations()
+
+        assert incremental == similar_edges(db)
+        assert all(seeded[4] not in (owner, related) for owner, related, _ in incremental)
+
+    def test_lookups_are_bounded(self, db, seeded, make_promise, monkeypatch):
+        queries = []
+        query = db.similarity.query
+        monkeypatch.setattr(db.similarity, 'query',
+                            lambda *args, **kwargs: queries.append(kwargs) or query(*args, **kwargs))
+
+        promise_id = db.add_promise(make_promise("Promise about border security and tax relief"))
+
+        assert [kwargs['max_candidates'] for kwargs in queries] == [DatabaseManager.RELATED_CANDIDATES]
+        assert len([owner for owner, _, _ in similar_edges(db) if owner == promise_id]) == DatabaseManager.RELATED_LIMIT
+
+    def test_startup_does_not_score_similarity(self, db, seeded, tmp_path, monkeypatch):
+        db.patch_promise(seeded[0], {'related_promises': [seeded[1]]})
+        db.rebuild_relations()
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM schema_meta WHERE key = 'relations_by_owner_built'")
+            conn.commit()
+        monkeypatch.setattr(DatabaseManager, '_link_similar', lambda *args: pytest.fail("similarity scored"))
+
+        reopened = DatabaseManager(str(tmp_path / 'promises.db'))
+
+        # Old similar edges are dropped until rebuild-relations; manual ones are restored
+        assert similar_edges(reopened) == set()
+        assert [promise.id for promise, _ in reopened.get_related([seeded[0]])] == [seeded[1]]
+
+
+class TestPromiseEvents:
+    def test_initial_status_is_recorded_and_deleted_with_the_promise(self, db, make_promise):
+        started = db.add_promise(make_promise("Build the wall", status=PromiseStatus.IN_PROGRESS))
+        not_started = db.add_promise(make_promise("Cut taxes"))
+
+        assert [(event.kind, event.old_value, event.new_value, event.changed_at)
+                for event in db.get_promise_events(started)] == \
+            [('status', None, 'In Progress', make_promise().date_updated)]
+        assert db.get_promise_events(not_started) == []
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM promises WHERE id = ?", (started,))
+            conn.commit()
+        assert db.get_promise_events(started) == []
+
+    def test_status_and_progress_changes_are_recorded_with_their_note(self, db, make_promise):
+        promise_id = db.add_promise(make_promise())
+
+        assert db.update_status(promise_id, PromiseStatus.IN_PROGRESS, "Bill introduced")
+        assert db.update_progress(promise_id, 40.0)
+        assert db.update_progress(promise_id, 40.0)  # Unchanged and without a note: nothing to record
+        assert db.update_status(promise_id, PromiseStatus.FULFILLED, "Signed into law")
+        assert not db.update_status(promise_id + 1, PromiseStatus.FULFILLED)
+
+        assert [(event.kind, event.old_value, event.new_value, event.note)
+                for event in db.get_promise_events(promise_id)] == [
+            ('status', 'In Progress', 'Fulfilled', "Signed into law"),
+            ('progress', 0.0, 40.0, ""),
+            ('status', 'Not Started', 'In Progress', "Bill introduced")]
+        assert [event.new_value for event in db.get_promise_events(promise_id, kind='progress')] == [40.0]
+        assert "Signed into law" not in db.get_promise(promise_id).notes
+        assert db.get_event_summary(datetime(2024, 1, 1)) == {'status_changes': 2, 'fulfilled_count': 1}
+
+    def test_history_is_backfilled_from_notes(self, db, make_promise, tmp_path):
+        promise_id = db.add_promise(make_promise(status=PromiseStatus.IN_PROGRESS, notes="\n".join([
+            "[2024-03-01] Status changed to In Progress: Bill introduced",
+            "[2024-04-01] Progress updated from 0.0% to 40.0%: ",
+            "Not a change line"])))
+        stalled = db.add_promise(make_promise("Lower energy prices", status=PromiseStatus.STALLED))
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM promise_events")
+            conn.execute("DELETE FROM schema_meta WHERE key = 'events_built'")
+            conn.commit()
+
+        reopened = DatabaseManager(str(tmp_path / 'promises.db'))
+
+        assert [(event.kind, event.old_value, event.new_value, event.note, event.changed_at)
+                for event in reopened.get_promise_events(promise_id)] == [
+            ('progress', 0.0, 40.0, "", datetime(2024, 4, 1)),
+            ('status', None, 'In Progress', "Bill introduced", datetime(2024, 3, 1))]
+        # No change lines: the current status is explained by one event at date_updated
+        assert [(event.old_value, event.new_value, event.changed_at)
+                for event in reopened.get_promise_events(stalled)] == \
+            [(None, 'Stalled', make_promise().date_updated)]
+        reopened.close()
+
+
+class TestOptimisticConcurrency:
+    def test_patch_bumps_the_version(self, db, make_promise):
+        promise_id = db.add_promise(make_promise())
+        assert db.get_promise(promise_id).version == 1
+
+        assert db.patch_promise(promise_id, {'priority': 5}) == 2
+        assert db.patch_promise(promise_id, {'tags': ['economy']}, expected_version=2) == 3
+
+        promise = db.get_promise(promise_id)
+        assert (promise.version, promise.priority, promise.tags) == (3, 5, ['economy'])
+
+    def test_stale_version_is_rejected_without_writing(self, db, make_promise):
+        promise_id = db.add_promise(make_promise())
+        db.patch_promise(promise_id, {'priority': 4})
+
+        with pytest.raises(StaleVersionError) as excinfo:
+            db.patch_promise(promise_id, {'priority': 1}, expected_version=1)
+
+        assert (excinfo.value.expected_version, excinfo.value.current_version) == (1, 2)
+        promise = db.get_promise(promise_id)
+        assert (promise.version, promise.priority) == (2, 4)
+
+    def test_status_and_progress_updates_check_the_version(self, db, make_promise):
+        promise_id = db.add_promise(make_promise())
+
+        assert db.update_status(promise_id, PromiseStatus.FULFILLED, "Signed", expected_version=1)
+        with pytest.raises(StaleVersionError):
+            db.update_progress(promise_id, 50.0, expected_version=1)
+
+        assert db.get_promise(promise_id).progress_percentage == 0.0
+        assert [(event.kind, event.new_value) for event in db.get_promise_events(promise_id)] == \
+            [('status', 'Fulfilled')]
+
+    def test_update_promise_bumps_the_version(self, db, make_promise):
+        promise_id = db.add_promise(make_promise())
+        promise = db.get_promise(promise_id)
+        promise.notes = "Edited"
+
+        assert db.update_promise(promise)
+        assert db.get_promise(promise_id).version == 2
+
+    def test_unversioned_writers_do_not_lose_updates(self, db, make_promise):
+        promise_id = db.add_promise(make_promise())
+
+        def write(priority):
+            for _ in range(20):
+                db.patch_promise(promise_id, {'priority': priority})
+        threads = [threading.Thread(target=write, args=(priority,)) for priority in range(1, 5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert db.get_promise(promise_id).version == 81
+
+    def test_missing_promise_and_unknown_field(self, db, make_promise):
+        promise_id = db.add_promise(make_promise())
+
+        assert db.patch_promise(promise_id + 1, {'priority': 2}) is None
+        with pytest.raises(ValueError, match="Cannot patch promise fields: version"):
+            db.patch_promise(promise_id, {'version': 7})
+
+
+class TestTimestampMigration:
+    def snapshot(self, db, seeded):
+        return ([promise.to_dict() for promise in db.get_all_promises()],
+                [promise.to_dict() for promise in db.query_promises(limit=50).promises],
+                [(event.kind, event.new_value, event.changed_at) for event in db.get_promise_events(seeded[0])],
+                db.get_monthly_counts())
+
+    def test_round_trip_keeps_every_value(self, db, seeded):
+        db.update_status(seeded[0], PromiseStatus.FULFILLED, "Done")
+        before = self.snapshot(db, seeded)
+
+        assert db.migrate_timestamps('epoch_us') > len(seeded)
+        with db.get_connection() as conn:
+            assert conn.execute("SELECT typeof(date_updated) FROM promises LIMIT 1").fetchone()[0] == 'integer'
+        assert self.snapshot(db, seeded) == before
+
+        db.migrate_timestamps('iso')
+        with db.get_connection() as conn:
+            assert conn.execute("SELECT typeof(date_updated) FROM promises LIMIT 1").fetchone()[0] == 'text'
+        assert self.snapshot(db, seeded) == before
+
+    def test_format_is_recorded_and_triggers_survive(self, db, seeded, make_promise):
+        db.migrate_timestamps('epoch_us')
+        assert db.migrate_timestamps('epoch_us') == 0
+
+        reopened = DatabaseManager(db.db_path)
+        assert reopened.timestamp_format == 'epoch_us'
+        promise_id = reopened.add_promise(make_promise("Lower energy prices", tags=['energy'],
+                                                       status=PromiseStatus.STALLED))
+        version, _ = reopened.get_data_version()
+        raw_update(reopened, f"UPDATE promises SET priority = 1 WHERE id = {seeded[0]}")
+
+        assert reopened.check_aggregates() == []
+        assert reopened.get_tag_counts()['energy'] == 1
+        assert [event.new_value for event in reopened.get_promise_events(promise_id)] == ['Stalled']
+        assert reopened.get_promise(promise_id).date_updated == make_promise().date_updated
+        assert reopened.get_data_version()[0] == version + 1
+        reopened.close()
+
+    def test_new_ids_continue_after_deleted_rows(self, db, seeded, make_promise):
+        raw_update(db, f"DELETE FROM promises WHERE id = {seeded[-1]}")
+
+        db.migrate_timestamps('epoch_us')
+
+        assert db.add_promise(make_promise("A brand new promise")) == seeded[-1] + 1
+
+    def test_timezone_aware_values_are_stored_as_utc(self, tmp_path, make_promise):
+        db = DatabaseManager(str(tmp_path / 'epoch.db'), timestamp_format='epoch_us')
+        aware = datetime(2024, 1, 1, 2, 0, tzinfo=timezone(timedelta(hours=2)))
+
+        promise_id = db.add_promise(make_promise(date_made=None))
+        db.patch_promise(promise_id, {'date_made': aware})
+
+        assert db.get_promise(promise_id).date_made == datetime(2024, 1, 1, 0, 0)
+        db.close()
+
+    def test_unknown_format_is_rejected(self, db, tmp_path):
+        with pytest.raises(ValueError, match="Unknown timestamp format 'unix'"):
+            db.migrate_timestamps('unix')
+        with pytest.raises(ValueError, match="Unknown timestamp format 'unix'"):
+            DatabaseManager(str(tmp_path / 'unix.db'), timestamp_format='unix')
@@ -0,0 +1,158 @@
+"""
+Tests for the concurrent fetcher and the fetch/parse pipeline.
+"""
+
+import asyncio
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+import requests
+
+from app.fetcher import AsyncFetcher, run_pipeline, stream_pipeline
+
+
+class Handler(BaseHTTPRequestHandler):
+    """/flaky fails twice, /limited asks for a pause once, /gone is a 404 and /down always fails."""
+
+    def do_GET(self):
+        self.server.requests.append((self.path, time.monotonic()))
+        seen = Counter(path for path, _ in self.server.requests)[self.path]
+        headers = {'Content-Type': 'text/html'}
+        if self.path == '/flaky' and seen <= 2 or self.path == '/down':
+            status = 503
+        elif self.path == '/limited' and seen == 1:
+            status, headers['Retry-After'] = 429, '0.3'
+        elif self.path == '/gone':
+            status = 404
+        else:
+            status = 200
+        if self.path == '/latin':
+            headers['Content-Type'] = 'text/html; charset=iso-8859-1'
+
+        body = f"<p>{self.path}</p>".encode()
+        self.send_response(status)
+        for name, value in dict(headers, **{'Content-Length': str(len(body))}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(http_server):
+    return http_server(Handler)
+
+
+@pytest.fixture
+def make_fetcher():
+    sessions = []
+
+    def make(**options):
+        sessions.append(requests.Session())
+        options = dict({'domain_delay': 0, 'backoff': 0.01, 'timeout': 5}, **options)
+        return AsyncFetcher(sessions[-1], **options)
+    yield make
+    for session in sessions:
+        session.close()
+
+
+def fetch(fetcher, urls, consume=None):
+    """Run ``fetch_all`` to completion, returning results by URL."""
+    async def collect():
+        return {result.url: result async for result in fetcher.fetch_all(urls, consume)}
+    return asyncio.run(collect())
+
+
+class TestAsyncFetcher:
+    def test_transient_failures_are_retried(self, server, make_fetcher):
+        results = fetch(make_fetcher(max_retries=3), [f"{server.url}/flaky", f"{server.url}/gone",
+                                                      f"{server.url}/down", f"{server.url}/ok"])
+
+        flaky, gone, down, ok = (results[f"{server.url}{path}"] for path in ['/flaky', '/gone', '/down', '/ok'])
+        assert (flaky.content, flaky.attempts, flaky.error) == (b"<p>/flaky</p>", 3, None)
+        assert (gone.content, gone.attempts, gone.status_code, gone.error) == (None, 1, 404, "HTTP 404")
+        assert (down.content, down.attempts, down.error) == (None, 4, "HTTP 503")
+        assert (ok.status_code, ok.attempts) == (200, 1)
+
+    def test_connection_errors_are_reported(self, make_fetcher):
+        result = fetch(make_fetcher(max_retries=1), ["http://127.0.0.1:9/"])["http://127.0.0.1:9/"]
+
+        assert (result.content, result.status_code, result.attempts) == (None, 0, 2)
+        assert result.error
+
+    def test_retry_after_is_honoured(self, server, make_fetcher):
+        result = fetch(make_fetcher(), [f"{server.url}/limited"])[f"{server.url}/limited"]
+
+        first, second = (at for _, at in server.requests)
+        assert result.attempts == 2
+        assert second - first >= 0.3
+
+    def test_requests_to_one_domain_are_spaced(self, http_server, make_fetcher):
+        busy, other = http_server(Handler), http_server(Handler)
+        urls = [f"{busy.url}/page/{i}" for i in range(4)] + [f"{other.url}/page/{i}" for i in range(2)]
+
+        results = fetch(make_fetcher(domain_delay=0.1), urls)
+
+        assert set(results) == set(urls)
+        busy_times = [at for _, at in busy.requests]
+        other_times = [at for _, at in other.requests]
+        assert all(later - earlier >= 0.09 for earlier, later in zip(busy_times, busy_times[1:]))
+        assert other_times[0] < busy_times[1]  # Another domain doesn't wait behind the busy one
+
+    def test_bodies_can_be_streamed_to_a_consumer(self, server, make_fetcher):
+        bodies = {}
+
+        def consume(result, chunks):
+            bodies[result.url] = list(chunks)
+
+        fetcher = make_fetcher(max_retries=2)
+        fetcher.CHUNK_SIZE = 4
+        results = fetch(fetcher, [f"{server.url}/flaky", f"{server.url}/gone"], consume)
+
+        flaky = results[f"{server.url}/flaky"]
+        assert (flaky.content, flaky.error, flaky.attempts) == (None, None, 3)
+        assert bodies == {f"{server.url}/flaky": [b"<p>/", b"flak", b"y</p", b">"]}
+        assert results[f"{server.url}/gone"].error == "HTTP 404"
+
+    def test_declared_charset_is_kept(self, server, make_fetcher):
+        results = fetch(make_fetcher(), [f"{server.url}/latin", f"{server.url}/ok", f"{server.url}/ok"])
+
+        assert len(server.requests) == 2  # Duplicate URLs are fetched once
+        assert results[f"{server.url}/latin"].encoding.lower() == 'iso-8859-1'
+        assert results[f"{server.url}/ok"].encoding is None
+
+
+def test_pipeline_keeps_url_order_and_skips_failures(server, make_fetcher, capsys):
+    def parse(result):
+        if result.url.endswith('/broken'):
+            raise ValueError("unparseable")
+        return [result.url, len(result.content)]
+
+    urls = [f"{server.url}/page/{i}" for i in range(6)] + [f"{server.url}/gone", f"{server.url}/broken"]
+
+    items = run_pipeline(make_fetcher(max_concurrency=3), reversed(urls), parse, parse_workers=2)
+
+    expected = [item for url in reversed(urls[:6]) for item in (url, len(f"<p>{url[len(server.url):]}</p>"))]
+    assert items == expected
+    output = capsys.readouterr().out
+    assert "Error fetching" in output and "Error parsing" in output
+
+
+def test_stream_pipeline_yields_parsed_items(server, make_fetcher, capsys):
+    def parse(result, chunks):
+        if result.url.endswith('/broken'):
+            raise ValueError("unparseable")
+        for chunk in chunks:
+            yield result.url, chunk
+
+    urls = [f"{server.url}/page/{i}" for i in range(5)] + [f"{server.url}/gone", f"{server.url}/broken"]
+
+    items = list(stream_pipeline(make_fetcher(max_concurrency=2), urls, parse, buffer=2))
+
+    assert sorted(items) == sorted((url, f"<p>{url[len(server.url):]}</p>".encode()) for url in urls[:5])
+    output = capsys.readouterr().out
+    assert f"Error fetching {server.url}/gone" in output and f"Error parsing {server.url}/broken" in output
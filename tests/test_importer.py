@@ -0,0 +1,128 @@
+"""
+Tests for the JSONL/CSV readers, bulk_add_promises and the import command.
+"""
+
+import json
+import re
+
+import pytest
+from click.testing import CliRunner
+
+from app.cli import cli
+from app.importer import iter_promises
+from app.models import PromiseStatus, Source, SourceType
+
+
+def write_jsonl(path, records):
+    path.write_text("".join((record if isinstance(record, str) else json.dumps(record)) + "\n"
+                            for record in records), encoding='utf-8')
+    return str(path)
+
+
+@pytest.fixture
+def run_cli(db, monkeypatch):
+    """Invoke the CLI against the test database."""
+    monkeypatch.setattr('app.cli.DatabaseManager', lambda *args, **kwargs: db)
+
+    def run(*args):
+        result = CliRunner().invoke(cli, list(args))
+        assert result.exception is None, result.output
+        return result.output
+    return run
+
+
+class TestReaders:
+    def test_jsonl_round_trip(self, tmp_path, make_promise):
+        promise = make_promise("Cut taxes for working families", tags=['tax', 'jobs'], notes="Key pledge",
+                               status=PromiseStatus.IN_PROGRESS, progress_percentage=40.0)
+        path = write_jsonl(tmp_path / 'promises.jsonl', [promise.to_dict(), "", {'text': "Bare promise"}])
+
+        imported, bare = iter_promises(path)
+
+        assert imported.to_dict() == dict(promise.to_dict(), sources=imported.to_dict()['sources'])
+        assert [source.url for source in imported.sources] == [promise.sources[0].url]
+        assert (bare.text, bare.category, bare.status, bare.sources) == \
+            ("Bare promise", "Other", PromiseStatus.NOT_STARTED, [])
+
+    def test_csv(self, tmp_path):
+        path = tmp_path / 'promises.csv'
+        path.write_text("text,category,status,tags,source_url,source_title,source_type,source_date\n"
+                        "Build the wall,Immigration,In Progress,border; wall ,https://example.org/wall,Rally,"
+                        "Rally Speech,2016-08-31\n"
+                        "Drain the swamp,Other,,,,,,\n", encoding='utf-8')
+
+        wall, swamp = iter_promises(str(path))
+
+        assert (wall.category, wall.status, wall.tags) == ('Immigration', PromiseStatus.IN_PROGRESS, ['border', 'wall'])
+        assert (wall.sources[0].url, wall.sources[0].source_type) == ("https://example.org/wall", SourceType.RALLY_SPEECH)
+        assert (swamp.status, swamp.tags, swamp.sources) == (PromiseStatus.NOT_STARTED, [], [])
+
+    @pytest.mark.parametrize('line, error', [
+        ('[1, 2]', "expected a JSON object, got list"),
+        ('"just text"', "expected a JSON object, got str"),
+        ('{"category": "Economy"}', "promise record has no text"),
+        ('{"text": "A promise", "sources": ["https://example.org"]}', "'sources' must be a list of objects"),
+        ('{"text": "A promise", "tags": "border"}', "'tags' must be a list of strings"),
+        ('{"text": "A promise", "status": "Done"}', "'Done' is not a valid PromiseStatus"),
+        ('{"text": "A promise", "priority": [1]}', "int() argument"),
+        ('{"text": ', "Expecting value"),
+    ])
+    def test_bad_lines_are_reported_with_their_number(self, tmp_path, line, error):
+        path = write_jsonl(tmp_path / 'bad.jsonl', [{'text': "Fine"}, "", line])
+
+        promises = iter_promises(path)
+
+        assert next(promises).text == "Fine"
+        with pytest.raises(ValueError, match=rf"bad\.jsonl:3: .*{re.escape(error)}"):
+            next(promises)
+
+
+class TestBulkImport:
+    def test_sources_are_deduplicated_across_batches_and_existing_rows(self, db, make_promise):
+        existing = db.add_source(Source(url="https://example.org/shared", title="Shared",
+                                        source_type=SourceType.INTERVIEW))
+        shared = Source(url="https://example.org/shared", title="Shared", source_type=SourceType.INTERVIEW)
+        promises = [make_promise(f"Imported promise {i}", sources=[
+            Source(url="https://example.org/shared", title="Shared", source_type=SourceType.INTERVIEW),
+            Source(url=f"https://example.org/{i % 2}", title="Own", source_type=SourceType.OTHER),
+            Source(url=None, title="No URL", source_type=SourceType.OTHER)]) for i in range(5)]
+        promises[0].sources.append(shared)
+
+        assert db.bulk_add_promises(iter(promises), batch_size=2) == 5
+
+        with db.get_connection() as conn:
+            urls = [row[0] for row in conn.execute("SELECT url FROM sources ORDER BY id")]
+        assert urls == ["https://example.org/shared", "https://example.org/0", None, "https://example.org/1",
+                        None, None, None, None]
+        stored = {promise.text: promise for promise in db.get_all_promises()}
+        assert {source.id for promise in stored.values() for source in promise.sources
+                if source.url == "https://example.org/shared"} == {existing}
+        assert [source.url for source in stored["Imported promise 3"].sources] == \
+            ["https://example.org/shared", "https://example.org/1", None]
+
+
+class TestImportCommand:
+    def test_link_related_links_each_batch(self, db, run_cli, tmp_path):
+        def similar_edges():
+            with db.get_connection() as conn:
+                rows = conn.execute("SELECT promise_id, related_id FROM promise_relations WHERE kind = 'similar'")
+                return {(row[0], row[1]) for row in rows}
+        path = write_jsonl(tmp_path / 'promises.jsonl',
+                           [{'text': f"Cut taxes for working families in state {i}"} for i in range(3)])
+
+        assert "Imported 3 promises" in run_cli('import', path, '--batch-size', '2')
+        assert similar_edges() == set()
+        assert "Imported 3 promises" in run_cli('import', path, '--batch-size', '2', '--link-related')
+
+        # Imports link to stored promises and earlier batches; older lists wait for rebuild-relations
+        assert similar_edges() == {(4, 1), (4, 2), (4, 3), (4, 5), (5, 1), (5, 2), (5, 3), (5, 4),
+                                   (6, 1), (6, 2), (6, 3), (6, 4), (6, 5)}
+        assert db.count_promises() == 6
+
+    def test_bad_line_stops_the_import_after_committed_batches(self, db, run_cli, tmp_path):
+        path = write_jsonl(tmp_path / 'promises.jsonl', [{'text': "First"}, {'text': "Second"}, '["not", "a promise"]'])
+
+        output = run_cli('import', path, '--batch-size', '1')
+
+        assert f"Import stopped: {path}:3: expected a JSON object, got list" in output
+        assert [promise.text for promise in db.get_all_promises()] == ["Second", "First"]
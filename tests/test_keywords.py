@@ -0,0 +1,88 @@
+"""
+Tests for the Aho-Corasick keyword matcher and the scraper checks built on it.
+"""
+
+import random
+
+import pytest
+
+from app.keywords import KeywordMatcher
+from app.scraper import PromiseScraper
+
+
+def naive_find(keywords, text):
+    return frozenset(keyword for keyword in keywords if keyword and keyword in text)
+
+
+SENTENCES = [
+    "We will build a wall and Mexico will pay for it",
+    "On day one I will sign an executive order to cut taxes",
+    "Maybe we could possibly look at healthcare, I promise nothing",
+    "I'm going to bring back jobs and energy and trade deals",
+    "Within the first 100 days we plan to rebuild roads and bridges",
+    "We're going to guarantee the border is secure immediately",
+    "Thank you all for coming",
+    "IRS deductions, credits and revenue: we shall reduce them",
+    "willpower isn't a plan to anything",
+    "",
+]
+
+
+class TestKeywordMatcher:
+    def test_overlapping_and_nested_keywords(self):
+        matcher = KeywordMatcher(['he', 'she', 'his', 'hers', 'is a', 's', ''])
+
+        assert matcher.find("ushers") == {'he', 'she', 'hers', 's'}
+        assert matcher.find("this is a test") == {'his', 'is a', 's'}
+        assert matcher.find("  ") == frozenset()
+        assert matcher.keywords == {'he', 'she', 'his', 'hers', 'is a', 's'}
+
+    def test_matches_substring_search_on_random_text(self):
+        rng = random.Random(3)
+        keywords = ['ab', 'b a', 'abc', 'c', 'ca b', 'bb', 'a a a', ' ab', 'cab ']
+        matcher = KeywordMatcher(keywords)
+
+        for _ in range(2000):
+            text = "".join(rng.choice("abc  ") for _ in range(rng.randint(0, 20)))
+            assert matcher.find(text) == naive_find(keywords, text), repr(text)
+
+    def test_step_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(KeywordMatcher, 'MAX_CACHED_STEPS', 5)
+        keywords = ['going to', 'will', 'tax']
+        matcher = KeywordMatcher(keywords)
+
+        for sentence in SENTENCES * 3:
+            assert matcher.find(sentence.lower()) == naive_find(keywords, sentence.lower())
+            assert matcher._cached_steps <= 5 + len(sentence.split(' '))
+
+
+@pytest.fixture(scope='module')
+def scraper():
+    return PromiseScraper()
+
+
+class TestScraperKeywords:
+    """The scraper's checks give the same answers as scanning for each keyword separately."""
+
+    @pytest.mark.parametrize('sentence', SENTENCES)
+    def test_matches_per_keyword_scans(self, scraper, sentence):
+        text = sentence.lower()
+
+        def has(words):
+            return any(word in text for word in words)
+
+        assert scraper._is_likely_promise(sentence) == \
+            (has(scraper.promise_keywords) and has(scraper.future_indicators) and len(sentence.split()) >= 5)
+        assert scraper._contains_promise_language(sentence) == has(scraper.promise_keywords)
+
+        score = min(sum(keyword in text for keyword in scraper.promise_keywords) * 0.2, 0.6)
+        score += 0.3 * has(scraper.strong_commitments) + 0.2 * has(scraper.action_words)
+        score -= 0.2 * has(scraper.vague_words)
+        assert scraper._calculate_promise_confidence(sentence) == pytest.approx(min(max(score, 0.0), 1.0))
+
+        scores = {category: sum(keyword in text for keyword in keywords)
+                  for category, keywords in scraper.category_keywords.items()}
+        scores = {category: score for category, score in scores.items() if score}
+        assert scraper.categorize_promise(sentence) == (max(scores, key=scores.get) if scores else 'Other')
+
+        assert scraper._extract_tags(sentence) == [tag for tag, keywords in scraper.tag_rules if has(keywords)]
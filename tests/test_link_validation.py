@@ -0,0 +1,230 @@
+"""
+Tests for the link validator, against local HTTP servers.
+"""
+
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from app.models import Source, SourceType
+from link_validation_integration import get_link_validation_status, load_validation_results, run_validation_protocol
+from link_validation_protocol import LinkValidator, TokenBucket
+
+
+class Handler(BaseHTTPRequestHandler):
+    """/ok has an ETag, /missing is a 404 and /no-head only answers GET."""
+
+    def do_HEAD(self):
+        self.server.requests.append((self.command, self.path, time.monotonic()))
+        if self.path == '/no-head':
+            self.send_response(405)
+        elif self.path.startswith('/missing'):
+            self.send_response(404)
+        elif self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+        else:
+            self.send_response(200)
+            self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self):
+        self.server.requests.append((self.command, self.path, time.monotonic()))
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servers(http_server):
+    """Two servers, which the validator treats as two hosts."""
+    return [http_server(Handler), http_server(Handler)]
+
+
+def source(url):
+    return Source(url=url, title=f"Source at {url}", source_type=SourceType.OFFICIAL_STATEMENT)
+
+
+def check(source_id, is_valid=True, **fields):
+    return dict(source_id=source_id, url=f"https://example.org/{source_id}", is_valid=is_valid,
+                status_code=200 if is_valid else 404, latency_ms=5.0,
+                error_message=None if is_valid else "HTTP 404", **fields)
+
+
+@pytest.fixture
+def make_validator(db):
+    validators = []
+
+    def make(**options):
+        validator = LinkValidator(db, **options)
+        validators.append(validator)
+        return validator
+    yield make
+    for validator in validators:
+        validator.close()
+
+
+class TestLinkValidator:
+    def test_results_for_each_url(self, servers, make_validator):
+        base = servers[0].url
+        validator = make_validator(host_rate=100, host_burst=4)
+
+        results = validator.validate_urls([f"{base}/ok", f"{base}/missing", f"{base}/ok", "http://127.0.0.1:9/"])
+
+        assert list(results) == [f"{base}/ok", f"{base}/missing", "http://127.0.0.1:9/"]
+        assert results[f"{base}/ok"][:3] == (True, 200, "OK")
+        assert results[f"{base}/missing"][:3] == (False, 404, "HTTP 404")
+        assert results["http://127.0.0.1:9/"][:3] == (False, 0, "Connection Error")
+        assert len(servers[0].requests) == 2  # The duplicate URL is requested once
+
+    def test_head_not_allowed_falls_back_to_get(self, servers, make_validator):
+        server = servers[0]
+        validator = make_validator(host_rate=100, host_burst=1)
+
+        assert validator.validate_urls([f"{server.url}/no-head"])[f"{server.url}/no-head"][:2] == (True, 200)
+        assert validator.check_url(f"{server.url}/no-head")[:2] == (True, 200)
+        assert [request[:2] for request in server.requests] == [('HEAD', '/no-head'), ('GET', '/no-head')] * 2
+
+    def test_conditional_requests(self, servers, make_validator):
+        url = f"{servers[0].url}/ok"
+        validator = make_validator(host_rate=100)
+
+        first = validator.revalidate_urls({url: (None, None)})[url]
+        second = validator.revalidate_urls({url: (first['etag'], None)})[url]
+
+        assert (first['status_code'], first['etag']) == (200, '"v1"')
+        assert (second['status_code'], second['is_valid'], second['etag']) == (304, True, '"v1"')
+
+    def test_throttled_host_does_not_hold_up_other_hosts(self, servers, make_validator):
+        slow, fast = servers
+        validator = make_validator(max_workers=2, host_rate=5, host_burst=1)
+        urls = [f"{slow.url}/missing/{i}" for i in range(5)] + [f"{fast.url}/missing/{i}" for i in range(3)]
+
+        results = validator.validate_urls(urls)
+
+        assert len(results) == 8
+        slow_times = sorted(request[2] for request in slow.requests)
+        fast_times = sorted(request[2] for request in fast.requests)
+        # The slow host is limited to one request every 0.2s...
+        assert slow_times[-1] - slow_times[0] >= 0.7
+        # ...while the other host is served alongside it rather than after it
+        assert fast_times[0] < slow_times[1]
+        assert fast_times[-1] < slow_times[-1] - 0.2
+
+
+class TestValidationHistory:
+    def test_run_is_recorded_with_per_source_checks(self, db, servers, make_promise):
+        base = servers[0].url
+        promise_id = db.add_promise(make_promise(sources=[
+            source(f"{base}/ok"), source(f"{base}/missing"), source("https://example.com/placeholder")]))
+
+        results = run_validation_protocol(db)
+
+        summary = dict(results['summary'], validation_date=None)
+        assert summary == {'valid_count': 1, 'invalid_count': 1, 'placeholder_count': 1, 'total_count': 3,
+                           'skipped_count': 0, 'validation_date': None}
+        details = {detail['url']: detail for detail in results['details']}
+        assert details[f"{base}/ok"]['is_valid'] and details[f"{base}/ok"]['status_code'] == 200
+        assert details[f"{base}/missing"]['error_message'] == "HTTP 404"
+        assert details["https://example.com/placeholder"]['is_placeholder']
+        assert {detail['promise_id'] for detail in results['details']} == {promise_id}
+        assert get_link_validation_status(db)['summary'] == results['summary']
+
+    def test_skipped_sources_show_their_previous_check(self, db, make_promise):
+        db.add_promise(make_promise(sources=[source("https://example.org/1"), source("https://example.org/2")]))
+        first = db.record_validation_run(datetime.now(), [check(1), check(2, is_valid=False)])
+        second = db.record_validation_run(datetime.now(), [check(1, is_valid=False), check(2, is_valid=False, cached=True)])
+
+        run = db.get_validation_run(second)
+        assert (run['total_count'], run['valid_count'], run['invalid_count'], run['skipped_count']) == (2, 0, 2, 1)
+        details = {detail['source_id']: detail for detail in db.get_validation_details(second)}
+        assert details[1]['is_valid'] is False
+        assert details[2]['status_code'] == 404  # From the first run
+        assert [entry['run_id'] for entry in db.get_link_check_history(2)] == [first]
+        assert [entry['run_id'] for entry in db.get_link_check_history(1)] == [second, first]
+
+    def test_latest_run_and_one_off_checks(self, db, make_promise):
+        assert load_validation_results(db)['status'] == 'no_data'
+        assert get_link_validation_status(db)['status'] == 'no_data'
+        db.add_promise(make_promise(sources=[source("https://example.org/1")]))
+
+        db.record_validation_run(datetime.now(), [check(1)])
+        error_run = db.record_validation_run(datetime.now(), [], status='error', message="Network down")
+        db.record_link_check(1, "https://example.org/1", False, 500, 12.5, "HTTP 500")
+
+        results = load_validation_results(db)
+        assert (results['run_id'], results['status'], results['message']) == (error_run, 'error', "Network down")
+        history = db.get_link_check_history(1)
+        assert [(entry['run_id'], entry['status_code']) for entry in history] == [(None, 500), (error_run - 1, 200)]
+
+
+class TestIncrementalRevalidation:
+    def test_fresh_sources_are_skipped_and_others_revalidated(self, db, servers, make_promise, make_validator):
+        server = servers[0]
+        db.add_promise(make_promise(sources=[source(f"{server.url}/ok"), source(f"{server.url}/missing")]))
+        validator = make_validator(host_rate=100)
+
+        validator.validate_all_sources()
+        assert len(server.requests) == 2
+        states = {state['url']: state for state in db.get_link_states().values()}
+        assert states[f"{server.url}/ok"]['etag'] == '"v1"'
+
+        cached = validator.validate_all_sources(incremental=True)
+        assert len(server.requests) == 2
+        assert cached['summary']['checked_count'] == 0
+        assert all(link['cached'] for link in cached['valid_links'] + cached['invalid_links'])
+        assert (cached['summary']['valid_count'], cached['summary']['invalid_count']) == (1, 1)
+
+        full = validator.validate_all_sources()
+        assert len(server.requests) == 4
+        assert [link['status_code'] for link in full['valid_links']] == [304]  # Conditional on the stored ETag
+
+    def test_expired_and_changed_sources_are_checked(self, db, servers, make_promise, make_validator):
+        server = servers[0]
+        db.add_promise(make_promise(sources=[source(f"{server.url}/ok"), source(f"{server.url}/missing")]))
+        validator = make_validator(host_rate=100)
+        validator.validate_all_sources()
+
+        states = db.get_link_states()
+        expired = next(state for state in states.values() if state['url'].endswith('/missing'))
+        expired['next_check_at'] = (datetime.now() - timedelta(seconds=1)).isoformat()
+        db.save_link_states([expired])
+
+        results = validator.validate_all_sources(incremental=True)
+
+        assert results['summary']['checked_count'] == 1
+        assert [request[1] for request in server.requests[2:]] == ['/missing']
+        assert db.get_link_states()[expired['source_id']]['failure_streak'] == 2
+
+    def test_ttl_follows_each_links_history(self, make_validator):
+        validator = make_validator(min_ttl=100, default_ttl=1000, max_ttl=3000)
+        now = datetime(2024, 6, 1)
+        ok = {'is_valid': True, 'status_code': 200, 'error_message': "OK", 'etag': None, 'last_modified': None}
+        failed = dict(ok, is_valid=False, status_code=500, error_message="HTTP 500")
+
+        state, ttls = None, []
+        for result in [ok, ok, ok, failed, failed, failed, ok, ok]:
+            state = validator._next_state(1, "https://example.org/1", state, result, now)
+            ttls.append(state['ttl_seconds'])
+
+        assert ttls == [2000, 3000, 3000, 750, 187, 100, 1000, 2000]
+        assert (state['success_streak'], state['failure_streak']) == (2, 0)
+        assert state['next_check_at'] == (now + timedelta(seconds=2000)).isoformat()
+        # A source whose URL changed starts over
+        assert validator._next_state(1, "https://example.org/new", state, ok, now)['ttl_seconds'] == 2000
+
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert 0 < bucket.try_acquire() <= 0.1
+    time.sleep(0.11)
+    assert bucket.try_acquire() == 0
@@ -0,0 +1,68 @@
+"""
+Tests for the model dataclasses and the lazy PromiseRow view.
+"""
+
+import sys
+from datetime import datetime
+
+import pytest
+
+from app.database import DatabaseManager
+from app.models import ProgressUpdate, Promise, PromiseRow, PromiseStatus, Source, SourceType
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="slotted dataclasses need Python 3.10")
+@pytest.mark.parametrize('model', [
+    Promise(text="Cut taxes", category="Economy"),
+    Source(url=None, title="Rally", source_type=SourceType.RALLY_SPEECH),
+    ProgressUpdate(promise_id=1, update_text="Bill signed", date=datetime(2024, 7, 1)),
+])
+def test_models_are_slotted(model):
+    assert not hasattr(model, '__dict__')
+    with pytest.raises(AttributeError):
+        model.misspelled_field = 1
+
+
+class TestPromiseRow:
+    @pytest.mark.parametrize('timestamp_format', ['iso', 'epoch_us'])
+    def test_matches_the_hydrated_promise(self, tmp_path, make_promise, timestamp_format):
+        db = DatabaseManager(str(tmp_path / 'rows.db'), timestamp_format=timestamp_format)
+        try:
+            promise_id = db.add_promise(make_promise(
+                tags=['tax'], notes="Key pledge", status=PromiseStatus.IN_PROGRESS, progress_percentage=40.0,
+                date_made=datetime(2016, 8, 31, 20, 15, 30, 123456)))
+            db.add_promise(make_promise("Other promise", related_promises=[promise_id], date_made=None))
+            promises = {promise.id: promise for promise in db.get_all_promises()}
+
+            rows = db.query_promises(limit=10).promises
+        finally:
+            db.close()
+
+        assert all(isinstance(row, PromiseRow) for row in rows)
+        for row in rows:
+            promise = promises[row.id]
+            assert row.to_promise() == promise
+            assert row.to_dict() == promise.to_dict()
+            assert (row.status, row.date_made, row.tags, row.related_promises) == \
+                (promise.status, promise.date_made, promise.tags, promise.related_promises)
+
+    def test_columns_are_decoded_when_read(self):
+        row = PromiseRow({'id': 1, 'text': "Cut taxes", 'date_updated': "not a timestamp", 'status': "Done",
+                          'created_at': 1_000_000})
+
+        assert (row.id, row.text, row.sources) == (1, "Cut taxes", [])
+        assert row.created_at == datetime(1970, 1, 1, 0, 0, 1)
+        with pytest.raises(ValueError):
+            row.date_updated
+        with pytest.raises(ValueError):
+            row.status
+
+    def test_is_read_only(self):
+        row = PromiseRow({'id': 1, 'text': "Cut taxes"})
+
+        with pytest.raises(AttributeError):
+            row.text = "Raise taxes"
+        with pytest.raises(AttributeError):
+            row.misspelled_field = 1
+        row.sources = [Source(url=None, title="Rally", source_type=SourceType.RALLY_SPEECH)]
+        assert row.sources[0].title == "Rally"
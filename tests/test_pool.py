@@ -0,0 +1,103 @@
+"""
+Tests for the per-thread SQLite connection pool.
+"""
+
+import threading
+
+from app.database import DatabaseManager
+from app.pool import ConnectionPool
+
+
+def run_in_thread(func):
+    """Run ``func`` in a fresh thread and return its result."""
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+class TestConnectionPool:
+    def test_thread_reuses_its_connection(self, tmp_path):
+        pool = ConnectionPool(str(tmp_path / 'pool.db'))
+
+        conn = pool.acquire()
+        assert pool.acquire() is conn
+        assert run_in_thread(pool.acquire) is not conn
+        pool.close_all()
+
+    def test_connections_are_configured_once(self, tmp_path):
+        pool = ConnectionPool(str(tmp_path / 'pool.db'))
+        conn = pool.acquire()
+
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("SELECT 1 AS one").fetchone()['one'] == 1
+        pool.close_all()
+
+    def test_old_and_broken_connections_are_replaced(self, tmp_path):
+        pool = ConnectionPool(str(tmp_path / 'pool.db'), max_age=0)
+        conn = pool.acquire()
+        assert pool.acquire() is not conn
+
+        pool = ConnectionPool(str(tmp_path / 'pool.db'), health_check_interval=0)
+        conn = pool.acquire()
+        conn.close()
+        assert pool.acquire().execute("SELECT 1").fetchone()[0] == 1
+        pool.close_all()
+
+    def test_connection_in_a_transaction_is_not_recycled(self, tmp_path):
+        pool = ConnectionPool(str(tmp_path / 'pool.db'), max_age=0)
+        conn = pool.acquire()
+        conn.execute("CREATE TABLE t (x)")
+        conn.execute("INSERT INTO t VALUES (1)")
+
+        assert conn.in_transaction and pool.acquire() is conn
+        conn.rollback()
+        pool.close_all()
+
+    def test_connections_of_finished_threads_are_closed(self, tmp_path):
+        pool = ConnectionPool(str(tmp_path / 'pool.db'))
+        run_in_thread(pool.acquire)
+        assert pool.stats()['open_connections'] == 1
+
+        pool.acquire()  # Opening the next connection prunes the dead thread's
+        assert pool.stats()['open_connections'] == 1
+        pool.close_all()
+        assert pool.stats()['open_connections'] == 0
+
+    def test_pools_are_shared_per_path(self, tmp_path):
+        path = str(tmp_path / 'shared.db')
+
+        assert ConnectionPool.for_path(path) is ConnectionPool.for_path(path, timeout=1.0)
+        assert ConnectionPool.for_path(str(tmp_path / 'other.db')) is not ConnectionPool.for_path(path)
+
+    def test_query_count_is_per_thread(self, tmp_path):
+        pool = ConnectionPool(str(tmp_path / 'pool.db'))
+        conn = pool.acquire()
+
+        pool.start_query_count()
+        conn.execute("SELECT 1")
+        run_in_thread(lambda: pool.acquire().execute("SELECT 1"))
+        conn.execute("SELECT 2")
+
+        assert pool.stop_query_count() == 2
+        conn.execute("SELECT 3")
+        assert pool.stop_query_count() == 0
+        pool.close_all()
+
+
+class TestDatabaseManagerConnections:
+    def test_managers_on_one_file_share_connections(self, db):
+        other = DatabaseManager(db.db_path)
+
+        with db.get_connection() as first, other.get_connection() as second:
+            assert first is second
+
+    def test_uncommitted_work_is_rolled_back(self, db):
+        with db.get_connection() as conn:
+            conn.execute("INSERT INTO schema_meta (key, value) VALUES ('scratch', '1')")
+
+        with db.get_connection() as conn:
+            assert not conn.in_transaction
+            assert conn.execute("SELECT COUNT(*) FROM schema_meta WHERE key = 'scratch'").fetchone()[0] == 0
@@ -0,0 +1,139 @@
+"""
+Tests for PromiseScraper, against a local HTTP server.
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from app.models import PromiseStatus, SourceType
+from app.scraper import PromiseScraper
+
+
+CAMPAIGN_PAGE = b"""<html><head><title>Our Platform</title></head><body>
+<p>We will build a wall on the southern border and make Mexico pay.</p>
+<li>On day one I will cut taxes for every working family.</li>
+<p>Thanks for coming out tonight, everyone.</p>
+</body></html>"""
+
+FEED = b"""<?xml version="1.0"?><rss version="2.0"><channel><title>News</title>
+<item><title>Energy plan</title><link>https://news.example.org/energy</link>
+<description>We will unleash American energy and promise lower gas prices.</description></item>
+<item><title>Rally recap</title><link>https://news.example.org/rally</link>
+<description>A big crowd gathered downtown.</description></item>
+</channel></rss>"""
+
+# A transcript sent in two parts; the second waits for the server's ``release`` event
+TRANSCRIPT = (b"<html><body><p>We will build a great wall on the southern border. And then, my friends, once that is done,",
+              b" we are going to cut taxes for the middle class. Thank you!</p></body></html>")
+
+PAGES = {'/platform': CAMPAIGN_PAGE, '/feed': FEED}
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.path == '/transcript' or self.path == '/flaky-transcript' and self.server.requests.count(self.path) > 1:
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.end_headers()
+            self.wfile.write(TRANSCRIPT[0])
+            self.wfile.flush()
+            self.server.released = self.server.release.wait(5)
+            self.wfile.write(TRANSCRIPT[1])
+            return
+        if self.path == '/flaky-transcript':
+            self.send_error(503)
+            return
+
+        body = PAGES.get(self.path)
+        self.send_response(200 if body else 404)
+        self.send_header('Content-Length', str(len(body or b'')))
+        self.end_headers()
+        self.wfile.write(body or b'')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(http_server):
+    server = http_server(Handler)
+    server.release = threading.Event()
+    yield server
+    server.release.set()
+
+
+@pytest.fixture
+def scraper():
+    scraper = PromiseScraper(delay_seconds=0, max_retries=0)
+    scraper.fetcher.CHUNK_SIZE = 16  # Small enough for the test pages to stream in several pieces
+    yield scraper
+    scraper.session.close()
+
+
+class TestScrapingPipeline:
+    def test_campaign_pages(self, server, scraper):
+        promises = scraper.scrape_campaign_websites([f"{server.url}/platform", f"{server.url}/missing"])
+
+        assert [promise.text for promise in promises] == [
+            "We will build a wall on the southern border and make Mexico pay.",
+            "On day one I will cut taxes for every working family."]
+        assert {(promise.source_url, promise.source_title) for promise in promises} == \
+            {(f"{server.url}/platform", "Our Platform")}
+        assert [promise.text for promise in scraper.scrape_campaign_website(f"{server.url}/platform")] == \
+            [promise.text for promise in promises]
+
+    def test_rss_feeds(self, server, scraper):
+        promises = scraper.scrape_rss_feeds([f"{server.url}/feed"])
+
+        assert [(promise.source_url, promise.source_title) for promise in promises] == \
+            [("https://news.example.org/energy", "Energy plan")]
+        assert promises[0].confidence_score == pytest.approx(0.9)
+
+    def test_converted_promises(self, server, scraper):
+        scraped = scraper.scrape_campaign_websites([f"{server.url}/platform"])
+
+        wall, taxes = (scraper.convert_to_promise(promise) for promise in scraped)
+
+        assert (wall.category, wall.status, wall.tags) == ('Immigration', PromiseStatus.NOT_STARTED,
+                                                          ['border-security'])
+        assert (taxes.category, taxes.tags) == ('Tax Policy', ['taxes', 'immediate'])
+        assert wall.sources[0].url == f"{server.url}/platform"
+        assert wall.sources[0].source_type == SourceType.OTHER
+
+
+class TestTranscriptStreaming:
+    def test_promises_are_yielded_while_the_page_downloads(self, server, scraper):
+        promises = scraper.scrape_speech_transcripts([f"{server.url}/transcript", f"{server.url}/missing"])
+
+        first = next(promises)
+        server.release.set()
+        rest = list(promises)
+
+        assert server.released  # The first promise arrived before the rest of the page was sent
+        assert first.text == "We will build a great wall on the southern border"
+        assert [promise.text for promise in rest] == [
+            "And then, my friends, once that is done, we are going to cut taxes for the middle class"]
+        assert (first.source_url, first.source_title) == (f"{server.url}/transcript", "Speech Transcript")
+
+    def test_transcripts_go_through_the_fetcher(self, server, scraper):
+        scraper.fetcher.max_retries, scraper.fetcher.backoff = 1, 0.01
+        server.release.set()
+
+        promises = list(scraper.stream_speech_transcript(f"{server.url}/flaky-transcript"))
+
+        assert server.requests == ['/flaky-transcript'] * 2
+        assert len(promises) == 2
+
+    def test_closing_early_stops_the_download(self, server, scraper):
+        promises = scraper.stream_speech_transcript(f"{server.url}/transcript")
+
+        assert next(promises).text.startswith("We will build")
+        start = time.monotonic()
+        promises.close()
+
+        assert time.monotonic() - start < 1
+        assert server.requests == ['/transcript']
@@ -0,0 +1,112 @@
+"""
+Tests for the token-set similarity index.
+"""
+
+import random
+import re
+
+import pytest
+
+from app.analyzer import PromiseAnalyzer
+from app.similarity import jaccard, tokenize
+
+
+COMMON = ['the', 'we', 'will', 'and', 'to', 'of', 'a', 'our', 'for']
+TOPICAL = ['border', 'wall', 'tax', 'cut', 'jobs', 'trade', 'china', 'energy', 'oil', 'veterans',
+           'inflation', 'prices', 'tariffs', 'crime', 'schools', 'healthcare']
+
+
+def brute_force_similar(promises, promise, threshold):
+    """The original find_similar_promises: score every other promise's word set."""
+    words = set(re.findall(r'\w+', promise.text.lower()))
+    matches = []
+    for other in promises:
+        if other.id == promise.id:
+            continue
+        other_words = set(re.findall(r'\w+', other.text.lower()))
+        if words and other_words:
+            score = len(words & other_words) / len(words | other_words)
+            if score >= threshold:
+                matches.append((other.id, score))
+    return sorted(matches, key=lambda match: (-match[1], match[0]))
+
+
+@pytest.fixture
+def corpus(db, make_promise):
+    """Promises mixing common words, topical words and rare ones, plus a few edge cases."""
+    rng = random.Random(7)
+    texts = []
+    for i in range(150):
+        words = rng.sample(COMMON, rng.randint(2, 6)) + rng.sample(TOPICAL, rng.randint(1, 4))
+        words += [f"rare{rng.randint(0, 40)}" for _ in range(rng.randint(0, 4))]
+        rng.shuffle(words)
+        texts.append(" ".join(words).capitalize() + ".")
+    texts += ["We will.", "The the THE", "Build the wall!", "Build the wall", "!!!", "Wall"]
+    db.bulk_add_promises(make_promise(text, sources=[]) for text in texts)
+    return db.get_all_promises(include_sources=False)
+
+
+class TestSimilarityIndex:
+    @pytest.mark.parametrize('threshold', [0.1, 0.2, 0.3, 0.5, 0.8, 1.0])
+    def test_matches_brute_force(self, db, corpus, threshold):
+        analyzer = PromiseAnalyzer(db)
+
+        for promise in corpus:
+            found = [(other.id, score) for other, score in analyzer.find_similar_promises(promise, threshold)]
+            assert found == pytest.approx(brute_force_similar(corpus, promise, threshold)), promise.text
+
+    def test_limit_keeps_the_best_matches(self, db, corpus):
+        promise = corpus[0]
+
+        assert db.find_similar(promise.text, 0.1, exclude_id=promise.id, limit=3) == \
+            pytest.approx(brute_force_similar(corpus, promise, 0.1)[:3])
+
+    def test_index_follows_updates(self, db, corpus):
+        promise = corpus[0]
+        promise.text = "Completely fresh words nobody used before"
+        db.update_promise(promise)
+
+        assert db.find_similar("fresh words nobody", 0.3) == [(promise.id, pytest.approx(3 / 6))]
+        other = next(other for other in corpus[1:] if len(tokenize(other.text)) > 3)
+        assert other.id in [match[0] for match in db.find_similar(other.text.upper(), 1.0)]
+
+    def test_frequencies_match_the_posting_lists(self, db, corpus):
+        promise = corpus[3]
+        promise.text = "Wall wall tariffs brand new"
+        db.update_promise(promise)
+        with db.get_connection() as conn:
+            db.similarity.remove_promise(conn.cursor(), corpus[4].id)
+            conn.commit()
+            stored = dict(conn.execute("SELECT token, promise_count FROM token_frequencies WHERE promise_count > 0"))
+            db.similarity.count_frequencies(conn.cursor())
+            recounted = dict(conn.execute("SELECT token, promise_count FROM token_frequencies"))
+
+        assert stored == recounted
+
+    def test_bounded_candidates(self, db, corpus):
+        with db.get_connection() as conn:
+            cursor = conn.cursor()
+            for promise in corpus:
+                expected = brute_force_similar(corpus, promise, 0.2)
+
+                unbounded = db.similarity.query(cursor, promise.text, 0.2, exclude_id=promise.id,
+                                                max_candidates=len(corpus) * 20)
+                bounded = db.similarity.query(cursor, promise.text, 0.2, exclude_id=promise.id, max_candidates=10)
+
+                assert unbounded == pytest.approx(expected), promise.text
+                # Fewer candidates, each still scored exactly
+                assert len(bounded) <= 10
+                found = {promise_id for promise_id, _ in bounded}
+                assert bounded == pytest.approx([match for match in expected if match[0] in found])
+
+    def test_unusual_queries(self, db, corpus):
+        assert db.find_similar("", 0.2) == []
+        assert db.find_similar("wall", 0) == []
+        assert db.find_similar("wall", 1.5) == []
+        assert db.find_similar("zzz unknown", 0.2) == []
+
+
+def test_jaccard():
+    assert jaccard(tokenize("Build the wall"), tokenize("the WALL, build!")) == 1.0
+    assert jaccard(tokenize("a b"), tokenize("b c")) == pytest.approx(1 / 3)
+    assert jaccard(set(), tokenize("a")) == 0.0
@@ -0,0 +1,78 @@
+"""
+Tests for the streaming transcript text and sentence extraction.
+"""
+
+import random
+import re
+
+import pytest
+
+from app.transcripts import iter_html_text, iter_sentences
+
+
+def split_randomly(data, rng, max_size=7):
+    """Cut a string or bytes into random small pieces."""
+    pieces, start = [], 0
+    while start < len(data):
+        size = rng.randint(1, max_size)
+        pieces.append(data[start:start + size])
+        start += size
+    return pieces
+
+
+TRANSCRIPT = """<html><head><style>p { color: red; }</style><script>var x = "We will. Not text!";</script></head>
+<body><h1>Rally &amp; Speech</h1>
+<p>We will build the wall... And Mexico is going to pay?! Believe me.</p>
+<p>Café owners will get a tax cut &mdash; on day one</p><template>hidden. text</template>
+</body></html>"""
+
+
+class TestHtmlText:
+    def test_text_is_the_same_however_the_markup_is_split(self):
+        expected = "".join(iter_html_text([TRANSCRIPT]))
+        rng = random.Random(5)
+
+        for _ in range(50):
+            assert "".join(iter_html_text(split_randomly(TRANSCRIPT, rng))) == expected
+        assert "Rally & Speech" in expected and "Café owners" in expected and "— on day one" in expected
+        assert "color" not in expected and "Not text" not in expected and "hidden" not in expected
+
+    def test_multibyte_characters_split_across_chunks(self):
+        data = TRANSCRIPT.encode('utf-8')
+        rng = random.Random(6)
+
+        for _ in range(50):
+            assert "".join(iter_html_text(split_randomly(data, rng, 3))) == "".join(iter_html_text([TRANSCRIPT]))
+        assert "".join(iter_html_text([data.replace("é".encode(), "é".encode('latin-1'))], 'latin-1')) == \
+            "".join(iter_html_text([TRANSCRIPT]))
+        assert "Caf" in "".join(iter_html_text([data], 'no-such-charset'))
+
+    def test_text_is_handed_out_as_it_arrives(self):
+        chunks = iter(["<p>First part. ", "Second", " part.</p>"])
+        texts = iter_html_text(chunks)
+
+        assert next(texts) == "First part. "
+        assert next(chunks) == "Second"  # The parser hasn't read ahead
+
+
+class TestSentences:
+    @pytest.mark.parametrize('text', [
+        "We will win. We will win again!! Believe me? Yes",
+        "...Leading and trailing terminators...",
+        "No terminator at all",
+        "",
+        "a.b!c?d.!?e",
+    ])
+    def test_matches_re_split_for_any_chunking(self, text):
+        rng = random.Random(len(text))
+
+        for _ in range(30):
+            assert list(iter_sentences(split_randomly(text, rng, 4))) == re.split(r'[.!?]+', text)
+
+    def test_runaway_sentences_are_cut(self):
+        text = "x" * 25 + ". Short one."
+
+        sentences = list(iter_sentences(split_randomly(text, random.Random(1)), max_sentence_chars=10))
+
+        assert "".join(sentences) == "x" * 25 + " Short one"
+        assert all(len(sentence) <= 10 for sentence in sentences)
@@ -0,0 +1,319 @@
+"""
+Tests for the Flask routes.
+"""
+
+import json
+import time
+from datetime import datetime
+
+import pytest
+
+
+def promise_texts(response, texts):
+    """The subset of ``texts`` that appear in a rendered page."""
+    body = response.get_data(as_text=True)
+    return {text for text in texts if text in body}
+
+
+class TestDashboard:
+    def test_index_runs_a_fixed_number_of_queries(self, client, web_db, make_promise):
+        texts = [f"Dashboard promise {i:02d}" for i in range(30)]
+        for i, text in enumerate(texts[:3]):
+            web_db.add_promise(make_promise(text, days_ago=i))
+        small = client.get('/')
+        for i, text in enumerate(texts[3:], start=3):
+            web_db.add_promise(make_promise(text, days_ago=i))
+
+        large = client.get('/')
+
+        # Data version, aggregates, ten promises and their sources
+        assert small.headers['X-DB-Query-Count'] == large.headers['X-DB-Query-Count'] == '4'
+        assert promise_texts(large, texts) == set(texts[:10])
+        assert ">30<" in large.get_data(as_text=True)  # Total from the aggregates
+
+
+class TestPromiseListing:
+    def test_pages_of_twenty(self, client, web_db, make_promise):
+        texts = [f"Listed promise number {i:02d}" for i in range(25)]
+        for i, text in enumerate(texts):
+            web_db.add_promise(make_promise(text, days_ago=i))
+
+        first = client.get('/promises')
+        second = client.get('/promises?page=2')
+
+        assert promise_texts(first, texts) == set(texts[:20])
+        assert promise_texts(second, texts) == set(texts[20:])
+
+    def test_invalid_and_out_of_range_pages_are_clamped(self, client, web_db, make_promise):
+        texts = [f"Listed promise number {i:02d}" for i in range(25)]
+        for i, text in enumerate(texts):
+            web_db.add_promise(make_promise(text, days_ago=i))
+
+        for page in ('abc', '0', '-3', ''):
+            response = client.get(f'/promises?page={page}')
+            assert response.status_code == 200
+            assert promise_texts(response, texts) == set(texts[:20])
+
+        response = client.get('/promises?page=99')
+        assert response.status_code == 200
+        assert promise_texts(response, texts) == set(texts[20:])
+
+    def test_empty_listing(self, client):
+        assert client.get('/promises?page=3').status_code == 200
+
+    def test_cursor_continues_after_the_previous_page(self, client, web_db, make_promise):
+        texts = [f"Listed promise number {i:02d}" for i in range(25)]
+        for i, text in enumerate(texts):
+            web_db.add_promise(make_promise(text, days_ago=i))
+        cursor = web_db.query_promises(limit=20).next_cursor
+
+        response = client.get(f'/promises?page=2&cursor={cursor}')
+        assert promise_texts(response, texts) == set(texts[20:])
+        # A broken cursor falls back to the page number
+        assert promise_texts(client.get('/promises?page=2&cursor=bogus'), texts) == set(texts[20:])
+
+
+class TestPromisesApi:
+    def test_cursor_pages_cover_every_promise(self, client, web_db, make_promise):
+        ids = [web_db.add_promise(make_promise(f"Promise {i}", days_ago=i)) for i in range(5)]
+
+        seen, url = [], '/api/promises?limit=2'
+        while url:
+            response = client.get(url)
+            seen += [promise['id'] for promise in response.get_json()]
+            cursor = response.headers.get('X-Next-Cursor')
+            url = f'/api/promises?limit=2&cursor={cursor}' if cursor else None
+
+        assert seen == ids
+
+    def test_filters_and_bad_cursor(self, client, web_db, make_promise):
+        web_db.add_promise(make_promise("Secure the border", category='Immigration'))
+        web_db.add_promise(make_promise("Cut taxes", category='Economy'))
+
+        response = client.get('/api/promises?limit=10&category=Immigration')
+
+        assert [promise['text'] for promise in response.get_json()] == ["Secure the border"]
+        assert client.get('/api/promises?limit=2&cursor=bogus').status_code == 400
+        assert client.get('/api/promises?limit=2&order=text').status_code == 400
+
+    def test_full_listing_is_streamed_as_json_or_ndjson(self, client, web_db, make_promise):
+        for i in range(3):
+            web_db.add_promise(make_promise(f"Promise {i}", days_ago=i, category='Economy' if i else 'Trade'))
+        expected = [promise.to_dict() for promise in web_db.get_all_promises()]
+
+        array = client.get('/api/promises')
+        ndjson = client.get('/api/promises?format=ndjson')
+        projected = client.get('/api/promises?category=Economy&fields=id,text')
+
+        assert array.is_streamed and array.get_json() == expected
+        assert ndjson.mimetype == 'application/x-ndjson'
+        assert [json.loads(line) for line in ndjson.get_data(as_text=True).splitlines()] == expected
+        assert projected.get_json() == [{'id': promise['id'], 'text': promise['text']} for promise in expected[1:]]
+        assert client.get('/api/promises?fields=text,secret').status_code == 400
+        assert client.get('/api/promises?category=Nothing').get_json() == []
+
+
+class TestSearch:
+    def test_matches_are_highlighted_and_escaped(self, client, web_db, make_promise):
+        web_db.add_promise(make_promise("Cut <taxes> for working families"))
+
+        body = client.get('/search?q=taxes').get_data(as_text=True)
+
+        assert "Cut &lt;<mark>taxes</mark>&gt; for working families" in body
+
+    def test_blank_query(self, client):
+        assert client.get('/search?q=++').status_code == 200
+
+
+class TestCategories:
+    def test_query_count_does_not_grow_with_categories(self, client, web_db, make_promise):
+        for category in ['Economy', 'Trade', 'Energy', 'Immigration', 'Healthcare', 'Other']:
+            web_db.add_promise(make_promise(f"{category} promise", category=category))
+
+        response = client.get('/categories')
+        body = response.get_data(as_text=True)
+
+        assert response.headers['X-DB-Query-Count'] == '3'
+        assert all(category in body for category in ['Economy', 'Trade', 'Energy', 'Healthcare'])
+
+
+class TestLinkValidation:
+    def test_status_and_dashboard_come_from_the_latest_run(self, client, web_db, make_promise):
+        assert client.get('/api/link-validation/status').get_json()['status'] == 'no_data'
+        promise_id = web_db.add_promise(make_promise("Promise with a broken link"))
+        source_id = web_db.get_promise(promise_id).sources[0].id
+
+        web_db.record_validation_run(datetime.now(), [{
+            'source_id': source_id, 'url': "https://example.org/broken", 'is_valid': False,
+            'status_code': 404, 'latency_ms': 8.0, 'error_message': "HTTP 404"}])
+        status = client.get('/api/link-validation/status').get_json()
+        dashboard = client.get('/admin/link-validation')
+
+        assert status['status'] == 'available'
+        assert (status['summary']['total_count'], status['summary']['invalid_count']) == (1, 1)
+        assert dashboard.status_code == 200
+        assert "https://example.org/broken" in dashboard.get_data(as_text=True)
+
+
+class TestResponseCache:
+    def test_second_request_is_a_hit(self, client, web_db, make_promise):
+        web_db.add_promise(make_promise())
+        web_db.add_promise(make_promise("Secure the border", days_ago=1))
+
+        first = client.get('/api/promises?limit=1')
+        second = client.get('/api/promises?limit=1')
+
+        assert (first.headers['X-Cache'], second.headers['X-Cache']) == ('MISS', 'HIT')
+        assert first.get_data() == second.get_data()
+        assert first.headers['ETag'] == second.headers['ETag']
+        assert first.headers['X-Next-Cursor'] == second.headers['X-Next-Cursor']
+
+    def test_streamed_listings_get_validators_only(self, client, web_db, make_promise):
+        promise_id = web_db.add_promise(make_promise())
+        response = client.get('/api/promises')
+
+        assert [promise['id'] for promise in response.get_json()] == [promise_id]
+        assert client.get('/api/promises').headers['X-Cache'] == 'MISS'
+        assert client.get('/api/promises', headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+
+    def test_hits_report_their_own_query_count(self, client, web_db, make_promise):
+        web_db.add_promise(make_promise())
+        miss = client.get('/categories')
+        hit = client.get('/categories')
+
+        assert int(miss.headers['X-DB-Query-Count']) > int(hit.headers['X-DB-Query-Count'])
+
+    def test_etag_revalidation_until_the_next_write(self, client, web_db, make_promise):
+        promise_id = web_db.add_promise(make_promise())
+        etag = client.get('/api/promises?limit=1').headers['ETag']
+
+        assert client.get('/api/promises?limit=1', headers={'If-None-Match': etag}).status_code == 304
+
+        web_db.patch_promise(promise_id, {'status': 'Fulfilled'})
+        response = client.get('/api/promises?limit=1', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        assert response.get_json()[0]['status'] == 'Fulfilled'
+
+    def test_raw_sql_writes_invalidate_cached_responses(self, client, web_db, make_promise):
+        web_db.add_promise(make_promise())
+        first = client.get('/api/promises?limit=1')
+
+        # As the source maintenance scripts do, bypassing DatabaseManager's methods
+        with web_db.get_connection() as conn:
+            conn.execute("UPDATE sources SET url = 'https://example.org/fixed'")
+            conn.commit()
+        response = client.get('/api/promises?limit=1', headers={'If-None-Match': first.headers['ETag']})
+
+        assert response.status_code == 200
+        assert response.headers['X-Cache'] == 'MISS'
+        assert response.get_json()[0]['sources'][0]['url'] == "https://example.org/fixed"
+
+    def test_last_modified_revalidation(self, client, web_db, make_promise):
+        web_db.add_promise(make_promise())
+        last_modified = client.get('/').headers['Last-Modified']
+
+        assert client.get('/', headers={'If-Modified-Since': last_modified}).status_code == 304
+
+    def test_query_strings_are_cached_separately(self, client, web_db, make_promise):
+        web_db.add_promise(make_promise())
+        web_db.add_promise(make_promise("Secure the border", category='Immigration'))
+
+        other = client.get('/api/promises?category=Other').get_json()
+        immigration = client.get('/api/promises?category=Immigration').get_json()
+
+        assert [promise['category'] for promise in other] == ['Other']
+        assert [promise['category'] for promise in immigration] == ['Immigration']
+
+    def test_time_dependent_views_expire(self, client, web_db, make_promise, monkeypatch):
+        web_db.add_promise(make_promise())
+        first = client.get('/api/analytics')
+        assert 'Last-Modified' not in first.headers
+        assert client.get('/api/analytics').headers['X-Cache'] == 'HIT'
+
+        real_time = time.time
+        monkeypatch.setattr('app.web.cache.time.time', lambda: real_time() + 3600)
+        later = client.get('/api/analytics', headers={'If-None-Match': first.headers['ETag']})
+
+        assert later.status_code == 200
+        assert later.headers['X-Cache'] == 'MISS'
+
+
+class TestTags:
+    def test_tag_counts_and_filter(self, client, web_db, make_promise):
+        web_db.add_promise(make_promise("Cut taxes", tags=['tax', 'economy']))
+        web_db.add_promise(make_promise("Lower energy prices", tags=['energy', 'economy']))
+
+        assert client.get('/api/tags').get_json() == [
+            {'tag': 'economy', 'count': 2}, {'tag': 'energy', 'count': 1}, {'tag': 'tax', 'count': 1}]
+        assert client.get('/api/tags?limit=1').get_json() == [{'tag': 'economy', 'count': 2}]
+        assert [promise['text'] for promise in client.get('/api/promises?tag=energy').get_json()] == \
+            ["Lower energy prices"]
+        assert promise_texts(client.get('/promises?tag=tax'), ["Cut taxes", "Lower energy prices"]) == {"Cut taxes"}
+
+
+class TestPromiseEvents:
+    def test_updates_are_listed_newest_first(self, client, web_db, make_promise):
+        promise_id = web_db.add_promise(make_promise())
+
+        assert client.post(f'/api/promise/{promise_id}/update_status',
+                           json={'status': 'In Progress', 'notes': "Bill introduced"}).status_code == 200
+        assert client.post(f'/api/promise/{promise_id}/update_progress', json={'progress': 40}).status_code == 200
+
+        events = client.get(f'/api/promise/{promise_id}/events').get_json()
+        assert [(event['kind'], event['old_value'], event['new_value'], event['note']) for event in events] == [
+            ('progress', 0.0, 40.0, ''), ('status', 'Not Started', 'In Progress', "Bill introduced")]
+        assert [event['kind'] for event in client.get(f'/api/promise/{promise_id}/events?kind=status').get_json()] == \
+            ['status']
+        assert client.get(f'/api/promise/{promise_id + 1}/events').get_json() == []
+
+
+class TestVersionedWrites:
+    def test_patch_returns_the_new_version(self, client, web_db, make_promise):
+        promise_id = web_db.add_promise(make_promise())
+
+        response = client.patch(f'/api/promise/{promise_id}', json={'priority': 5, 'version': 1})
+
+        assert response.status_code == 200
+        assert response.get_json()['version'] == 2
+        assert web_db.get_promise(promise_id).priority == 5
+
+    def test_stale_version_is_a_conflict(self, client, web_db, make_promise):
+        promise_id = web_db.add_promise(make_promise())
+        web_db.patch_promise(promise_id, {'priority': 4})
+
+        response = client.patch(f'/api/promise/{promise_id}', json={'priority': 1, 'version': 1})
+
+        assert response.status_code == 409
+        assert response.get_json()['current_version'] == 2
+        assert web_db.get_promise(promise_id).priority == 4
+
+    def test_update_endpoints_honour_the_version(self, client, web_db, make_promise):
+        promise_id = web_db.add_promise(make_promise())
+
+        stale = client.post(f'/api/promise/{promise_id}/update_status', json={'status': 'Fulfilled', 'version': 7})
+        fresh = client.post(f'/api/promise/{promise_id}/update_status',
+                            json={'status': 'Fulfilled', 'notes': "Signed", 'version': 1})
+        progress = client.post(f'/api/promise/{promise_id}/update_progress', json={'progress': 50, 'version': 1})
+
+        assert (stale.status_code, fresh.status_code, progress.status_code) == (409, 200, 409)
+        events = client.get(f'/api/promise/{promise_id}/events').get_json()
+        assert [(event['new_value'], event['note']) for event in events] == [('Fulfilled', "Signed")]
+
+    @pytest.mark.parametrize('body', [
+        {'priority': 2, 'version': 'one'},
+        {'priority': 2, 'version': True},
+        {'version': 1},
+        {'status': 'Unknown'},
+        {'text': "New text", 'id': 9},
+    ])
+    def test_invalid_patches(self, client, web_db, make_promise, body):
+        promise_id = web_db.add_promise(make_promise())
+
+        assert client.patch(f'/api/promise/{promise_id}', json=body).status_code == 400
+        assert web_db.get_promise(promise_id).version == 1
+
+    def test_missing_promise(self, client, web_db, make_promise):
+        promise_id = web_db.add_promise(make_promise())
+
+        assert client.patch(f'/api/promise/{promise_id + 1}', json={'priority': 2}).status_code == 404
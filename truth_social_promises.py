@@ -270,7 +270,7 @@ def add_truth_social_promises():
     ]
     
     # Add Truth Social promises to database
-    added_promises = []
+    promises = []
     for promise_data in truth_social_promises:
         # Create sources
         sources = []
@@ -299,9 +299,13 @@ def add_truth_social_promises():
             date_updated=datetime.now() - timedelta(days=5)   # Very recent updates
         )
         
-        promise_id = db_manager.add_promise(promise)
-        added_promises.append(promise_id)
-        print(f"Added Truth Social promise {promise_id}: {promise.text[:45]}...")
+        promises.append(promise)
+    
+    # One transaction for the whole set
+    db_manager.bulk_add_promises(promises, link_related=True)
+    added_promises = [promise.id for promise in promises]
+    for promise in promises:
+        print(f"Added Truth Social promise {promise.id}: {promise.text[:45]}...")
     
     print(f"\n✅ Added {len(added_promises)} Truth Social/interview promises!")
     return added_promises